@@ -0,0 +1,123 @@
+"""
+Keyset Pagination for Quest Endpoints
+
+Quest lists are ordered by id, so a page is identified by the last id already
+returned rather than by an offset. Pagination is opt-in: requests without
+`cursor` or `limit` receive the full list as before.
+
+Query parameters:
+    - limit: The page size (1 to MAX_PAGE_SIZE). Defaults to DEFAULT_PAGE_SIZE when `cursor` is given.
+    - cursor: The opaque `next_cursor` value from the previous page.
+    - fields: A comma-separated list of quest fields to return (e.g. `id,name`).
+
+Functions:
+    - encode_cursor(quest_id): Returns the opaque cursor for the page after `quest_id`.
+    - parse_page_params(query_params): Returns (after_id, limit), or None if pagination was not requested.
+    - parse_fields(query_params): Returns the requested field names, or None for all fields.
+    - select_fields(items, fields): Restricts serialized quests to the requested fields.
+    - paginate_by_id(items, after_id, limit): Returns one page of an id-ordered list of serialized quests.
+"""
+
+from bisect import bisect_right
+from operator import itemgetter
+from rest_framework.exceptions import ValidationError
+from typing import Iterable, List, Optional, Sequence, Tuple
+import base64, binascii
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+CURSOR_PREFIX = "q:"
+
+
+def encode_cursor(quest_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{CURSOR_PREFIX}{quest_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        decoded = base64.urlsafe_b64decode(cursor.encode()).decode()
+        if not decoded.startswith(CURSOR_PREFIX):
+            raise ValueError(decoded)
+        return int(decoded[len(CURSOR_PREFIX) :])
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise ValidationError({"cursor": "Invalid cursor."})
+
+
+def parse_page_params(query_params) -> Optional[Tuple[Optional[int], int]]:
+    """
+    Read the keyset pagination parameters from a request.
+
+    :param query_params: The request's query parameters.
+    :type query_params: QueryDict
+    :return: A tuple of (id to start after, page size), or None if not paginating.
+    :rtype: tuple or None
+    :raises ValidationError: If the cursor or limit is invalid.
+    """
+    cursor = query_params.get("cursor")
+    limit = query_params.get("limit")
+    if cursor is None and limit is None:
+        return None
+
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValidationError({"limit": f"Must be between 1 and {MAX_PAGE_SIZE}."})
+
+    after_id = _decode_cursor(cursor) if cursor else None
+    return after_id, limit
+
+
+def parse_fields(query_params) -> Optional[List[str]]:
+    """
+    Read the field selection parameter from a request.
+
+    :param query_params: The request's query parameters.
+    :type query_params: QueryDict
+    :return: The requested field names, or None for all fields.
+    :rtype: list or None
+    """
+    fields = query_params.get("fields")
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()]
+
+
+def select_fields(items: Iterable[dict], fields: Optional[List[str]]) -> List[dict]:
+    """
+    Restrict serialized quests to the requested fields. Unknown fields are ignored.
+
+    :param items: The serialized quests.
+    :type items: iterable
+    :param fields: The fields to keep, or None to keep all.
+    :type fields: list or None
+    :return: The (possibly restricted) serialized quests.
+    :rtype: list
+    """
+    if fields is None:
+        return list(items)
+    return [{field: item[field] for field in fields if field in item} for item in items]
+
+
+def paginate_by_id(
+    items: Sequence[dict], after_id: Optional[int], limit: int
+) -> Tuple[List[dict], bool]:
+    """
+    Return one page of serialized quests already ordered by id.
+
+    :param items: The serialized quests, ordered by id.
+    :type items: sequence
+    :param after_id: Only return quests with a greater id.
+    :type after_id: int or None
+    :param limit: The page size.
+    :type limit: int
+    :return: A tuple of (page, whether more quests follow).
+    :rtype: tuple
+    """
+    start = bisect_right(items, after_id, key=itemgetter("id")) if after_id else 0
+    page = items[start : start + limit + 1]
+    return list(page[:limit]), len(page) > limit
@@ -2,6 +2,17 @@ from rest_framework.test import APITestCase, APIClient
 from django.urls import reverse
 from rest_framework import status
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+from unittest.mock import patch
+
+from api.pagination import encode_cursor
+from character.models import Character, PlayerCharacterLink
+from gameplay.models import ActivityTimer, Quest, QuestTimer
+from gameplay.services.quest_catalog import bump_catalog_version
 
 User = get_user_model()
 
@@ -25,3 +36,123 @@ class MeViewTest(APITestCase):
         self.client.force_authenticate(user=None)  # remove authentication
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class QuestPaginationTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        bump_catalog_version()
+        self.user = User.objects.create_user(
+            email="quests@example.com", password="testpassword123"
+        )
+        character = Character.objects.create(name="Pager", level=1)
+        PlayerCharacterLink.objects.create(
+            profile=self.user.profile, character=character
+        )
+        self.quests = [
+            Quest.objects.create(name=f"Quest {i}", levelMax=10) for i in range(5)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def collect(self, url, key, limit):
+        ids, params = [], {"limit": limit}
+        while True:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(quest["id"] for quest in response.data[key])
+            if response.data["next_cursor"] is None:
+                return ids
+            params = {"limit": limit, "cursor": response.data["next_cursor"]}
+
+    def test_unpaginated_by_default(self):
+        response = self.client.get(reverse("quest-eligible"))
+        self.assertEqual(len(response.data["eligible_quests"]), 5)
+        self.assertNotIn("next_cursor", response.data)
+
+    def test_eligible_pages(self):
+        expected = [quest.id for quest in self.quests]
+        self.assertEqual(
+            self.collect(reverse("quest-eligible"), "eligible_quests", 2), expected
+        )
+        # Cached eligibility is sliced the same way
+        self.client.get(reverse("quest-eligible"))
+        self.assertEqual(
+            self.collect(reverse("quest-eligible"), "eligible_quests", 2), expected
+        )
+
+    def test_list_pages(self):
+        expected = [quest.id for quest in self.quests]
+        self.assertEqual(self.collect(reverse("quest-list"), "quests", 3), expected)
+
+    def test_field_selection(self):
+        response = self.client.get(
+            reverse("quest-eligible"),
+            {"fields": "id,name", "cursor": encode_cursor(self.quests[3].id)},
+        )
+        self.assertEqual(
+            response.data["eligible_quests"],
+            [{"id": self.quests[4].id, "name": "Quest 4"}],
+        )
+        self.assertIsNone(response.data["next_cursor"])
+
+    def test_invalid_params(self):
+        for params in ({"cursor": "nonsense"}, {"limit": 0}, {"limit": "ten"}):
+            response = self.client.get(reverse("quest-eligible"), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+@patch("gameplay.tasks.complete_quest_deadline.apply_async")
+class FetchInfoReadModelTest(APITestCase):
+    url = "/api/v1/fetch_info/"
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="bootstrap@example.com", password="testpassword123"
+        )
+        self.character = Character.objects.create(name="Booter", level=1)
+        PlayerCharacterLink.objects.create(
+            profile=self.user.profile, character=self.character
+        )
+        self.quest = Quest.objects.create(name="Boot", levelMax=10)
+        self.user.profile.activity_timer.new_activity("Loading")
+        QuestTimer.objects.create(character=self.character).change_quest(
+            self.quest, duration=600
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def timer_queries(self, context):
+        tables = (ActivityTimer._meta.db_table, QuestTimer._meta.db_table)
+        return [q["sql"] for q in context if any(t in q["sql"] for t in tables)]
+
+    def test_second_load_reads_timers_from_cache(self, apply_async):
+        first = self.client.get(self.url).data
+        with CaptureQueriesContext(connection) as context:
+            second = self.client.get(self.url).data
+        self.assertEqual(self.timer_queries(context), [])
+        self.assertEqual(first["activity_timer"], second["activity_timer"])
+        self.assertEqual(second["quest_timer"]["quest"]["name"], "Boot")
+
+    def test_transition_refreshes_document(self, apply_async):
+        with freeze_time("2025-01-01 12:00:00"):
+            self.client.get(self.url)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.character.quest_timer.start()
+        with freeze_time("2025-01-01 12:01:40"):
+            data = self.client.get(self.url).data["quest_timer"]
+            self.assertEqual(data["status"], "active")
+            self.assertEqual((data["elapsed_time"], data["remaining_time"]), (100, 500))
+        with freeze_time("2025-01-01 12:02:00"):
+            # Served from the cache, with the time fields brought up to date
+            with CaptureQueriesContext(connection) as context:
+                data = self.client.get(self.url).data["quest_timer"]
+            self.assertEqual(self.timer_queries(context), [])
+            self.assertEqual((data["elapsed_time"], data["remaining_time"]), (120, 480))
@@ -38,6 +38,13 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 # from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from api.pagination import (
+    encode_cursor,
+    paginate_by_id,
+    parse_fields,
+    parse_page_params,
+    select_fields,
+)
 from api.serializers import (
     UserSerializer,
     ProfileSerializer,
@@ -57,7 +64,13 @@ from api.serializers import (
 from character.models import Character, PlayerCharacterLink
 from gameplay.filters import ActivityFilter
 from gameplay.models import Activity, Quest, ActivityTimer, QuestTimer, ServerMessage
-from gameplay.utils import check_quest_eligibility, send_group_message
+from gameplay.services.quest_snapshot import get_quest_snapshot
+from gameplay.services.timer_read_model import cached_timer_data, store_timer_data
+from gameplay.utils import (
+    serialize_eligible_quest_page,
+    serialize_eligible_quests,
+    send_group_message,
+)
 from server_management.models import MaintenanceWindow
 from users.models import Profile
 from users.utils import send_email_to_users
@@ -349,19 +362,17 @@ class OnboardingViewSet(viewsets.ViewSet):
 class FetchInfoAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
-    def get(self, request, format=None):
-        profile = request.user.profile
-        try:
-            character = PlayerCharacterLink.get_character(profile)
-        except ValueError as e:
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
-        logger.info(
-            f"[FETCH INFO] Fetching data for profile {profile.id}, character {character.id}"
-        )
+    def _repair_timers(self, profile, character):
+        """
+        Finish an overdue quest timer and reset an activity timer that lost its
+        activity.
 
+        :return: An error response, or None if the timers are consistent.
+        :rtype: Response or None
+        """
         qt = character.quest_timer
-        if qt.time_finished() and qt.status != "completed":
+        # An empty timer has nothing to finish
+        if qt.time_finished() and qt.status not in ("completed", "empty"):
             try:
                 qt.elapsed_time = qt.duration
                 qt.save()
@@ -391,17 +402,50 @@ class FetchInfoAPIView(APIView):
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 )
 
+        return None
+
+    def get(self, request, format=None):
+        profile = request.user.profile
+        try:
+            character = PlayerCharacterLink.get_character(profile)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        logger.info(
+            f"[FETCH INFO] Fetching data for profile {profile.id}, character {character.id}"
+        )
+
+        # Both timers come from the cached read model unless it is stale
+        timer_data, tokens = cached_timer_data(profile, character, "api")
+        if timer_data is None:
+            error_response = self._repair_timers(profile, character)
+            if error_response:
+                return error_response
+
         try:
             profile_data = ProfileSerializer(profile, context={"request": request}).data
             character_data = CharacterSerializer(
                 character, context={"request": request}
             ).data
-            activity_timer_data = ActivityTimerSerializer(
-                profile.activity_timer, context={"request": request}
-            ).data
-            quest_timer_data = QuestTimerSerializer(
-                qt, context={"request": request}
-            ).data
+            if timer_data is not None:
+                activity_timer_data, quest_timer_data = timer_data
+            else:
+                act_timer = profile.activity_timer
+                qt = character.quest_timer
+                activity_timer_data = ActivityTimerSerializer(
+                    act_timer, context={"request": request}
+                ).data
+                quest_timer_data = QuestTimerSerializer(
+                    qt, context={"request": request}
+                ).data
+                store_timer_data(
+                    "api",
+                    tokens,
+                    act_timer,
+                    qt,
+                    activity_timer_data,
+                    quest_timer_data,
+                )
 
             return Response(
                 {
@@ -561,10 +605,25 @@ class QuestViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         return Quest.objects.all()
 
+    @staticmethod
+    def _page_response(key, quests, fields, has_more=False, paginated=False):
+        data = {key: select_fields(quests, fields)}
+        if paginated:
+            data["next_cursor"] = (
+                encode_cursor(quests[-1]["id"]) if has_more and quests else None
+            )
+        return Response(data)
+
     def list(self, request):
-        quests = self.get_queryset()
-        serializer = QuestSerializer(quests, many=True, context={"request": request})
-        return Response({"quests": serializer.data})
+        page = parse_page_params(request.query_params)
+        fields = parse_fields(request.query_params)
+        quests = get_quest_snapshot(QuestSerializer).quests
+        if page is None:
+            return self._page_response("quests", quests, fields)
+
+        after_id, limit = page
+        quests, has_more = paginate_by_id(quests, after_id, limit)
+        return self._page_response("quests", quests, fields, has_more, paginated=True)
 
     @action(detail=False, methods=["get"])
     def eligible(self, request):
@@ -574,11 +633,21 @@ class QuestViewSet(viewsets.ReadOnlyModelViewSet):
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        eligible_quests = check_quest_eligibility(character, profile)
-        serializer = QuestSerializer(
-            eligible_quests, many=True, context={"request": request}
+        page = parse_page_params(request.query_params)
+        fields = parse_fields(request.query_params)
+        if page is None:
+            eligible_quests = serialize_eligible_quests(
+                character, profile, QuestSerializer
+            )
+            return self._page_response("eligible_quests", eligible_quests, fields)
+
+        after_id, limit = page
+        eligible_quests, has_more = serialize_eligible_quest_page(
+            character, profile, QuestSerializer, after_id, limit
+        )
+        return self._page_response(
+            "eligible_quests", eligible_quests, fields, has_more, paginated=True
         )
-        return Response({"eligible_quests": serializer.data})
 
     @action(detail=False, methods=["post"])
     def complete(self, request):
@@ -600,10 +669,7 @@ class QuestViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        eligible_quests = check_quest_eligibility(character, profile)
-        quests_data = QuestSerializer(
-            eligible_quests, many=True, context={"request": request}
-        ).data
+        quests_data = serialize_eligible_quests(character, profile, QuestSerializer)
         character_data = CharacterSerializer(
             character, context={"request": request}
         ).data
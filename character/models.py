@@ -9,6 +9,7 @@ from users.models import Person, Profile
 
 from gameplay.models import Buff, AppliedBuff, QuestCompletion, Quest
 from gameplay.serializers import QuestResultSerializer
+from gameplay.services.eligibility_cache import invalidate_eligible_quests
 
 if TYPE_CHECKING:
     from gameplay.models import QuestTimer
@@ -217,6 +218,14 @@ class Character(Person, LifeCycleMixin):
     def get_quest_completions(self, quest: Quest):
         return QuestCompletion.objects.filter(character=self, quest=quest)
 
+    def invalidate_eligible_quests(self):
+        """Drop cached eligible quests now and again once the transaction commits."""
+        invalidate_eligible_quests(self.id)
+        transaction.on_commit(lambda: invalidate_eligible_quests(self.id))
+
+    def _level_change_hook(self, old_level: int):
+        self.invalidate_eligible_quests()
+
     @transaction.atomic
     def complete_quest(self, xp_gained):
         logger.info(f"[CHAR.COMPLETE_QUEST] Starting quest completion for {self}")
@@ -229,17 +238,17 @@ class Character(Person, LifeCycleMixin):
             return None
 
         try:
-            completion, created = QuestCompletion.objects.get_or_create(
-                character=self,
-                quest=quest,
+            QuestCompletion.record(
+                self,
+                quest,
+                duration=self.quest_timer.elapsed_time,
+                xp_gained=xp_gained,
             )
-            if not created:
-                completion.times_completed += 1
-                completion.save()
+            self.invalidate_eligible_quests()
 
         except IntegrityError as e:
             logger.error(
-                f"[CHAR.COMPLETE_QUEST] IntegrityError: failed to create or retrieve quest completion for character {self.id}, quest {quest.id}: {e}"
+                f"[CHAR.COMPLETE_QUEST] IntegrityError: failed to record quest completion for character {self.id}, quest {quest.id}: {e}"
             )
             return None
         except Exception as e:
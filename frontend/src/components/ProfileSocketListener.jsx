@@ -51,7 +51,8 @@ export default function ProfileSocketListener({ onEvent }) {
         socket.onmessage = (event) => {
           try {
             const data = JSON.parse(event.data);
-            onEvent?.(data);
+            const messages = data.type === 'batch' ? data.messages : [data];
+            messages.forEach((message) => onEvent?.(message));
           } catch (err) {
             console.error('[WS] JSON parse error:', err);
           }
@@ -9,17 +9,28 @@ import { useMaintenanceStatus } from '../hooks/useMaintenanceStatus';
 const WebSocketContext = createContext();
 
 export const WebSocketProvider = ({ children }) => {
-  const { player } = useGame();
+  const { player, activityTimer, questTimer } = useGame();
   const { showToast } = useToast();
   const { refetch: maintenanceRefetch } = useMaintenanceStatus();
   const eventHandlersRef = useRef(new Set());
 
+  // Read through a ref so timer re-renders don't recreate onMessage (and reconnect)
+  const timersRef = useRef({ activityTimer, questTimer });
+  timersRef.current = { activityTimer, questTimer };
+
+  // Server clock deadlines are converted with the offset measured on receipt
+  const applyTimerSync = useCallback((sync) => {
+    const offsetMs = sync.server_time - Date.now();
+    timersRef.current.activityTimer.applySync(sync.activity, offsetMs);
+    timersRef.current.questTimer.applySync(sync.quest, offsetMs);
+  }, []);
+
   const onMessage = useCallback((data) => {
     //console.log("[WS Provider] showToast:", showToast);
-    handleGlobalWebSocketEvent(data, { showToast, maintenanceRefetch });
+    handleGlobalWebSocketEvent(data, { showToast, maintenanceRefetch, applyTimerSync });
 
     eventHandlersRef.current.forEach((handler) => handler(data));
-  }, [showToast, maintenanceRefetch ]);
+  }, [showToast, maintenanceRefetch, applyTimerSync ]);
 
   const onError = useCallback(() => {
     console.error('WebSocket connection error');
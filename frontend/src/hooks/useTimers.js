@@ -283,6 +283,34 @@ export default function useTimers({ mode }) {
     }
   }, [mode]);
 
+  // Apply a server timer_sync clock; offsetMs is server time minus local time
+  const applySync = useCallback((clock, offsetMs = 0) => {
+    if (!clock) return;
+    const { status: serverStatus, elapsed: banked, started_at, duration: serverDuration } = clock;
+
+    setStatus(serverStatus);
+    if (mode === "quest" && serverDuration !== undefined) {
+      setDuration(serverDuration);
+    }
+
+    pausedTimeRef.current = banked;
+    if (serverStatus === "active" && started_at) {
+      // Translate the server start time onto the local clock and tick from there
+      startTimeRef.current = started_at - offsetMs;
+      setElapsed(banked + Math.floor((Date.now() - startTimeRef.current) / 1000));
+      if (!timerRef.current) {
+        timerRef.current = setInterval(tickMain, 1000);
+      }
+    } else {
+      startTimeRef.current = null;
+      setElapsed(banked);
+      if (timerRef.current) {
+        clearInterval(timerRef.current);
+        timerRef.current = null;
+      }
+    }
+  }, [mode, tickMain]);
+
   return {
     status,
     elapsed,
@@ -298,5 +326,6 @@ export default function useTimers({ mode }) {
     reset,
     assignSubject,
     loadFromServer,
+    applySync,
   };
 }
@@ -12,6 +12,7 @@ export function useWebSocketConnection(
   const socketRef = useRef(null);
   const reconnectTimeout = useRef(null);
   const reconnectAttempts = useRef(0);
+  const heartbeatInterval = useRef(null);
 
   const [isConnected, setIsConnected] = useState(false);
   const connectingRef = useRef(false);
@@ -19,6 +20,15 @@ export function useWebSocketConnection(
   const maxReconnectAttempts = 10;
   const baseReconnectInterval = 1000; // 1 second
   const reconnectDecay = 1.5;
+  // Must stay well under the server's TIMER_HEARTBEAT_TIMEOUT, or timers get paused
+  const heartbeatMs = 30000;
+
+  const stopHeartbeat = () => {
+    if (heartbeatInterval.current) {
+      clearInterval(heartbeatInterval.current);
+      heartbeatInterval.current = null;
+    }
+  };
 
   const connectWebSocket = useCallback(async () => {
     if (connectingRef.current) {
@@ -70,13 +80,22 @@ export function useWebSocketConnection(
         setIsConnected(true);
         reconnectAttempts.current = 0;
 
+        stopHeartbeat();
+        heartbeatInterval.current = setInterval(() => {
+          if (socket.readyState === WebSocket.OPEN) {
+            socket.send(JSON.stringify({ type: 'ping' }));
+          }
+        }, heartbeatMs);
+
         onOpen?.();
       };
 
       socket.onmessage = (event) => {
         try {
           const data = JSON.parse(event.data);
-          onMessage?.(data);
+          // The server coalesces bursts of messages into one batch frame
+          const messages = data.type === 'batch' ? data.messages : [data];
+          messages.forEach((message) => onMessage?.(message));
         } catch (e) {
           //console.error('[WS] JSON parse error:', e);
         }
@@ -91,6 +110,7 @@ export function useWebSocketConnection(
         //console.log(`[WS] Socket closed. Code: ${event.code}, Reason: ${event.reason}, Clean: ${event.wasClean}`);
         connectingRef.current = false;
         setIsConnected(false);
+        stopHeartbeat();
         onClose?.();
 
         if (reconnectAttempts.current < maxReconnectAttempts) {
@@ -127,6 +147,7 @@ export function useWebSocketConnection(
 
     return () => {
       //console.log('[WS] Effect cleanup: closing socket');
+      stopHeartbeat();
       if (reconnectTimeout.current) {
         clearTimeout(reconnectTimeout.current);
         reconnectTimeout.current = null;
@@ -1,6 +1,6 @@
 // websockets/handleGlobalWebSocketEvent.js
 
-export async function handleGlobalWebSocketEvent(data, { showToast, maintenanceRefetch, setMaintenance }) {
+export async function handleGlobalWebSocketEvent(data, { showToast, maintenanceRefetch, setMaintenance, applyTimerSync }) {
   switch (data.type) {
     case 'notification':
       showToast?.(data.message);
@@ -11,6 +11,9 @@ export async function handleGlobalWebSocketEvent(data, { showToast, maintenanceR
     case 'pong':
       console.log('[WS] Pong!');
       break;
+    case 'timer_sync':
+      applyTimerSync?.(data);
+      break;
 
     case 'action':
       switch (data.action) {
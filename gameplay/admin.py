@@ -5,11 +5,14 @@ from .models import (
     Quest,
     QuestRequirement,
     QuestCompletion,
+    QuestCompletionLog,
     Activity,
     ActivityTimer,
     QuestTimer,
     QuestResults,
     ServerMessage,
+    TimerDailyTotal,
+    TimerSegment,
 )
 
 # Register your models here.
@@ -74,6 +77,52 @@ class QuestCompletionAdmin(admin.ModelAdmin):
     readonly_fields = ["last_completed"]
 
 
+@admin.register(QuestCompletionLog)
+class QuestCompletionLogAdmin(admin.ModelAdmin):
+    list_display = ["character", "quest", "completed_at", "duration", "xp_gained"]
+    list_filter = ["completed_at"]
+    readonly_fields = ["character", "quest", "completed_at", "duration", "xp_gained"]
+    date_hierarchy = "completed_at"
+    show_full_result_count = False
+
+
+@admin.register(TimerSegment)
+class TimerSegmentAdmin(admin.ModelAdmin):
+    list_display = ["timer_type", "timer_id", "started_at", "ended_at", "duration"]
+    list_filter = ["timer_type", "started_at"]
+    readonly_fields = [
+        "timer_type",
+        "timer_id",
+        "profile",
+        "character",
+        "activity",
+        "quest",
+        "started_at",
+        "ended_at",
+        "duration",
+    ]
+    date_hierarchy = "started_at"
+    show_full_result_count = False
+
+
+@admin.register(TimerDailyTotal)
+class TimerDailyTotalAdmin(admin.ModelAdmin):
+    list_display = ["timer_type", "timer_id", "date", "total_seconds", "segment_count"]
+    list_filter = ["timer_type", "date"]
+    readonly_fields = [
+        "timer_type",
+        "timer_id",
+        "profile",
+        "character",
+        "date",
+        "total_seconds",
+        "segment_count",
+        "hourly",
+    ]
+    date_hierarchy = "date"
+    show_full_result_count = False
+
+
 @admin.register(Activity)
 class ActivityAdmin(admin.ModelAdmin):
     list_display = ["profile", "name", "duration", "created_at"]
@@ -0,0 +1,6 @@
+"""
+Gameplay Benchmarks
+
+Tools for measuring the latency and query counts of gameplay hot paths against a
+reproducible synthetic world. Run them with `manage.py benchmark_gameplay`.
+"""
@@ -0,0 +1,271 @@
+"""
+Gameplay Benchmark Suite
+
+Each benchmark runs one gameplay hot path repeatedly against a synthetic world and
+records the wall-clock latency and the number of database queries of every run.
+
+Classes:
+    - BenchmarkResult: Timings and query counts for one benchmark.
+
+Functions:
+    - measure(name, func, iterations, setup): Runs and measures a callable.
+    - run_suite(world, iterations, only): Runs the registered benchmarks.
+    - compare_to_baseline(results, baseline, tolerance): Lists regressions against a previous run.
+"""
+
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from typing import Callable, Dict, List, Optional
+import random, statistics, time
+
+from api.views import ActivityViewSet, FetchInfoAPIView
+from gameplay.consumers import TimerConsumer
+from gameplay.models import Activity
+from gameplay.services.eligibility_cache import invalidate_eligible_quests
+from gameplay.utils import check_quest_eligibility
+from .world import SyntheticWorld
+
+
+class BenchmarkResult:
+    """
+    Timings and query counts for one benchmark.
+
+    Attributes:
+        name (str): The benchmark name.
+        timings (list): Wall-clock seconds per run.
+        queries (list): Database queries per run.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.timings: List[float] = []
+        self.queries: List[int] = []
+
+    def add(self, seconds: float, queries: int):
+        self.timings.append(seconds)
+        self.queries.append(queries)
+
+    def summary(self) -> dict:
+        """
+        Summarise the runs in milliseconds.
+
+        :return: A dictionary of run count, latency percentiles and query counts.
+        :rtype: dict
+        """
+        timings = sorted(self.timings)
+        p95 = timings[min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))]
+        return {
+            "name": self.name,
+            "runs": len(timings),
+            "min_ms": round(timings[0] * 1000, 3),
+            "median_ms": round(statistics.median(timings) * 1000, 3),
+            "p95_ms": round(p95 * 1000, 3),
+            "max_ms": round(timings[-1] * 1000, 3),
+            "mean_queries": round(statistics.mean(self.queries), 2),
+            "max_queries": max(self.queries),
+        }
+
+
+def measure(
+    name: str,
+    func: Callable,
+    iterations: int,
+    setup: Optional[Callable[[int], tuple]] = None,
+) -> BenchmarkResult:
+    """
+    Run `func` repeatedly, timing each run and counting its queries. The optional
+    `setup` callable is called (unmeasured) before each run and returns the
+    arguments for that run.
+
+    :param name: The benchmark name.
+    :type name: str
+    :param func: The callable to measure.
+    :param iterations: The number of measured runs.
+    :type iterations: int
+    :param setup: Called with the run number; returns the positional arguments for `func`.
+    :return: The recorded result.
+    :rtype: BenchmarkResult
+    """
+    result = BenchmarkResult(name)
+    connection = connections["default"]
+    for i in range(iterations):
+        args = setup(i) if setup else ()
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            func(*args)
+            elapsed = time.perf_counter() - start
+        result.add(elapsed, len(context.captured_queries))
+    return result
+
+
+def bench_check_quest_eligibility_cold(world: SyntheticWorld, rng, iterations):
+    def setup(i):
+        profile, character = rng.choice(world.players())
+        invalidate_eligible_quests(character.id)
+        return character, profile
+
+    return measure(
+        "check_quest_eligibility (cold)", check_quest_eligibility, iterations, setup
+    )
+
+
+def bench_check_quest_eligibility_warm(world: SyntheticWorld, rng, iterations):
+    def setup(i):
+        profile, character = rng.choice(world.players())
+        check_quest_eligibility(character, profile)
+        return character, profile
+
+    return measure(
+        "check_quest_eligibility (warm)", check_quest_eligibility, iterations, setup
+    )
+
+
+def bench_fetch_info(world: SyntheticWorld, rng, iterations):
+    factory = APIRequestFactory()
+    view = FetchInfoAPIView.as_view()
+
+    def setup(i):
+        profile = rng.choice(world.profiles)
+        request = factory.get("/api/v1/fetch_info/")
+        force_authenticate(request, user=profile.user)
+        return (request,)
+
+    return measure("FetchInfoAPIView.get", view, iterations, setup)
+
+
+def bench_activity_submit(world: SyntheticWorld, rng, iterations):
+    factory = APIRequestFactory()
+    view = ActivityViewSet.as_view({"post": "submit"})
+
+    def setup(i):
+        profile = rng.choice(world.profiles)
+        activity = Activity.objects.filter(profile=profile).first()
+        request = factory.post(
+            f"/api/v1/activities/{activity.pk}/submit/",
+            {"name": f"Renamed {i}"},
+            format="json",
+        )
+        force_authenticate(request, user=profile.user)
+        return request, activity.pk
+
+    def submit(request, pk):
+        return view(request, pk=pk)
+
+    return measure("ActivityViewSet.submit", submit, iterations, setup)
+
+
+def bench_quest_timer_complete(world: SyntheticWorld, rng, iterations):
+    def setup(i):
+        character = rng.choice(world.characters)
+        timer = character.quest_timer
+        timer.change_quest(rng.choice(world.quests), 300)
+        timer.start()
+        return (timer,)
+
+    def complete(timer):
+        return timer.complete()
+
+    return measure("QuestTimer.complete", complete, iterations, setup)
+
+
+def bench_consumer_ping(world: SyntheticWorld, rng, iterations):
+    profile = rng.choice(world.profiles)
+    result = BenchmarkResult("TimerConsumer ping")
+    # Sync database work from the consumer runs on this thread's connection
+    connection = connections["default"]
+
+    async def run(context):
+        communicator = WebsocketCommunicator(
+            TimerConsumer.as_asgi(), f"/ws/profile_{profile.id}/"
+        )
+        communicator.scope["user"] = profile.user
+        connected, _ = await communicator.connect()
+        if not connected:
+            raise RuntimeError("TimerConsumer refused the benchmark connection")
+        # Skip any pending server messages sent ahead of the connection confirmation
+        while (await communicator.receive_json_from())["type"] != "console.log":
+            pass
+        try:
+            for i in range(iterations):
+                queries_before = len(context)
+                start = time.perf_counter()
+                await communicator.send_json_to({"type": "ping"})
+                await communicator.receive_json_from()
+                elapsed = time.perf_counter() - start
+                result.add(elapsed, len(context) - queries_before)
+        finally:
+            await communicator.disconnect()
+
+    # The query log can only be switched on from sync code
+    with CaptureQueriesContext(connection) as context:
+        async_to_sync(run)(context)
+    return result
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    "eligibility_cold": bench_check_quest_eligibility_cold,
+    "eligibility_warm": bench_check_quest_eligibility_warm,
+    "fetch_info": bench_fetch_info,
+    "activity_submit": bench_activity_submit,
+    "quest_timer_complete": bench_quest_timer_complete,
+    "consumer_ping": bench_consumer_ping,
+}
+
+
+def run_suite(
+    world: SyntheticWorld, iterations: int = 50, only: Optional[List[str]] = None
+) -> List[BenchmarkResult]:
+    """
+    Run the registered benchmarks against a world.
+
+    :param world: The synthetic world to run against.
+    :type world: SyntheticWorld
+    :param iterations: Measured runs per benchmark.
+    :type iterations: int
+    :param only: Names of the benchmarks to run. Defaults to all.
+    :type only: list
+    :return: One result per benchmark, in registration order.
+    :rtype: list
+    """
+    rng = random.Random(world.seed)
+    return [
+        benchmark(world, rng, iterations)
+        for name, benchmark in BENCHMARKS.items()
+        if not only or name in only
+    ]
+
+
+def compare_to_baseline(
+    results: List[dict], baseline: List[dict], tolerance: float = 0.2
+) -> List[str]:
+    """
+    Compare summaries against a previous run. A benchmark regresses if it makes
+    more queries per run, or its median latency grows by more than `tolerance`.
+
+    :param results: Summaries of the current run.
+    :type results: list
+    :param baseline: Summaries of the baseline run.
+    :type baseline: list
+    :param tolerance: Allowed relative growth of the median latency.
+    :type tolerance: float
+    :return: A description of each regression.
+    :rtype: list
+    """
+    previous = {summary["name"]: summary for summary in baseline}
+    regressions = []
+    for summary in results:
+        before = previous.get(summary["name"])
+        if before is None:
+            continue
+        if summary["mean_queries"] > before["mean_queries"]:
+            regressions.append(
+                f"{summary['name']}: {before['mean_queries']} -> {summary['mean_queries']} queries per run"
+            )
+        if summary["median_ms"] > before["median_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{summary['name']}: median {before['median_ms']}ms -> {summary['median_ms']}ms"
+            )
+    return regressions
@@ -0,0 +1,283 @@
+"""
+Synthetic World Generator
+
+Builds a reproducible world for benchmarking: users with profiles and activity
+timers, linked characters with quest timers, a quest catalog with results and
+prerequisite chains, and large numbers of quest completions and activities.
+
+Rows are inserted with `bulk_create` in batches, so model signals do not fire;
+everything the signals would normally create is created explicitly, and the quest
+catalog version is bumped once at the end.
+
+Classes:
+    - SyntheticWorld: Handles to the generated rows.
+
+Functions:
+    - build_world(...): Generates a world and returns a SyntheticWorld.
+    - delete_world(prefix): Removes every row created by build_world with the given prefix.
+"""
+
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from typing import Iterable, Iterator, List
+import itertools, logging, random
+
+from character.models import Character, PlayerCharacterLink
+from gameplay.models import (
+    Activity,
+    ActivityTimer,
+    Quest,
+    QuestCompletion,
+    QuestRequirement,
+    QuestResults,
+    QuestTimer,
+)
+from gameplay.services.quest_catalog import bump_catalog_version
+from users.models import Profile
+
+logger = logging.getLogger("django")
+
+BENCHMARK_PASSWORD = "benchmark-password"
+
+
+class SyntheticWorld:
+    """
+    Handles to the rows of a generated world.
+
+    Attributes:
+        seed (int): The random seed the world was generated with.
+        prefix (str): The name prefix used to tag generated rows.
+        profiles (list): The generated profiles, with their users.
+        characters (list): The characters linked to each profile, in the same order.
+        quests (list): The generated quests.
+    """
+
+    def __init__(self, seed, prefix, profiles, characters, quests):
+        self.seed = seed
+        self.prefix = prefix
+        self.profiles: List[Profile] = profiles
+        self.characters: List[Character] = characters
+        self.quests: List[Quest] = quests
+
+    def players(self):
+        """Return (profile, character) pairs."""
+        return list(zip(self.profiles, self.characters))
+
+
+def _batched(rows: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def _bulk_insert(model, rows: Iterable, batch_size: int) -> int:
+    count = 0
+    for batch in _batched(rows, batch_size):
+        model.objects.bulk_create(batch)
+        count += len(batch)
+    logger.debug(f"[SYNTHETIC WORLD] Inserted {count} {model.__name__} rows")
+    return count
+
+
+def _create_quests(rng: random.Random, prefix: str, count: int, batch_size: int):
+    frequencies = [choice for choice, _ in Quest.Frequency.choices]
+    quests = []
+    for i in range(count):
+        level_min = rng.randint(0, 20)
+        quests.append(
+            Quest(
+                name=f"{prefix} quest {i}",
+                description=f"Synthetic quest {i}",
+                levelMin=level_min,
+                levelMax=level_min + rng.randint(0, 30),
+                canRepeat=rng.random() < 0.8,
+                is_premium=rng.random() < 0.1,
+                frequency=rng.choices(frequencies, weights=[85, 5, 5, 5])[0],
+                stages=[
+                    {"text": f"Stage {stage}", "duration": rng.randint(10, 120)}
+                    for stage in range(rng.randint(1, 5))
+                ],
+            )
+        )
+    quests = Quest.objects.bulk_create(quests, batch_size=batch_size)
+
+    _bulk_insert(
+        QuestResults,
+        (
+            QuestResults(
+                quest=quest,
+                xp_rate=rng.randint(1, 5),
+                coin_reward=rng.randint(0, 50),
+            )
+            for quest in quests
+        ),
+        batch_size,
+    )
+
+    # Each requirement points at an earlier quest, so the graph stays acyclic
+    # while forming chains of arbitrary depth
+    _bulk_insert(
+        QuestRequirement,
+        (
+            QuestRequirement(
+                quest=quest,
+                prerequisite=quests[rng.randrange(i)],
+                times_required=rng.randint(1, 3),
+            )
+            for i, quest in enumerate(quests)
+            if i and rng.random() < 0.3
+        ),
+        batch_size,
+    )
+    return quests
+
+
+def _create_players(rng: random.Random, prefix: str, count: int, batch_size: int):
+    User = get_user_model()
+    password = make_password(BENCHMARK_PASSWORD)
+    users = User.objects.bulk_create(
+        [
+            User(
+                email=f"{prefix}_user_{i}@example.com",
+                password=password,
+                is_confirmed=True,
+            )
+            for i in range(count)
+        ],
+        batch_size=batch_size,
+    )
+    profiles = Profile.objects.bulk_create(
+        [
+            Profile(user=user, name=f"{prefix} user {i}", is_premium=rng.random() < 0.2)
+            for i, user in enumerate(users)
+        ],
+        batch_size=batch_size,
+    )
+    characters = Character.objects.bulk_create(
+        [
+            Character(
+                name=f"{prefix} character {i}",
+                first_name=f"{prefix} character {i}",
+                level=rng.randint(0, 40),
+                is_npc=False,
+            )
+            for i in range(count)
+        ],
+        batch_size=batch_size,
+    )
+    _bulk_insert(
+        ActivityTimer,
+        (ActivityTimer(profile=profile) for profile in profiles),
+        batch_size,
+    )
+    _bulk_insert(
+        QuestTimer,
+        (QuestTimer(character=character) for character in characters),
+        batch_size,
+    )
+    _bulk_insert(
+        PlayerCharacterLink,
+        (
+            PlayerCharacterLink(profile=profile, character=character)
+            for profile, character in zip(profiles, characters)
+        ),
+        batch_size,
+    )
+    for profile, user in zip(profiles, users):
+        profile.user = user
+    return profiles, characters
+
+
+def _completions(rng, characters, quests, per_character, now):
+    per_character = min(per_character, len(quests))
+    for character in characters:
+        for quest in rng.sample(quests, per_character):
+            yield QuestCompletion(
+                character=character,
+                quest=quest,
+                times_completed=rng.randint(1, 5),
+                last_completed=now - timedelta(minutes=rng.randint(0, 60 * 24 * 90)),
+            )
+
+
+def _activities(rng, profiles, per_profile, now):
+    for profile in profiles:
+        for i in range(per_profile):
+            duration = rng.randint(60, 3600)
+            yield Activity(
+                profile=profile,
+                name=f"Activity {i}",
+                duration=duration,
+                xp_gained=duration,
+                completed_at=now - timedelta(minutes=rng.randint(0, 60 * 24 * 90)),
+            )
+
+
+def build_world(
+    users: int = 50,
+    quests: int = 1000,
+    completions_per_character: int = 100,
+    activities_per_profile: int = 100,
+    seed: int = 1,
+    prefix: str = "bench",
+    batch_size: int = 5000,
+) -> SyntheticWorld:
+    """
+    Generate a reproducible synthetic world.
+
+    :param users: The number of users (each with a profile and a linked character).
+    :type users: int
+    :param quests: The number of quests in the catalog.
+    :type quests: int
+    :param completions_per_character: Distinct quests completed by each character.
+    :type completions_per_character: int
+    :param activities_per_profile: Completed activities per profile.
+    :type activities_per_profile: int
+    :param seed: The random seed; the same seed always produces the same world.
+    :type seed: int
+    :param prefix: A prefix for generated names, used by delete_world.
+    :type prefix: str
+    :param batch_size: The number of rows per INSERT.
+    :type batch_size: int
+    :return: The generated world.
+    :rtype: SyntheticWorld
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    logger.info(
+        f"[SYNTHETIC WORLD] Building world '{prefix}' (seed {seed}): {users} users, {quests} quests"
+    )
+
+    with transaction.atomic():
+        quest_list = _create_quests(rng, prefix, quests, batch_size)
+        profiles, characters = _create_players(rng, prefix, users, batch_size)
+        _bulk_insert(
+            QuestCompletion,
+            _completions(rng, characters, quest_list, completions_per_character, now),
+            batch_size,
+        )
+        _bulk_insert(
+            Activity,
+            _activities(rng, profiles, activities_per_profile, now),
+            batch_size,
+        )
+        bump_catalog_version()
+
+    return SyntheticWorld(seed, prefix, profiles, characters, quest_list)
+
+
+def delete_world(prefix: str = "bench"):
+    """
+    Delete every row created by build_world with the given prefix.
+
+    :param prefix: The prefix the world was built with.
+    :type prefix: str
+    """
+    with transaction.atomic():
+        get_user_model().objects.filter(email__startswith=f"{prefix}_user_").delete()
+        Character.objects.filter(name__startswith=f"{prefix} character ").delete()
+        Quest.objects.filter(name__startswith=f"{prefix} quest ").delete()
+    logger.info(f"[SYNTHETIC WORLD] Deleted world '{prefix}'")
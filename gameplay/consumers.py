@@ -1,20 +1,37 @@
-# from asgiref.sync import sync_to_async
+from asgiref.sync import sync_to_async
 from channels.db import database_sync_to_async
 
 # from channels.exceptions import StopConsumer
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
 from django.db import transaction
 
 # from django.utils.timezone import now
-import json, logging
+import asyncio, logging
 from django.core.cache import cache
 from .models import ServerMessage
+from .services.heartbeats import arecord_heartbeat
+from .services.timer_state import flush_state
+from .services.timer_sync import timer_sync_message
+from .services.wire_protocol import SUBPROTOCOL, decode_message, encode_message
 from .utils import process_completion, process_initiation, control_timers
 
 logger = logging.getLogger("django")
 
+# Sent as soon as they are queued: clients read the server clock from timer syncs
+IMMEDIATE_TYPES = {"pong", "timer_sync", "error"}
+
 
 class TimerConsumer(AsyncJsonWebsocketConsumer):
+    # Set on connect if the client negotiated the binary msgpack subprotocol
+    use_msgpack = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Outbound messages waiting to be sent as one batched frame
+        self.outbox = []
+        self._flush_task = None
+
     async def connect(self):
         from django.contrib.auth.models import AnonymousUser
 
@@ -32,33 +49,32 @@ class TimerConsumer(AsyncJsonWebsocketConsumer):
                 await self.close()  # Reject the new connection
                 return
 
-            self.profile, self.character = await self.set_profile_and_character(user)
+            (
+                self.profile,
+                self.character,
+                self.activity_timer,
+                self.quest_timer,
+            ) = await self.hydrate(user)
             self.profile_group = f"profile_{self.profile.id}"
 
-            await database_sync_to_async(self.profile.set_online)()
-
-            is_online_now = await database_sync_to_async(
-                lambda: self.profile.is_online
-            )()
-            print(
-                f"[CONNECT] Profile {self.profile.id} is_online={is_online_now}"
-            )  # ✅ Verify status
-
             await self.channel_layer.group_add(self.profile_group, self.channel_name)
             await self.channel_layer.group_add("online_users", self.channel_name)
             logger.info(
                 f"[CONNECT] Added profile {self.profile.id} to 'online_users' group."
             )  # ✅ Debug log
 
-            await self.accept()
+            self.use_msgpack = SUBPROTOCOL in self.scope.get("subprotocols", [])
+            await self.accept(subprotocol=SUBPROTOCOL if self.use_msgpack else None)
             logger.info(
                 f"[CONNECT] WebSocket connection accepted for profile {self.profile.id}"
             )
 
             await self._send_pending_messages()
 
-            self.activity_timer = await self.get_activity_timer()
-            self.quest_timer = await self.get_quest_timer()
+            self.timer_snapshot = timer_sync_message(
+                self.activity_timer, self.quest_timer
+            )
+            await self.send_json(self.timer_snapshot)
 
             await self.send_json(
                 {
@@ -72,10 +88,13 @@ class TimerConsumer(AsyncJsonWebsocketConsumer):
             await self.close()
 
     async def disconnect(self, close_code):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
         logger.info(
             f"[DISCONNECT] WebSocket disconnecting. Player: {self.profile.id} | Code: {close_code}"
         )
-        await database_sync_to_async(self.profile.set_offline)()
+        await sync_to_async(self.profile.set_offline)()
         await self.channel_layer.group_discard("online_users", self.channel_name)
 
         if hasattr(self, "profile_group"):
@@ -88,14 +107,16 @@ class TimerConsumer(AsyncJsonWebsocketConsumer):
             logger.info(
                 f"Pausing timers for profile {self.profile.id}; websocket disconnected"
             )
-            if self.activity_timer.status not in [
+            await self.refresh_timers()
+            if self.timer_status("activity") not in [
                 "completed",
                 "empty",
                 "paused",
-            ] or self.quest_timer.status not in ["completed", "empty", "paused"]:
+            ] or self.timer_status("quest") not in ["completed", "empty", "paused"]:
                 await control_timers(
                     self.profile, self.activity_timer, self.quest_timer, "pause"
                 )
+            await self.flush_timers()
 
     async def test_message(self, event):
         logger.info(f"[TEST MESSAGE] Received test message: {event}")
@@ -113,6 +134,63 @@ class TimerConsumer(AsyncJsonWebsocketConsumer):
         """
         logger.info(f"[GROUP MESSAGE] Relaying group message. Event: {event}")
 
+    async def receive(self, text_data=None, bytes_data=None, **kwargs):
+        if bytes_data is not None and self.use_msgpack:
+            try:
+                event = decode_message(bytes_data)
+            except ValueError as e:
+                logger.warning(f"[RECEIVE] Ignoring frame: {e}")
+                return
+            await self.receive_json(event, **kwargs)
+        else:
+            await super().receive(text_data=text_data, bytes_data=bytes_data, **kwargs)
+
+    async def send_json(self, content, close=False):
+        """
+        Queue a message for the client. Messages queued within
+        `WS_BATCH_WINDOW_MS` of each other are sent together as one `batch` frame,
+        in order; latency-critical types, and closing messages, flush the queue
+        immediately.
+        """
+        self.outbox.append(content)
+        window = settings.WS_BATCH_WINDOW_MS
+        if close or not window or content.get("type") in IMMEDIATE_TYPES:
+            await self.flush_outbox(close=close)
+        elif self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_later(window / 1000))
+
+    async def _flush_later(self, delay):
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        try:
+            await self.flush_outbox()
+        except Exception as e:
+            logger.error(f"[FLUSH OUTBOX] Could not send batched messages: {e}")
+
+    async def flush_outbox(self, close=False):
+        """
+        Send every queued message now, as a single frame.
+        """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        messages, self.outbox = self.outbox, []
+        if not messages:
+            return
+        frame = (
+            messages[0]
+            if len(messages) == 1
+            else {"type": "batch", "messages": messages}
+        )
+        await self._send_frame(frame, close=close)
+
+    async def _send_frame(self, content, close=False):
+        # msgpack frames on the msgpack subprotocol, JSON text otherwise
+        if self.use_msgpack:
+            await self.send(bytes_data=encode_message(content), close=close)
+        else:
+            await super().send_json(content, close=close)
+
     async def receive_json(self, event, **kwargs):
         message_type = event.get("type")
         if message_type == "ping":
@@ -124,30 +202,18 @@ class TimerConsumer(AsyncJsonWebsocketConsumer):
                 f"[RECEIVE JSON] Message received: {event}, type: {message_type}"
             )
 
-        await database_sync_to_async(self.quest_timer.refresh_from_db)()
         if message_type:
             logger.debug(f"[RECEIVE JSON] Processing type: {message_type}")
             if message_type == "client_request":
                 # logger.debug(f"[RECEIVE JSON] Sending to handle_client_request")
                 await self.handle_client_request(event)
             elif message_type == "ping":
+                # Quest completion is driven by the deadline scheduler, not pings;
+                # the heartbeat goes to the cache only
+                await arecord_heartbeat(self.profile.id)
                 await self.send_json(
                     {"type": "pong", "action": "pong", "message": "pong"}
                 )
-                if self.quest_timer.status != "completed":
-                    logger.debug(
-                        f"[RECEIVE JSON] Quest status: {self.quest_timer.status}"
-                    )
-                    time_finished = await database_sync_to_async(
-                        self.quest_timer.time_finished
-                    )()
-                    if time_finished:
-                        logger.debug(
-                            f"[RECEIVE JSON] Quest timer is finished? {time_finished}"
-                        )
-                        await database_sync_to_async(process_completion)(
-                            self.profile, self.character, "complete_quest"
-                        )
 
             else:
                 logger.warning(f"[RECEIVE JSON] Unknown type received: {message_type}")
@@ -201,13 +267,14 @@ class TimerConsumer(AsyncJsonWebsocketConsumer):
             if not success:
                 logger.warning(f"[HANDLE CLIENT REQUEST] Failed to initiate {action}.")
         elif action in ["complete_quest", "submit_activity"]:
-            if action == "complete_quest" and self.quest_timer.status not in [
+            quest_status = self.timer_status("quest")
+            if action == "complete_quest" and quest_status not in [
                 "active",
                 "waiting",
                 "paused",
             ]:
                 logger.warning(
-                    f"[HANDLE CLIENT REQUEST] Cannot complete quest: Invalid status {self.quest_timer.status}"
+                    f"[HANDLE CLIENT REQUEST] Cannot complete quest: Invalid status {quest_status}"
                 )
                 return
 
@@ -224,37 +291,89 @@ class TimerConsumer(AsyncJsonWebsocketConsumer):
             logger.warning(f"[HANDLE CLIENT REQUEST] Unknown action: {action}")
 
     @database_sync_to_async
-    def set_profile_and_character(self, user):
+    def hydrate(self, user):
+        """
+        Load everything a connection needs in one thread-pool hop: the profile
+        with its activity timer and activity, and the active character with its
+        quest timer and quest, each in a single query. Marks the profile online
+        in the presence store.
+
+        :param user: The connecting user.
+        :type user: CustomUser
+        :return: The profile, character, activity timer and quest timer.
+        :rtype: tuple
+        """
+        from character.models import PlayerCharacterLink
+        from users.models import Profile
+
+        logger.debug(f"[HYDRATE] Loading profile and timers for user: {user.id}")
         with transaction.atomic():
-            logger.debug(
-                f"[SET PROFILE] Setting profile and character for user: {user.username}"
+            profile = Profile.objects.select_related(
+                "user", "activity_timer__activity"
+            ).get(user_id=user.id)
+            links = list(
+                PlayerCharacterLink.objects.filter(profile=profile, is_active=True)
+                .select_related("character__quest_timer__quest")
+                .order_by("id")[:2]
             )
-            from character.models import PlayerCharacterLink
+            if not links:
+                raise ValueError("No active Character found for this profile.")
+            if len(links) > 1:
+                logger.warning(
+                    f"[HYDRATE] Multiple active characters found for profile {profile.id} — using the first one"
+                )
+            character = links[0].character
 
-            character = PlayerCharacterLink().get_character(user.profile)
-            return user.profile, character
+        profile.set_online()
 
-    @database_sync_to_async
-    def get_activity_timer(self):
-        logger.debug(
-            f"[GET ACTIVITY TIMER] Fetching activity timer for profile: {self.profile.id}"
+        return (
+            profile,
+            character,
+            getattr(profile, "activity_timer", None),
+            getattr(character, "quest_timer", None),
         )
-        from .models import ActivityTimer
 
-        return ActivityTimer.objects.filter(profile=self.profile).first()
+    @database_sync_to_async
+    def refresh_timers(self):
+        """
+        Reload the timers' state and rebuild the snapshot from it, in case a sync
+        message for a transition made elsewhere has not arrived.
+        """
+        for timer in (self.activity_timer, self.quest_timer):
+            if timer is not None:
+                timer.refresh_state()
+        self.timer_snapshot = timer_sync_message(self.activity_timer, self.quest_timer)
 
     @database_sync_to_async
-    def get_quest_timer(self):
-        logger.debug(
-            f"[GET QUEST TIMER] Fetching quest timer for character: {self.character.id}"
-        )
-        from .models import QuestTimer
+    def flush_timers(self):
+        """Write any live timer state to the database as the session ends."""
+        flush_state(self.activity_timer)
+        flush_state(self.quest_timer)
+
+    def timer_status(self, kind):
+        """
+        Get a timer's status from the snapshot, without touching the database.
 
-        return QuestTimer.objects.filter(character=self.character).first()
+        :param kind: "activity" or "quest".
+        :type kind: str
+        :return: The timer's status, or None if there is no timer.
+        :rtype: str or None
+        """
+        clock = self.timer_snapshot.get(kind)
+        return clock["status"] if clock else None
+
+    async def timer_sync(self, event):
+        """
+        Relay the compact timer sync message sent after a transition, merging it
+        into the consumer's timer snapshot: it may carry only the timer that changed.
+        """
+        logger.debug(f"[TIMER SYNC] Sending timer sync: {event}")
+        self.timer_snapshot = {**self.timer_snapshot, **event}
+        await self.send_json(event)
 
     async def send_timer_update(self, event):
         logger.debug(f"[SEND TIMER UPDATE] Sending timer update: {event['data']}")
-        await self.send(text_data=json.dumps(event["data"]))
+        await self.send_json(event["data"])
 
     def get_activity_time(self):
         """Get the current activity time."""
@@ -269,13 +388,11 @@ class TimerConsumer(AsyncJsonWebsocketConsumer):
     async def timer_update(self):
         """Receive timer updates from the group."""
         logger.debug(f"[TIMER UPDATE] Sending timer updates to the client.")
-        await self.send(
-            json.dumps(
-                {
-                    "activity_time": self.get_activity_time(),
-                    "quest_time": self.get_quest_time(),
-                }
-            )
+        await self.send_json(
+            {
+                "activity_time": self.get_activity_time(),
+                "quest_time": self.get_quest_time(),
+            }
         )
 
     async def server_message(self, event):
@@ -329,8 +446,11 @@ class TimerConsumer(AsyncJsonWebsocketConsumer):
         from .models import ServerMessage
 
         get_unread_messages = database_sync_to_async(
-            lambda: list(ServerMessage.get_unread(self.profile_group))
-            + list(ServerMessage.get_unread("online_users"))
+            lambda: list(
+                ServerMessage.get_unread([self.profile_group, "online_users"]).order_by(
+                    "created_at", "id"
+                )
+            )
         )
         messages = await get_unread_messages()
 
@@ -357,7 +477,8 @@ class TimerConsumer(AsyncJsonWebsocketConsumer):
                     f"[SEND PENDING MESSAGES] Failed to send message {message.id}: {e}"
                 )
 
-        # Mark successfully sent messages as delivered
+        # Mark successfully sent messages as delivered, once actually sent
+        await self.flush_outbox()
         if successful_message_ids:
             await database_sync_to_async(
                 lambda: ServerMessage.objects.filter(
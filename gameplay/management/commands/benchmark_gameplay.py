@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+import json, logging
+
+from gameplay.benchmarks.suite import BENCHMARKS, compare_to_baseline, run_suite
+from gameplay.benchmarks.world import build_world, delete_world
+
+logger = logging.getLogger("django")
+
+
+class Command(BaseCommand):
+    help = "Builds a synthetic world and benchmarks gameplay hot paths (latency and query counts)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--quests", type=int, default=1000)
+        parser.add_argument(
+            "--completions", type=int, default=100, help="Per character"
+        )
+        parser.add_argument("--activities", type=int, default=100, help="Per profile")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument(
+            "--only", nargs="+", choices=list(BENCHMARKS), help="Benchmarks to run"
+        )
+        parser.add_argument(
+            "--prefix", default="bench", help="Name prefix of generated rows"
+        )
+        parser.add_argument(
+            "--json", dest="json_path", help="Write the results to this file"
+        )
+        parser.add_argument(
+            "--baseline", help="Fail if results regress against this file"
+        )
+        parser.add_argument("--tolerance", type=float, default=0.2)
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the synthetic world afterwards"
+        )
+        parser.add_argument(
+            "--force", action="store_true", help="Allow running with DEBUG off"
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["force"]:
+            raise CommandError(
+                "Refusing to write a synthetic world with DEBUG off; pass --force to run anyway."
+            )
+
+        prefix = options["prefix"]
+        delete_world(prefix)
+        world = build_world(
+            users=options["users"],
+            quests=options["quests"],
+            completions_per_character=options["completions"],
+            activities_per_profile=options["activities"],
+            seed=options["seed"],
+            prefix=prefix,
+        )
+
+        try:
+            results = run_suite(world, options["iterations"], options["only"])
+        finally:
+            if not options["keep"]:
+                delete_world(prefix)
+
+        summaries = [result.summary() for result in results]
+        self._print_table(summaries)
+
+        if options["json_path"]:
+            with open(options["json_path"], "w") as f:
+                json.dump(summaries, f, indent=2)
+            self.stdout.write(f"Results written to {options['json_path']}")
+
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+            regressions = compare_to_baseline(summaries, baseline, options["tolerance"])
+            if regressions:
+                raise CommandError("Regressions found:\n  " + "\n  ".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline"))
+
+    def _print_table(self, summaries):
+        columns = [
+            "runs",
+            "median_ms",
+            "p95_ms",
+            "max_ms",
+            "mean_queries",
+            "max_queries",
+        ]
+        width = max(len(summary["name"]) for summary in summaries) if summaries else 10
+        self.stdout.write(
+            f"{'benchmark':<{width}}  " + "  ".join(f"{c:>12}" for c in columns)
+        )
+        for summary in summaries:
+            self.stdout.write(
+                f"{summary['name']:<{width}}  "
+                + "  ".join(f"{summary[c]:>12}" for c in columns)
+            )
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.22 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gameplay", "0096_activity_xp_gained"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="questcompletion",
+            index=models.Index(
+                fields=["character", "quest", "last_completed"],
+                name="questcompletion_window_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.22 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gameplay", "0097_questcompletion_window_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="quest",
+            index=models.Index(
+                fields=["is_active", "levelMin", "levelMax"],
+                name="quest_level_window_idx",
+            ),
+        ),
+    ]
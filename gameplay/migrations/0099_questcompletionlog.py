@@ -0,0 +1,64 @@
+# Generated by Django 4.2.22 on 2026-10-18 09:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("character", "0007_character_can_link"),
+        ("gameplay", "0098_quest_level_window_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QuestCompletionLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "completed_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("duration", models.PositiveIntegerField(default=0)),
+                ("xp_gained", models.IntegerField(default=0)),
+                (
+                    "character",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="quest_completion_log",
+                        to="character.character",
+                    ),
+                ),
+                (
+                    "quest",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="completion_log",
+                        to="gameplay.quest",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["character", "completed_at"],
+                        name="completionlog_character_idx",
+                    ),
+                    models.Index(
+                        fields=["quest", "completed_at"], name="completionlog_quest_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,154 @@
+# Generated by Django 4.2.22 on 2026-10-18 09:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0032_alter_profile_last_login"),
+        ("character", "0007_character_can_link"),
+        ("gameplay", "0099_questcompletionlog"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimerSegment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "timer_type",
+                    models.CharField(
+                        choices=[("activity", "Activity"), ("quest", "Quest")],
+                        max_length=10,
+                    ),
+                ),
+                ("timer_id", models.PositiveIntegerField()),
+                ("started_at", models.DateTimeField()),
+                ("ended_at", models.DateTimeField()),
+                ("duration", models.PositiveIntegerField(default=0)),
+                (
+                    "activity",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="timer_segments",
+                        to="gameplay.activity",
+                    ),
+                ),
+                (
+                    "character",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timer_segments",
+                        to="character.character",
+                    ),
+                ),
+                (
+                    "profile",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timer_segments",
+                        to="users.profile",
+                    ),
+                ),
+                (
+                    "quest",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="timer_segments",
+                        to="gameplay.quest",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["timer_type", "timer_id", "started_at"],
+                        name="timersegment_timer_idx",
+                    ),
+                    models.Index(
+                        fields=["profile", "started_at"],
+                        name="timersegment_profile_idx",
+                    ),
+                    models.Index(fields=["ended_at"], name="timersegment_ended_idx"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="TimerDailyTotal",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "timer_type",
+                    models.CharField(
+                        choices=[("activity", "Activity"), ("quest", "Quest")],
+                        max_length=10,
+                    ),
+                ),
+                ("timer_id", models.PositiveIntegerField()),
+                ("date", models.DateField()),
+                ("total_seconds", models.PositiveIntegerField(default=0)),
+                ("segment_count", models.PositiveIntegerField(default=0)),
+                ("hourly", models.JSONField(default=list)),
+                (
+                    "character",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timer_daily_totals",
+                        to="character.character",
+                    ),
+                ),
+                (
+                    "profile",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timer_daily_totals",
+                        to="users.profile",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["profile", "date"], name="timerdailytotal_profile_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="timerdailytotal",
+            constraint=models.UniqueConstraint(
+                fields=("timer_type", "timer_id", "date"),
+                name="timerdailytotal_unique_day",
+            ),
+        ),
+    ]
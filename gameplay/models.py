@@ -8,15 +8,18 @@ Author: Duncan Appleby
 
 # gameplay.models
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 
 # from django_stubs_ext.db.models import Related
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
 
 # from django.db.models import ForeignKey
 from django.db.models import QuerySet
+from django.db.models.functions import Coalesce
+from django.db.models.query import ModelIterable
 from django.utils import timezone
 from typing import Optional, Iterable, Dict, Any, cast, List, TYPE_CHECKING
-import json, logging, math
+import contextvars, itertools, json, logging, math
 
 if TYPE_CHECKING:
     from character.models import Character
@@ -91,6 +94,15 @@ class Quest(models.Model):
         max_length=6, choices=Frequency.choices, default=Frequency.NONE
     )
 
+    class Meta:
+        indexes = [
+            # Level window range filters over active quests
+            models.Index(
+                fields=["is_active", "levelMin", "levelMax"],
+                name="quest_level_window_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -148,37 +160,21 @@ class Quest(models.Model):
     def frequency_eligible(self, character: "Character"):
         """
         Check if the quest is eligible to be undertaken based on its frequency.
+        Daily, weekly and monthly quests can be completed once per calendar day,
+        week (starting Monday) or month.
 
         :param character: The character attempting the quest.
         :type character: Character
         :return: True if the quest is frequency-eligible, False otherwise.
         :rtype: bool
         """
-        if self.frequency != "NONE":
-            today = timezone.now()
-            completions = self.quest_completions.all()
-            for completion in completions:
-                if completion.character == character:
-                    lastCompleted = completion.last_completed
-
-                    if self.frequency == "DAY":
-                        if (today - lastCompleted).days == 0:
-                            return False
-
-                    elif self.frequency == "WEEK":
-                        dateDiff = today - lastCompleted
-                        if dateDiff.days < 7:
-                            if today.weekday() >= lastCompleted.weekday():
-                                return False
-
-                    elif self.frequency == "MONTH":
-                        dateDiff = today - lastCompleted
-                        if dateDiff.days < 31:
-                            todayDate = int(today.strftime("%d"))
-                            lastCompletedDate = int(lastCompleted.strftime("%d"))
-                            if todayDate >= lastCompletedDate:
-                                return False
-        return True
+        if self.frequency == self.Frequency.NONE:
+            return True
+        return not (
+            QuestCompletion.objects.filter(character=character, quest=self)
+            .in_frequency_window()
+            .exists()
+        )
 
     def checkEligible(self, character: "Character", profile):
         """
@@ -338,6 +334,73 @@ class QuestRequirement(models.Model):
     def __str__(self):
         return f"{self.prerequisite.name} required {self.times_required} time(s) for {self.quest.name}"
 
+    def clean(self):
+        """
+        Reject requirements that would make the prerequisite graph cyclic.
+
+        :raises ValidationError: If the requirement creates a cycle.
+        """
+        from django.core.exceptions import ValidationError
+        from .services.prerequisites import find_cycle
+
+        if not (self.quest_id and self.prerequisite_id):
+            return
+
+        edges: Dict[int, List] = {}
+        others = QuestRequirement.objects.exclude(pk=self.pk).values_list(
+            "quest_id", "prerequisite_id", "times_required"
+        )
+        for quest_id, prerequisite_id, times_required in others:
+            edges.setdefault(quest_id, []).append((prerequisite_id, times_required))
+        edges.setdefault(self.quest_id, []).append(
+            (self.prerequisite_id, self.times_required)
+        )
+
+        cycle = find_cycle(edges)
+        if cycle:
+            path = " -> ".join(str(quest_id) for quest_id in cycle)
+            raise ValidationError(f"This requirement creates a cycle: {path}")
+
+
+class QuestCompletionQuerySet(models.QuerySet):
+    def annotate_frequency_window(self, moment=None):
+        """
+        Annotate each completion with `in_frequency_window`: True if its quest is
+        frequency-limited and it was completed in the quest's current window.
+
+        :param moment: The reference time. Defaults to now.
+        :type moment: datetime
+        """
+        from .services.frequency import window_start
+
+        moment = moment or timezone.now()
+        in_window = models.Q()
+        for frequency in (
+            Quest.Frequency.DAILY,
+            Quest.Frequency.WEEKLY,
+            Quest.Frequency.MONTHLY,
+        ):
+            in_window |= models.Q(
+                quest__frequency=frequency,
+                last_completed__gte=window_start(frequency, moment),
+            )
+        return self.annotate(
+            in_frequency_window=models.Case(
+                models.When(in_window, then=models.Value(True)),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            )
+        )
+
+    def in_frequency_window(self, moment=None):
+        """
+        Filter to completions that block their quest until the next frequency window.
+
+        :param moment: The reference time. Defaults to now.
+        :type moment: datetime
+        """
+        return self.annotate_frequency_window(moment).filter(in_frequency_window=True)
+
 
 class QuestCompletion(models.Model):
     """
@@ -360,12 +423,114 @@ class QuestCompletion(models.Model):
     times_completed = models.PositiveIntegerField(default=1)
     last_completed = models.DateTimeField(default=timezone.now)
 
+    objects = QuestCompletionQuerySet.as_manager()
+
     class Meta:
         unique_together = ("character", "quest")
+        indexes = [
+            # Frequency gating scans one character's completions by time
+            models.Index(
+                fields=["character", "quest", "last_completed"],
+                name="questcompletion_window_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"character {self.character.name} has completed {self.quest.name}"
 
+    @classmethod
+    def record(
+        cls,
+        character: "Character",
+        quest: Quest,
+        duration: int = 0,
+        xp_gained: int = 0,
+    ) -> "QuestCompletionLog":
+        """
+        Record a quest completion: append a ledger entry and increment the
+        character's counter for the quest with a single UPDATE, creating the
+        counter on first completion. Safe under concurrent completions.
+
+        :param character: The character who completed the quest.
+        :type character: Character
+        :param quest: The completed quest.
+        :type quest: Quest
+        :param duration: Seconds spent on the quest.
+        :type duration: int
+        :param xp_gained: XP awarded for the completion.
+        :type xp_gained: int
+        :return: The new ledger entry.
+        :rtype: QuestCompletionLog
+        """
+        with transaction.atomic():
+            entry = QuestCompletionLog.objects.create(
+                character=character,
+                quest=quest,
+                duration=duration,
+                xp_gained=xp_gained,
+            )
+            counter = cls.objects.filter(character=character, quest=quest)
+            increment = {
+                "times_completed": models.F("times_completed") + 1,
+                "last_completed": entry.completed_at,
+            }
+            if not counter.update(**increment):
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(
+                            character=character,
+                            quest=quest,
+                            times_completed=1,
+                            last_completed=entry.completed_at,
+                        )
+                except IntegrityError:
+                    # A concurrent completion created the counter first
+                    counter.update(**increment)
+        return entry
+
+
+class QuestCompletionLog(models.Model):
+    """
+    Append-only ledger with one row per quest completion. `QuestCompletion` holds
+    the materialized per-(character, quest) counters derived from it.
+
+    Attributes:
+        character (Character): The character who completed the quest.
+        quest (Quest): The quest completed, or None if it has since been deleted.
+        completed_at (datetime): When the quest was completed.
+        duration (int): Seconds spent on the quest.
+        xp_gained (int): XP awarded for the completion.
+    """
+
+    character = models.ForeignKey(
+        "character.Character",
+        on_delete=models.CASCADE,
+        related_name="quest_completion_log",
+    )
+    quest = models.ForeignKey(
+        "gameplay.Quest",
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="completion_log",
+    )
+    completed_at = models.DateTimeField(default=timezone.now)
+    duration = models.PositiveIntegerField(default=0)
+    xp_gained = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["character", "completed_at"],
+                name="completionlog_character_idx",
+            ),
+            models.Index(
+                fields=["quest", "completed_at"], name="completionlog_quest_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"character {self.character_id} completed quest {self.quest_id} at {self.completed_at}"
+
 
 class Activity(models.Model):
     """
@@ -492,6 +657,181 @@ class Project(models.Model):
         return self.name
 
 
+class SecondsSince(models.Func):
+    """
+    Whole seconds from a datetime expression to `moment`, computed in SQL.
+    """
+
+    output_field = models.IntegerField()
+    template = "CAST(FLOOR(EXTRACT(EPOCH FROM (%(expressions)s))) AS integer)"
+    arg_joiner = " - "
+
+    def __init__(self, expression, moment, **extra):
+        moment = models.Value(moment, output_field=models.DateTimeField())
+        super().__init__(moment, expression, **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        moment_sql, moment_params = compiler.compile(self.source_expressions[0])
+        start_sql, start_params = compiler.compile(self.source_expressions[1])
+        sql = (
+            f"CAST(ROUND((julianday({moment_sql}) - julianday({start_sql})) * 86400, 3)"
+            " AS integer)"
+        )
+        return sql, (*moment_params, *start_params)
+
+
+# Set while LiveStateIterable loads a batch, whose states it overlays itself
+_loading_timer_batch = contextvars.ContextVar("loading_timer_batch", default=False)
+
+
+class LiveStateIterable(ModelIterable):
+    """
+    Yields timers with their live state overlaid, reading the states of each batch
+    of rows from the store in one round trip rather than one per timer.
+    """
+
+    BATCH_SIZE = 100
+
+    def __iter__(self):
+        from .services.timer_state import timer_state_enabled
+
+        rows = super().__iter__()
+        if not timer_state_enabled():
+            yield from rows
+            return
+        while True:
+            token = _loading_timer_batch.set(True)
+            try:
+                batch = list(itertools.islice(rows, self.BATCH_SIZE))
+            finally:
+                _loading_timer_batch.reset(token)
+            if not batch:
+                return
+            self.queryset.model.overlay_live_states(batch)
+            yield from batch
+
+
+class TimerQuerySet(models.QuerySet):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._iterable_class = LiveStateIterable
+
+    def bulk_pause(self, moment=None, chunk_size: int = 2000) -> int:
+        """
+        Pause every active timer in the queryset with set-based updates, folding the
+        running time into `elapsed_time` in SQL. Rows are processed in chunks, each
+        in its own transaction, and the players are sent their paused clocks as
+        each chunk commits.
+
+        :param moment: The time the timers are paused at. Defaults to now.
+        :type moment: datetime
+        :param chunk_size: The number of timers updated per transaction.
+        :type chunk_size: int
+        :return: The number of timers paused.
+        :rtype: int
+        """
+        from .services.timer_read_model import invalidate_timer_documents
+        from .services.timer_sync import publish_timer_sync, timer_clock
+
+        moment = moment or timezone.now()
+        ids = list(self.filter(status="active").values_list("id", flat=True))
+        paused = 0
+        for i in range(0, len(ids), chunk_size):
+            chunk = ids[i : i + chunk_size]
+            with transaction.atomic():
+                # Log the spans being closed before their start times are cleared
+                running = list(
+                    self.model.objects.select_for_update()
+                    .filter(id__in=chunk, status="active")
+                    .values("id", "start_time", *self.model.SEGMENT_OWNER_FIELDS)
+                )
+                TimerSegment.objects.bulk_create(
+                    [
+                        TimerSegment.for_span(
+                            self.model.SEGMENT_TYPE,
+                            row["id"],
+                            row["start_time"],
+                            moment,
+                            **{f: row[f] for f in self.model.SEGMENT_OWNER_FIELDS},
+                        )
+                        for row in running
+                        if row["start_time"] and row["start_time"] < moment
+                    ]
+                )
+                paused += self.model.objects.filter(
+                    id__in=chunk, status="active"
+                ).update(
+                    elapsed_time=models.F("elapsed_time")
+                    + Coalesce(SecondsSince(models.F("start_time"), moment), 0),
+                    start_time=None,
+                    status="paused",
+                    last_updated=moment,
+                )
+                self._bulk_pause_hook(chunk)
+                invalidate_timer_documents(
+                    self.model.SEGMENT_TYPE,
+                    [row[self.model.OWNER_FIELD] for row in running],
+                )
+                # Built from the rows rather than loaded, which would overlay any
+                # live state left for them
+                paused_timers = [
+                    self.model(**row)
+                    for row in self.model.objects.filter(
+                        id__in=[row["id"] for row in running]
+                    ).values()
+                ]
+                publish_timer_sync(
+                    self.model.SEGMENT_TYPE,
+                    {
+                        getattr(timer, self.model.OWNER_FIELD): timer_clock(timer)
+                        for timer in paused_timers
+                    },
+                )
+        logger.info(
+            f"[BULK PAUSE] Paused {paused} {self.model.__name__} timer(s) in {math.ceil(len(ids) / chunk_size)} chunk(s)"
+        )
+        return paused
+
+    def _bulk_pause_hook(self, ids: List[int]):
+        pass
+
+
+class ActivityTimerQuerySet(TimerQuerySet):
+    def _bulk_pause_hook(self, ids: List[int]):
+        # Mirrors ActivityTimer.pause, which copies elapsed time onto the activity
+        elapsed = ActivityTimer.objects.filter(
+            id__in=ids, activity=models.OuterRef("pk")
+        ).values("elapsed_time")[:1]
+        Activity.objects.filter(activity_timer__id__in=ids).update(
+            duration=models.Subquery(elapsed)
+        )
+
+
+class QuestTimerQuerySet(TimerQuerySet):
+    def overdue(self, moment=None):
+        """
+        Filter to active quest timers whose run has reached their duration, with
+        the elapsed time computed in SQL.
+
+        :param moment: The time to check against. Defaults to now.
+        :type moment: datetime
+        """
+        moment = moment or timezone.now()
+        return (
+            self.filter(status="active", duration__gt=0, start_time__isnull=False)
+            .annotate(
+                run_time=models.F("elapsed_time")
+                + SecondsSince(models.F("start_time"), moment)
+            )
+            .filter(run_time__gte=models.F("duration"))
+        )
+
+    def _bulk_pause_hook(self, ids: List[int]):
+        from .services.quest_deadlines import cancel_quest_deadlines
+
+        cancel_quest_deadlines(ids)
+
+
 class Timer(models.Model):
     """
     An abstract base model that represents a general timer for activities
@@ -519,9 +859,201 @@ class Timer(models.Model):
     ]
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="empty")
 
+    objects = TimerQuerySet.as_manager()
+
     class Meta:
         abstract = True
 
+    # Number of database writes made through this instance
+    write_count = 0
+    _transition_depth = 0
+    _flush_pending = False
+
+    # How subclasses identify themselves and their owners in TimerSegment rows
+    SEGMENT_TYPE = None
+    SEGMENT_OWNER_FIELDS = ()
+    # The profile or character a timer belongs to
+    OWNER_FIELD = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Timers loaded through a TimerQuerySet are overlaid in batches; others
+        # (e.g. through select_related) one at a time
+        if not _loading_timer_batch.get():
+            cls.overlay_live_states([instance])
+        instance._mark_clean()
+        return instance
+
+    @classmethod
+    def overlay_live_states(cls, timers: List["Timer"]):
+        """
+        Overlay the live state of each timer that has one, in one store round trip.
+
+        :param timers: Timers of this class, as loaded from the database.
+        :type timers: list
+        """
+        from .services.timer_state import load_states, timer_state_enabled
+
+        if not timer_state_enabled() or not timers:
+            return
+        states = load_states(cls, [timer.pk for timer in timers])
+        for timer in timers:
+            state = states.get(timer.pk)
+            if state is None:
+                continue
+            # The live store is the source of truth while a session is running
+            for field, value in state.items():
+                if field in timer.__dict__:
+                    setattr(timer, field, value)
+            timer._mark_clean()
+
+    def _mark_clean(self, fields=None):
+        """Record the current values of the given (or all loaded) fields as saved."""
+        loaded = self.__dict__.setdefault("_loaded", {})
+        for field in self._meta.concrete_fields:
+            if field.attname in self.__dict__ and (
+                fields is None or field.name in fields
+            ):
+                loaded[field.attname] = self.__dict__[field.attname]
+
+    def dirty_fields(self) -> List[str]:
+        """
+        Return the names of the fields changed since the timer was loaded or saved.
+
+        :return: A list of field names.
+        :rtype: list
+        """
+        loaded = self.__dict__.get("_loaded", {})
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if not field.primary_key
+            and field.attname in self.__dict__
+            and (
+                field.attname not in loaded
+                or loaded[field.attname] != self.__dict__[field.attname]
+            )
+        ]
+
+    def save(self, *args, **kwargs):
+        from .services.timer_state import (
+            discard_state,
+            state_fields,
+            timer_state_enabled,
+        )
+
+        update_fields = kwargs.get("update_fields")
+        fields = state_fields(self)
+        writes_state = update_fields is None or bool(set(update_fields) & set(fields))
+        if timer_state_enabled() and update_fields is not None and writes_state:
+            # Write back the whole live state so the database is complete
+            kwargs["update_fields"] = set(update_fields) | set(fields)
+        super().save(*args, **kwargs)
+        self.write_count += 1
+        self._mark_clean(kwargs.get("update_fields"))
+        if timer_state_enabled() and writes_state:
+            discard_state(self)
+        self._invalidate_documents()
+        self._publish_sync()
+
+    def _invalidate_documents(self):
+        """Mark the cached read model document of this timer as stale."""
+        from .services.timer_read_model import invalidate_timer_documents
+
+        invalidate_timer_documents(self.SEGMENT_TYPE, [getattr(self, self.OWNER_FIELD)])
+
+    def _publish_sync(self):
+        """Send the owner's client this timer's new clock once the change commits."""
+        from .services.timer_sync import publish_timer_sync, timer_clock
+
+        publish_timer_sync(
+            self.SEGMENT_TYPE, {getattr(self, self.OWNER_FIELD): timer_clock(self)}
+        )
+
+    def save_dirty(self) -> bool:
+        """
+        Write only the changed fields to the database, in one UPDATE.
+
+        :return: True if anything was written.
+        :rtype: bool
+        """
+        if self.pk is None:
+            self.save()
+            return True
+        fields = self.dirty_fields()
+        if not fields:
+            return False
+        self.save(update_fields=fields)
+        return True
+
+    @contextmanager
+    def _transition(self):
+        """
+        Coalesce the writes of a transition, including nested ones, into one save of
+        the changed fields when the outermost transition ends.
+        """
+        self._transition_depth += 1
+        try:
+            yield self
+        finally:
+            self._transition_depth -= 1
+        if not self._transition_depth:
+            flush, self._flush_pending = self._flush_pending, False
+            self._save_state(flush=flush)
+
+    def _save_state(self, flush: bool = False):
+        """
+        Persist changed fields: to the live store if enabled and only state fields
+        changed, otherwise to the database. Deferred while a transition is open.
+
+        :param flush: Always write to the database (e.g. on reset or complete).
+        :type flush: bool
+        """
+        if self._transition_depth:
+            self._flush_pending = self._flush_pending or flush
+            return
+        from .services.timer_state import (
+            state_fields,
+            timer_state_enabled,
+            write_state,
+        )
+
+        fields = self.dirty_fields()
+        if (
+            not flush
+            and fields
+            and timer_state_enabled()
+            and self.pk
+            and set(fields) <= set(state_fields(self))
+            and write_state(self)
+        ):
+            self._mark_clean(fields)
+            self._invalidate_documents()
+            self._publish_sync()
+            return
+        self.save_dirty()
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._mark_clean(fields)
+
+    def refresh_state(self):
+        """
+        Reload the timer's state fields, from the live store if it holds them.
+        """
+        from .services.timer_state import load_state, state_fields, timer_state_enabled
+
+        if timer_state_enabled():
+            state = load_state(self)
+            if state is not None:
+                for field, value in state.items():
+                    setattr(self, field, value)
+                self._mark_clean(state.keys())
+                return self
+        self.refresh_from_db(fields=list(state_fields(self)))
+        return self
+
     def get_elapsed_time(self):
         if self.start_time and self.status == "active":
             logger.debug(
@@ -540,14 +1072,32 @@ class Timer(models.Model):
         """Calculate time without updating the model."""
         return self.get_elapsed_time()
 
-    def apply_elapsed(self):
-        """Store current elapsed time in the DB."""
-        self.elapsed_time = self.get_elapsed_time()
+    def _fold_elapsed(self):
+        """
+        Fold the running time into elapsed_time, without saving, and log the span
+        that just ended as a TimerSegment.
+        """
+        if self.start_time and self.status == "active":
+            ended_at = timezone.now()
+            segment = TimerSegment.for_span(
+                self.SEGMENT_TYPE,
+                self.pk,
+                self.start_time,
+                ended_at,
+                **{field: getattr(self, field) for field in self.SEGMENT_OWNER_FIELDS},
+            )
+            if segment.duration > 0 and self.pk:
+                segment.save()
+            self.elapsed_time += segment.duration
         logger.debug(
             f"[APPLY ELAPSED] Timer {self.id} — elapsed_time set to {self.elapsed_time}"
         )
         self.start_time = None
-        self.save()
+
+    def apply_elapsed(self):
+        """Store current elapsed time in the DB."""
+        self._fold_elapsed()
+        self._save_state()
         return self
 
     def start(self):
@@ -561,7 +1111,7 @@ class Timer(models.Model):
         if self.status != "active":
             self.status = "active"
             self.start_time = timezone.now()
-            self.save(update_fields=["status", "start_time"])
+            self._save_state()
             logger.debug(f"[TIMER START] Timer {self.id} started at {self.start_time}")
         return self
 
@@ -570,9 +1120,9 @@ class Timer(models.Model):
         Pause the timer and update its elapsed time.
         """
         if self.status != "paused":
-            self.apply_elapsed()
+            self._fold_elapsed()
             self.status = "paused"
-            self.save(update_fields=["status"])
+            self._save_state()
         return self
 
     def set_waiting(self):
@@ -581,7 +1131,7 @@ class Timer(models.Model):
         """
         if self.status != "waiting":
             self.status = "waiting"
-            self.save(update_fields=["status"])
+            self._save_state()
         return self
 
     def complete(self):
@@ -593,9 +1143,9 @@ class Timer(models.Model):
         )
 
         if self.status != "completed":
-            self.apply_elapsed()
+            self._fold_elapsed()
             self.status = "completed"
-            self.save()
+            self._save_state(flush=True)
         return self
 
     def reset(self):
@@ -607,7 +1157,7 @@ class Timer(models.Model):
             self.elapsed_time = 0
             self.start_time = None
             self._reset_hook()
-            self.save(update_fields=["status", "elapsed_time", "start_time"])
+            self._save_state(flush=True)
         return self
 
     @abstractmethod
@@ -648,9 +1198,11 @@ class ActivityTimer(Timer):
         blank=True,
     )
 
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        logger.debug(f"Activity timer save: compute elapsed: {self.compute_elapsed()}")
+    objects = ActivityTimerQuerySet.as_manager()
+
+    SEGMENT_TYPE = "activity"
+    SEGMENT_OWNER_FIELDS = ("profile_id", "activity_id")
+    OWNER_FIELD = "profile_id"
 
     def __str__(self):
         return f"ActivityTimer {self.id} for {self.profile.name}"
@@ -666,11 +1218,10 @@ class ActivityTimer(Timer):
             f"[ACTIVITYTIMER.new_activity]: Assigning new activity {name} to timer {self.pk}"
         )
 
-        self.activity = Activity.objects.create(name=name, profile=self.profile)
-
-        if self.status == "empty":
-            self.set_waiting()
-        self.save(update_fields=["activity"])
+        with self._transition():
+            self.activity = Activity.objects.create(name=name, profile=self.profile)
+            if self.status == "empty":
+                self.set_waiting()
         logger.debug(
             f"ActivityTimer after save: {self.pk}, activity: {self.activity}, status: {self.status}"
         )
@@ -698,10 +1249,11 @@ class ActivityTimer(Timer):
 
     def complete(self):
         """
-        Complete the activity timer and calculate the XP reward for the activity.
+        Complete the activity timer and its activity, and credit the profile
+        with the time and XP reward, in a single transaction.
 
-        :return: The XP reward for the activity.
-        :rtype: int
+        :return: The timer, or 0 if it has no activity.
+        :rtype: ActivityTimer
         """
 
         if not self.activity:
@@ -715,27 +1267,9 @@ class ActivityTimer(Timer):
                 f"[COMPLETE CALLED AGAIN] Timer {self.id} already completed — elapsed_time: {self.elapsed_time}"
             )
 
-        super().complete()
-        self.update_activity_time()
-
-        xp_gained = self.calculate_xp()
-        self.profile.add_activity(self.elapsed_time, xp=xp_gained)
-
-        message_text = f"Activity submitted. You got {xp_gained} XP!"
-        ServerMessage.objects.create(
-            group=self.profile.group_name,
-            type="notification",
-            action="notification",
-            data={},
-            message=message_text,
-            is_draft=False,
-        )
-
-        self.activity.complete()
-        logger.debug(
-            f"[TIMER COMPLETE] Timer {self.id} completed — elapsed_time: {self.elapsed_time}, completed_at: {self.activity.completed_at}"
-        )
+        from gameplay.services.activity_completion import complete_activity
 
+        complete_activity(self)
         return self
 
     def _reset_hook(self):
@@ -745,9 +1279,9 @@ class ActivityTimer(Timer):
         """
         Reset the activity timer and dissociate the current activity.
         """
-        super().reset()
-        self.activity = None
-        self.save(update_fields=["activity", "status", "elapsed_time", "start_time"])
+        with self._transition():
+            super().reset()
+            self.activity = None
 
     def calculate_xp(self):
         """
@@ -783,9 +1317,37 @@ class QuestTimer(Timer):
     )
     duration = models.IntegerField(default=0)
 
+    objects = QuestTimerQuerySet.as_manager()
+
+    SEGMENT_TYPE = "quest"
+    SEGMENT_OWNER_FIELDS = ("character_id", "quest_id")
+    OWNER_FIELD = "character_id"
+
     def __str__(self):
         return f"QuestTimer {self.id} for {self.character.name}"
 
+    def start(self):
+        """
+        Start the timer and schedule completion for when it finishes.
+        """
+        from .services.quest_deadlines import schedule_quest_deadline
+
+        was_active = self.is_active()
+        super().start()
+        if not was_active:
+            schedule_quest_deadline(self)
+        return self
+
+    def pause(self):
+        """
+        Pause the timer and cancel its scheduled completion.
+        """
+        from .services.quest_deadlines import cancel_quest_deadline
+
+        super().pause()
+        cancel_quest_deadline(self)
+        return self
+
     def change_quest(self, quest: Quest, duration: int):
         """
         Reset the timer and change the associated quest.
@@ -795,11 +1357,11 @@ class QuestTimer(Timer):
         :param duration: The new duration for the quest, in seconds.
         :type duration: int
         """
-        self.reset()
-        self.quest = quest
-        self.duration = duration
-        self.set_waiting()
-        self.save(update_fields=["quest", "duration", "status"])
+        with self._transition():
+            self.reset()
+            self.quest = quest
+            self.duration = duration
+            self.set_waiting()
 
     def complete(self):
         """
@@ -865,12 +1427,13 @@ class QuestTimer(Timer):
         """
         Reset the quest timer and dissociate the quest.
         """
-        super().reset()
-        self.quest = None
-        self.duration = 0
-        self.save(
-            update_fields=["quest", "status", "elapsed_time", "start_time", "duration"]
-        )
+        from .services.quest_deadlines import cancel_quest_deadline
+
+        with self._transition():
+            super().reset()
+            cancel_quest_deadline(self)
+            self.quest = None
+            self.duration = 0
 
     def _reset_hook(self):
         self.quest = None
@@ -911,6 +1474,157 @@ class QuestTimer(Timer):
         return self.get_remaining_time() <= 0
 
 
+class TimerSegment(models.Model):
+    """
+    Append-only log of the spans a timer actually ran, written when a running timer
+    is paused or completed. `Timer.elapsed_time` is the cached running total of
+    these spans; segments older than a week are compacted into `TimerDailyTotal`.
+
+    Attributes:
+        timer_type (str): Whether the span was on an activity or a quest timer.
+        timer_id (int): The id of the timer.
+        profile (Profile): The profile, for activity timers.
+        character (Character): The character, for quest timers.
+        activity (Activity): The activity being timed, if any.
+        quest (Quest): The quest being timed, if any.
+        started_at (datetime): When the span started.
+        ended_at (datetime): When the span ended.
+        duration (int): The length of the span, in whole seconds.
+    """
+
+    class TimerType(models.TextChoices):
+        ACTIVITY = "activity", "Activity"
+        QUEST = "quest", "Quest"
+
+    timer_type = models.CharField(max_length=10, choices=TimerType.choices)
+    timer_id = models.PositiveIntegerField()
+    profile = models.ForeignKey(
+        "users.Profile",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="timer_segments",
+    )
+    character = models.ForeignKey(
+        "character.Character",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="timer_segments",
+    )
+    activity = models.ForeignKey(
+        "Activity",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="timer_segments",
+    )
+    quest = models.ForeignKey(
+        "Quest",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="timer_segments",
+    )
+    started_at = models.DateTimeField()
+    ended_at = models.DateTimeField()
+    duration = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["timer_type", "timer_id", "started_at"],
+                name="timersegment_timer_idx",
+            ),
+            models.Index(
+                fields=["profile", "started_at"], name="timersegment_profile_idx"
+            ),
+            models.Index(fields=["ended_at"], name="timersegment_ended_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.timer_type} timer {self.timer_id}: {self.started_at} - {self.ended_at}"
+
+    @classmethod
+    def for_span(
+        cls, timer_type: str, timer_id: int, started_at, ended_at, **owners
+    ) -> "TimerSegment":
+        """
+        Build an unsaved segment for a span, with its duration in whole seconds.
+
+        :param timer_type: "activity" or "quest".
+        :type timer_type: str
+        :param timer_id: The id of the timer.
+        :type timer_id: int
+        :param started_at: When the span started.
+        :type started_at: datetime
+        :param ended_at: When the span ended.
+        :type ended_at: datetime
+        :param owners: The profile_id/activity_id or character_id/quest_id of the timer.
+        :return: The unsaved segment.
+        :rtype: TimerSegment
+        """
+        return cls(
+            timer_type=timer_type,
+            timer_id=timer_id,
+            started_at=started_at,
+            ended_at=ended_at,
+            duration=max(int((ended_at - started_at).total_seconds()), 0),
+            **owners,
+        )
+
+
+class TimerDailyTotal(models.Model):
+    """
+    The compacted form of a timer's segments for one (UTC) day.
+
+    Attributes:
+        timer_type (str): Whether the totals are for an activity or a quest timer.
+        timer_id (int): The id of the timer.
+        profile (Profile): The profile, for activity timers.
+        character (Character): The character, for quest timers.
+        date (date): The day the totals cover.
+        total_seconds (int): The time the timer ran that day.
+        segment_count (int): The number of segments compacted into this row.
+        hourly (list): Seconds run in each of the day's 24 hours.
+    """
+
+    timer_type = models.CharField(max_length=10, choices=TimerSegment.TimerType.choices)
+    timer_id = models.PositiveIntegerField()
+    profile = models.ForeignKey(
+        "users.Profile",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="timer_daily_totals",
+    )
+    character = models.ForeignKey(
+        "character.Character",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="timer_daily_totals",
+    )
+    date = models.DateField()
+    total_seconds = models.PositiveIntegerField(default=0)
+    segment_count = models.PositiveIntegerField(default=0)
+    hourly = models.JSONField(default=list)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["timer_type", "timer_id", "date"],
+                name="timerdailytotal_unique_day",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["profile", "date"], name="timerdailytotal_profile_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.timer_type} timer {self.timer_id} on {self.date}: {self.total_seconds}s"
+
+
 class ServerMessage(models.Model):
     """
     Represents a message sent by the server to a specific user profile. This
@@ -989,13 +1703,15 @@ class ServerMessage(models.Model):
     @classmethod
     def get_unread(cls, group_name):
         """
-        Fetch all undelivered server messages for a specific WebSocket group.
+        Fetch all undelivered server messages for one or more WebSocket groups.
 
-        :param group_name: The WebSocket group to fetch unread messages for.
-        :type group_name: str
-        :return: A QuerySet of undelivered server messages for the given group.
+        :param group_name: The WebSocket group, or a list of groups, to fetch unread messages for.
+        :type group_name: str or list
+        :return: A QuerySet of undelivered server messages for the given group(s).
         :rtype: QuerySet
         """
+        if isinstance(group_name, (list, tuple)):
+            return cls.objects.filter(group__in=group_name, is_delivered=False)
         return cls.objects.filter(group=group_name, is_delivered=False)
 
     @classmethod
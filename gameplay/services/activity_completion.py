@@ -0,0 +1,144 @@
+"""
+Activity Completion Pipeline
+
+Submitting an activity touches the activity timer, the activity, the profile's
+totals and XP, and queues a notification. Instead of each model saving itself in
+turn (with the profile saved twice and the notification sent synchronously from
+a signal), the timer is completed, every other effect is computed from it, and they are
+persisted in the same transaction: one UPDATE per row, with `F()` expressions for the
+profile's running totals and the profile row locked only to apply level-ups. The
+notification is inserted without signals and delivered once the transaction
+commits.
+
+Classes:
+    - ActivityCompletion: The planned effects of completing an activity.
+
+Functions:
+    - plan_activity_completion(timer): Computes the effects of completing the timer's activity.
+    - complete_activity(timer): Completes the timer's activity, persisting every effect at once.
+"""
+
+from asgiref.sync import async_to_sync
+from datetime import datetime
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from typing import TYPE_CHECKING, NamedTuple
+import logging
+
+if TYPE_CHECKING:
+    from gameplay.models import ActivityTimer
+
+logger = logging.getLogger("django")
+
+
+class ActivityCompletion(NamedTuple):
+    elapsed: int
+    xp: int
+    completed_at: datetime
+    message: str
+
+
+def plan_activity_completion(timer: "ActivityTimer") -> ActivityCompletion:
+    """
+    Compute the effects of completing the timer's activity, without saving.
+
+    :param timer: The activity timer, completed, with an activity assigned.
+    :type timer: ActivityTimer
+    :return: The planned effects.
+    :rtype: ActivityCompletion
+    """
+    elapsed = timer.get_elapsed_time()
+    activity = timer.activity
+    xp = timer.profile.apply_buffs(elapsed * activity.xp_rate, "xp")
+    return ActivityCompletion(
+        elapsed=elapsed,
+        xp=xp,
+        completed_at=timezone.now(),
+        message=f"Activity submitted. You got {xp} XP!",
+    )
+
+
+def _notify(group: str):
+    from gameplay.utils import send_group_message
+
+    try:
+        async_to_sync(send_group_message)(group, {"type": "send_pending_messages"})
+    except Exception as e:
+        logger.error(f"[ACTIVITY COMPLETION] Could not notify group {group}: {e}")
+
+
+def complete_activity(timer: "ActivityTimer") -> ActivityCompletion:
+    """
+    Complete the timer and its activity, credit the profile and queue the
+    notification, in one transaction. The given instances are updated to match.
+
+    :param timer: The activity timer, with an activity assigned.
+    :type timer: ActivityTimer
+    :return: The effects that were applied.
+    :rtype: ActivityCompletion
+    """
+    from gameplay.models import Activity, ServerMessage, Timer
+    from users.models import Profile
+
+    profile, activity = timer.profile, timer.activity
+
+    with transaction.atomic():
+        Timer.complete(timer)
+        plan = plan_activity_completion(timer)
+
+        Activity.objects.filter(pk=activity.pk).update(
+            duration=plan.elapsed,
+            xp_gained=plan.xp,
+            completed_at=plan.completed_at,
+            last_updated=plan.completed_at,
+        )
+
+        # Level-ups depend on the current XP, so only that needs the row lock
+        locked = (
+            Profile.objects.select_for_update()
+            .only("xp", "level", "xp_next_level")
+            .get(pk=profile.pk)
+        )
+        old_level = locked.level
+        locked.accrue_xp(plan.xp)
+        Profile.objects.filter(pk=profile.pk).update(
+            total_time=F("total_time") + plan.elapsed,
+            total_activities=F("total_activities") + 1,
+            xp=locked.xp,
+            level=locked.level,
+            xp_next_level=locked.xp_next_level,
+        )
+
+        # bulk_create skips the post_save signal that would send synchronously
+        ServerMessage.objects.bulk_create(
+            [
+                ServerMessage(
+                    group=profile.group_name,
+                    type="notification",
+                    action="notification",
+                    data={},
+                    message=plan.message,
+                    is_draft=False,
+                )
+            ]
+        )
+        transaction.on_commit(lambda: _notify(profile.group_name))
+
+    activity.duration = plan.elapsed
+    activity.xp_gained = plan.xp
+    activity.completed_at = plan.completed_at
+    profile.total_time += plan.elapsed
+    profile.total_activities += 1
+    profile.xp, profile.level, profile.xp_next_level = (
+        locked.xp,
+        locked.level,
+        locked.xp_next_level,
+    )
+    if profile.level != old_level:
+        profile._level_change_hook(old_level)
+
+    logger.debug(
+        f"[ACTIVITY COMPLETION] Timer {timer.id} completed — elapsed_time: {plan.elapsed}, xp: {plan.xp}"
+    )
+    return plan
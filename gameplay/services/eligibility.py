@@ -0,0 +1,137 @@
+"""
+Quest Eligibility Engine
+
+Computes the set of quests a character can currently undertake using a fixed
+number of queries, regardless of catalog size. Candidates are narrowed to the
+active quests covering the character's level by the compiled level index; the
+premium flag, repeat rule, frequency windows and prerequisite counts are then
+resolved as set/dictionary operations over the character's prefetched
+completions and the compiled prerequisite graph.
+
+Functions:
+    - eligible_quests(character, profile): Returns the eligible Quest instances, ordered by id.
+    - eligible_quest_ids(character, profile, after_id, limit): Returns the ids of the eligible quests, ordered by id.
+"""
+
+from bisect import bisect_right
+from operator import attrgetter
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+import logging
+
+from gameplay.models import Quest, QuestCompletion
+from .level_index import IndexedQuest, get_level_index
+from .prerequisites import PrerequisiteGraph, get_prerequisite_graph
+
+if TYPE_CHECKING:
+    from character.models import Character
+    from users.models import Profile
+
+logger = logging.getLogger("django")
+
+
+def _completion_state(character: "Character") -> Tuple[Dict[int, int], Set[int]]:
+    """
+    Map quest id -> times completed for the given character, and collect the ids of
+    quests blocked until their next frequency window (one query).
+    """
+    completed = {}
+    blocked = set()
+    rows = (
+        QuestCompletion.objects.filter(character=character)
+        .annotate_frequency_window()
+        .values_list("quest_id", "times_completed", "in_frequency_window")
+    )
+    for quest_id, times_completed, in_window in rows:
+        completed[quest_id] = times_completed
+        if in_window:
+            blocked.add(quest_id)
+    return completed, blocked
+
+
+def _candidates(character: "Character", profile: "Profile") -> List[IndexedQuest]:
+    """
+    Quests passing the simple comparison checks of `Quest.checkEligible`, looked up
+    in the level index (no queries once the index is compiled).
+    """
+    candidates = get_level_index().quests_for_level(character.level)
+    if profile.is_premium:
+        # Mirrors Quest.checkEligible, which rejects premium quests for premium profiles
+        return [quest for quest in candidates if not quest.is_premium]
+    return list(candidates)
+
+
+def _passes(
+    quest_id: int, can_repeat: bool, completed, blocked, graph: PrerequisiteGraph
+) -> bool:
+    if not can_repeat and completed.get(quest_id, 0) >= 1:
+        return False
+    if quest_id in blocked:
+        return False
+    return graph.requirements_met(quest_id, completed)
+
+
+def _eligible_ids(
+    character: "Character",
+    profile: "Profile",
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[int]:
+    completed, blocked = _completion_state(character)
+    graph = get_prerequisite_graph()
+    candidates = _candidates(character, profile)
+    if after_id is not None:
+        start = bisect_right(candidates, after_id, key=attrgetter("id"))
+        candidates = candidates[start:]
+
+    quest_ids = []
+    for quest in candidates:
+        if _passes(quest.id, quest.can_repeat, completed, blocked, graph):
+            quest_ids.append(quest.id)
+            if limit is not None and len(quest_ids) >= limit:
+                break
+    return quest_ids
+
+
+def eligible_quests(character: "Character", profile: "Profile") -> List[Quest]:
+    """
+    Return the quests the character is eligible for, in two queries (plus one each
+    if the level index or prerequisite graph needs recompiling).
+
+    :param character: The character instance to evaluate quests for.
+    :type character: Character
+    :param profile: The profile instance associated with the character.
+    :type profile: Profile
+    :return: A list of eligible quests, with results prefetched.
+    :rtype: list
+    """
+    quest_ids = _eligible_ids(character, profile)
+    if not quest_ids:
+        return []
+    return list(
+        Quest.objects.filter(id__in=quest_ids).select_related("results").order_by("id")
+    )
+
+
+def eligible_quest_ids(
+    character: "Character",
+    profile: "Profile",
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[int]:
+    """
+    Return the ids of the quests the character is eligible for, in one query (plus
+    one each if the level index or prerequisite graph needs recompiling).
+    Evaluation stops once `limit` eligible quests have been found.
+
+    :param character: The character instance to evaluate quests for.
+    :type character: Character
+    :param profile: The profile instance associated with the character.
+    :type profile: Profile
+    :param after_id: Only return quests with a greater id (keyset pagination).
+    :type after_id: int
+    :param limit: The maximum number of ids to return.
+    :type limit: int
+    :return: A list of eligible quest ids, ordered by id.
+    :rtype: list
+    """
+    return _eligible_ids(character, profile, after_id, limit)
@@ -0,0 +1,136 @@
+"""
+Per-Character Eligible Quest Cache
+
+A character's eligible quests only change when they complete a quest, level up or
+change premium status, when an admin edits the quest catalog, or when a frequency
+window rolls over. The eligible quest ids are therefore cached per character in
+the default cache, tagged with the catalog version, level and premium flag, and
+expire at the next daily boundary (weekly and monthly windows also roll over at
+midnight).
+
+Functions:
+    - cached_eligible_quest_ids(character, profile): Returns eligible quest ids, from the cache if valid.
+    - cached_eligible_quest_page(character, profile, after_id, limit): Returns one page of eligible quest ids.
+    - cached_eligible_quests(character, profile): Returns eligible Quest instances, ordered by id.
+    - invalidate_eligible_quests(character_id): Drops the cached entry for a character.
+"""
+
+from bisect import bisect_right
+from django.core.cache import cache
+from typing import TYPE_CHECKING, List, Optional, Tuple
+import logging
+
+from gameplay.models import Quest
+from .eligibility import eligible_quest_ids
+from .frequency import seconds_until_boundary
+from .quest_catalog import get_catalog_version
+
+if TYPE_CHECKING:
+    from character.models import Character
+    from users.models import Profile
+
+logger = logging.getLogger("django")
+
+
+def _cache_key(character_id: int) -> str:
+    return f"eligible_quests_{character_id}"
+
+
+def _token(character: "Character", profile: "Profile") -> tuple:
+    return (get_catalog_version(), character.level, bool(profile.is_premium))
+
+
+def _cached_ids(character: "Character", profile: "Profile") -> Optional[List[int]]:
+    entry = cache.get(_cache_key(character.id))
+    if entry is not None and entry["token"] == _token(character, profile):
+        logger.debug(f"[ELIGIBLE CACHE] Hit for character {character.id}")
+        return entry["ids"]
+    return None
+
+
+def cached_eligible_quest_ids(character: "Character", profile: "Profile") -> List[int]:
+    """
+    Return the ids of the quests the character is eligible for, computing and caching
+    them if the cached entry is missing or stale.
+
+    :param character: The character instance to evaluate quests for.
+    :type character: Character
+    :param profile: The profile instance associated with the character.
+    :type profile: Profile
+    :return: A list of eligible quest ids, ordered by id.
+    :rtype: list
+    """
+    ids = _cached_ids(character, profile)
+    if ids is not None:
+        return ids
+
+    ids = eligible_quest_ids(character, profile)
+    cache.set(
+        _cache_key(character.id),
+        {"token": _token(character, profile), "ids": ids},
+        timeout=seconds_until_boundary(Quest.Frequency.DAILY),
+    )
+    logger.debug(
+        f"[ELIGIBLE CACHE] Stored {len(ids)} quests for character {character.id}"
+    )
+    return ids
+
+
+def cached_eligible_quest_page(
+    character: "Character",
+    profile: "Profile",
+    after_id: Optional[int] = None,
+    limit: int = 50,
+) -> Tuple[List[int], bool]:
+    """
+    Return one page of eligible quest ids. A valid cached list is sliced; otherwise
+    the engine evaluates only as many quests as the page needs, and nothing is cached.
+
+    :param character: The character instance to evaluate quests for.
+    :type character: Character
+    :param profile: The profile instance associated with the character.
+    :type profile: Profile
+    :param after_id: Only return quests with a greater id.
+    :type after_id: int
+    :param limit: The page size.
+    :type limit: int
+    :return: A tuple of (quest ids, whether more quests follow).
+    :rtype: tuple
+    """
+    ids = _cached_ids(character, profile)
+    if ids is not None:
+        start = bisect_right(ids, after_id) if after_id is not None else 0
+        page = ids[start : start + limit + 1]
+    else:
+        page = eligible_quest_ids(character, profile, after_id, limit + 1)
+    return page[:limit], len(page) > limit
+
+
+def cached_eligible_quests(character: "Character", profile: "Profile") -> List[Quest]:
+    """
+    Return the quests the character is eligible for, using the cached ids.
+
+    :param character: The character instance to evaluate quests for.
+    :type character: Character
+    :param profile: The profile instance associated with the character.
+    :type profile: Profile
+    :return: A list of eligible quests, with results prefetched.
+    :rtype: list
+    """
+    ids = cached_eligible_quest_ids(character, profile)
+    if not ids:
+        return []
+    return list(
+        Quest.objects.filter(id__in=ids).select_related("results").order_by("id")
+    )
+
+
+def invalidate_eligible_quests(character_id: int):
+    """
+    Drop the cached eligible quests for a character.
+
+    :param character_id: The id of the character.
+    :type character_id: int
+    """
+    cache.delete(_cache_key(character_id))
+    logger.debug(f"[ELIGIBLE CACHE] Invalidated for character {character_id}")
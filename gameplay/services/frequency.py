@@ -0,0 +1,95 @@
+"""
+Quest Frequency Windows
+
+Daily, weekly and monthly quests reset on calendar boundaries in the server time
+zone: midnight, midnight on Monday and midnight on the 1st of the month.
+
+Functions:
+    - window_start(frequency, moment): Returns when the frequency window containing `moment` started.
+    - next_boundary(frequency, moment): Returns when the frequency window after `moment` starts.
+    - seconds_until_boundary(frequency, moment): Returns the whole seconds until the next boundary.
+"""
+
+from datetime import datetime, timedelta
+from django.utils import timezone
+from typing import Optional
+import math
+
+from gameplay.models import Quest
+
+
+def _midnight(moment: datetime) -> datetime:
+    local = timezone.localtime(moment)
+    return local.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def window_start(frequency: str, moment: Optional[datetime] = None) -> datetime:
+    """
+    Return the start of the frequency window containing `moment`.
+
+    :param frequency: One of the limited `Quest.Frequency` values (DAY, WEEK or MONTH).
+    :type frequency: str
+    :param moment: The reference time. Defaults to now.
+    :type moment: datetime
+    :return: The aware datetime the current window started.
+    :rtype: datetime
+    :raises ValueError: If the frequency has no windows.
+    """
+    midnight = _midnight(moment or timezone.now())
+
+    if frequency == Quest.Frequency.DAILY:
+        start = midnight
+    elif frequency == Quest.Frequency.WEEKLY:
+        start = midnight - timedelta(days=midnight.weekday())
+    elif frequency == Quest.Frequency.MONTHLY:
+        start = midnight.replace(day=1)
+    else:
+        raise ValueError(f"Frequency {frequency!r} has no window boundaries")
+
+    return timezone.make_aware(start.replace(tzinfo=None))
+
+
+def next_boundary(frequency: str, moment: Optional[datetime] = None) -> datetime:
+    """
+    Return the start of the frequency window following `moment`.
+
+    :param frequency: One of the limited `Quest.Frequency` values (DAY, WEEK or MONTH).
+    :type frequency: str
+    :param moment: The reference time. Defaults to now.
+    :type moment: datetime
+    :return: The aware datetime of the next boundary.
+    :rtype: datetime
+    :raises ValueError: If the frequency has no boundaries.
+    """
+    midnight = _midnight(moment or timezone.now())
+
+    if frequency == Quest.Frequency.DAILY:
+        boundary = midnight + timedelta(days=1)
+    elif frequency == Quest.Frequency.WEEKLY:
+        boundary = midnight + timedelta(days=7 - midnight.weekday())
+    elif frequency == Quest.Frequency.MONTHLY:
+        if midnight.month == 12:
+            boundary = midnight.replace(year=midnight.year + 1, month=1, day=1)
+        else:
+            boundary = midnight.replace(month=midnight.month + 1, day=1)
+    else:
+        raise ValueError(f"Frequency {frequency!r} has no window boundaries")
+
+    # Re-localise in case the boundary crosses a DST change
+    return timezone.make_aware(boundary.replace(tzinfo=None))
+
+
+def seconds_until_boundary(frequency: str, moment: Optional[datetime] = None) -> int:
+    """
+    Return the number of whole seconds (at least 1) until the next boundary.
+
+    :param frequency: One of the limited `Quest.Frequency` values.
+    :type frequency: str
+    :param moment: The reference time. Defaults to now.
+    :type moment: datetime
+    :return: Seconds until the next boundary.
+    :rtype: int
+    """
+    moment = moment or timezone.now()
+    remaining = (next_boundary(frequency, moment) - moment).total_seconds()
+    return max(1, math.ceil(remaining))
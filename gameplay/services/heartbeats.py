@@ -0,0 +1,199 @@
+"""
+Timer Heartbeats
+
+A browser that vanishes without a clean close (sleep, network partition, killed
+tab) never triggers the consumer's disconnect handler, so its timers would keep
+running and accrue time. Each websocket ping records the profile's last heartbeat
+in the cache (Redis in production) without touching the database, and a periodic
+reaper pauses, in one set-based operation per timer type, every active timer whose
+profile has not sent a heartbeat within `TIMER_HEARTBEAT_TIMEOUT` seconds.
+
+Pings are the most frequent thing the consumer handles, so `arecord_heartbeat`
+writes with a native asyncio Redis client on the event loop, connected as the
+`HEARTBEAT_REDIS` setting says. Django's `cache.aset` would run the write in the
+thread-sensitive executor, one thread hop per ping.
+
+Functions:
+    - record_heartbeat(profile_id): Records that a profile is alive.
+    - arecord_heartbeat(profile_id): Async version of record_heartbeat.
+    - clear_heartbeat(profile_id): Forgets a profile's last heartbeat.
+    - last_heartbeats(profile_ids): Returns the last heartbeat of each profile.
+    - stale_profile_ids(cutoff): Returns the profiles with running timers and no heartbeat since the cutoff.
+    - reap_idle_timers(moment): Pauses the timers of every profile without a recent heartbeat.
+"""
+
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio, logging, weakref
+
+logger = logging.getLogger("django")
+
+# One client per event loop: asyncio connections cannot be shared between loops
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _key(profile_id: int) -> str:
+    return f"heartbeat:{profile_id}"
+
+
+def _timeout() -> int:
+    return settings.TIMER_HEARTBEAT_TIMEOUT
+
+
+def _async_redis():
+    # An asyncio client for the default cache's Redis server, or None if unset
+    config = settings.HEARTBEAT_REDIS
+    if not config:
+        return None
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        import redis.asyncio
+
+        client = _async_clients[loop] = redis.asyncio.from_url(
+            config["URL"], **config.get("OPTIONS", {})
+        )
+    return client
+
+
+def record_heartbeat(profile_id: int):
+    """
+    Record that a profile's client is alive.
+
+    :param profile_id: The profile's id.
+    :type profile_id: int
+    """
+    # Kept a while past the timeout, so a missing key always means a stale profile
+    cache.set(_key(profile_id), timezone.now().timestamp(), timeout=_timeout() * 2)
+
+
+async def arecord_heartbeat(profile_id: int):
+    """
+    Record that a profile's client is alive, from async code.
+
+    :param profile_id: The profile's id.
+    :type profile_id: int
+    """
+    beat = timezone.now().timestamp()
+    client = _async_redis()
+    if client is None:
+        # No Redis configured (e.g. locmem in tests): local caches do no I/O
+        cache.set(_key(profile_id), beat, timeout=_timeout() * 2)
+        return
+    try:
+        # Encoded as django_redis would, so `last_heartbeats` can read it back
+        await client.set(
+            cache.make_key(_key(profile_id)),
+            cache.client.encode(beat),
+            ex=_timeout() * 2,
+        )
+    except Exception as e:
+        logger.error(f"[HEARTBEAT] Could not record heartbeat of {profile_id}: {e}")
+
+
+def clear_heartbeat(profile_id: int):
+    """
+    Forget a profile's last heartbeat, e.g. once its client has disconnected.
+
+    :param profile_id: The profile's id.
+    :type profile_id: int
+    """
+    cache.delete(_key(profile_id))
+
+
+def last_heartbeats(profile_ids: Iterable[int]) -> Dict[int, float]:
+    """
+    Return the last heartbeat of each profile that has one.
+
+    :param profile_ids: The profile ids.
+    :type profile_ids: iterable
+    :return: Heartbeat timestamps by profile id.
+    :rtype: dict
+    :raises Exception: If the cache cannot be read; callers must not treat that
+        as "no heartbeats".
+    """
+    keys = {_key(profile_id): profile_id for profile_id in profile_ids}
+    return {keys[key]: beat for key, beat in cache.get_many(list(keys)).items()}
+
+
+def stale_profile_ids(cutoff: datetime) -> List[int]:
+    """
+    Return the profiles whose activity timer has been running since before the
+    cutoff and who have not sent a heartbeat since it. Running timers are found in
+    SQL, with the state of timers in the live timer state store taking precedence.
+
+    :param cutoff: The oldest acceptable heartbeat.
+    :type cutoff: datetime
+    :return: The stale profile ids.
+    :rtype: list
+    """
+    from gameplay.models import ActivityTimer
+    from gameplay.services.timer_state import live_states
+
+    states = live_states(ActivityTimer)
+    live_running = [
+        timer_id
+        for timer_id, state in states.items()
+        if state["status"] == "active"
+        and state["start_time"] is not None
+        and state["start_time"] < cutoff
+    ]
+    running = ActivityTimer.objects.filter(
+        status="active", start_time__lt=cutoff
+    ).exclude(pk__in=list(states))
+    if live_running:
+        running = running | ActivityTimer.objects.filter(pk__in=live_running)
+    running = list(running.values_list("profile_id", flat=True))
+    beats = last_heartbeats(running)
+    return [
+        profile_id
+        for profile_id in running
+        if beats.get(profile_id, 0) < cutoff.timestamp()
+    ]
+
+
+def reap_idle_timers(moment: Optional[datetime] = None) -> Tuple[int, int]:
+    """
+    Pause the running timers of every profile without a recent heartbeat. The
+    players are sent their paused clocks by `bulk_pause`. Nothing is paused if
+    the heartbeats cannot be read.
+
+    :param moment: The time of the sweep. Defaults to now.
+    :type moment: datetime
+    :return: The number of activity and quest timers paused.
+    :rtype: tuple
+    """
+    from character.models import PlayerCharacterLink
+    from gameplay.models import ActivityTimer, QuestTimer
+    from gameplay.services.timer_state import flush_states
+
+    moment = moment or timezone.now()
+    try:
+        profile_ids = stale_profile_ids(moment - timedelta(seconds=_timeout()))
+    except Exception as e:
+        # Fail closed: with no heartbeats to read, every running timer looks idle
+        logger.error(f"[HEARTBEAT] Could not read heartbeats, skipping the reap: {e}")
+        return 0, 0
+    if not profile_ids:
+        return 0, 0
+
+    act_timers = ActivityTimer.objects.filter(profile_id__in=profile_ids)
+    quest_timers = QuestTimer.objects.filter(
+        character__in=PlayerCharacterLink.objects.filter(
+            profile_id__in=profile_ids, is_active=True
+        ).values("character_id")
+    )
+    # Only these profiles' live states are written back, so the status filter
+    # below sees timers that are running in the store alone
+    flush_states(ActivityTimer, act_timers.values_list("id", flat=True))
+    flush_states(QuestTimer, quest_timers.values_list("id", flat=True))
+
+    act_paused = act_timers.filter(status="active").bulk_pause(moment)
+    quest_paused = quest_timers.filter(status="active").bulk_pause(moment)
+    logger.warning(
+        f"[HEARTBEAT] Paused {act_paused} activity and {quest_paused} quest timer(s) for {len(profile_ids)} idle profile(s)"
+    )
+    return act_paused, quest_paused
@@ -0,0 +1,106 @@
+"""
+Quest Level Interval Index
+
+Each active quest covers the level window [levelMin, levelMax]. The index splits
+the level axis at every window boundary into elementary segments and stores, per
+segment, the quests covering it. A character's candidate quests are then found
+with one binary search instead of testing every quest's window. The index is
+compiled once per worker and reused until the quest catalog version changes.
+
+Classes:
+    - LevelIntervalIndex: The compiled index.
+
+Functions:
+    - compile_level_index(version): Builds the index from the database (one query).
+    - get_level_index(): Returns the cached index, recompiling it if the catalog changed.
+"""
+
+from bisect import bisect_right
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+import logging
+
+from gameplay.models import Quest
+from .quest_catalog import get_catalog_token
+
+logger = logging.getLogger("django")
+
+
+class IndexedQuest(NamedTuple):
+    id: int
+    can_repeat: bool
+    is_premium: bool
+
+
+class LevelIntervalIndex:
+    """
+    Active quests bucketed by the level segments their windows cover.
+
+    Attributes:
+        breakpoints (list): Sorted segment start levels.
+        segments (list): The quests covering each segment, ordered by id.
+        version (tuple): The catalog token the index was compiled against.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[int, int, int, bool, bool]], version=None):
+        rows = [row for row in rows if row[1] <= row[2]]
+        self.version = version
+        self.breakpoints: List[int] = sorted(
+            {level for _, low, high, _, _ in rows for level in (low, high + 1)}
+        )
+
+        covering: List[List[IndexedQuest]] = [[] for _ in self.breakpoints]
+        for quest_id, low, high, can_repeat, is_premium in sorted(rows):
+            entry = IndexedQuest(quest_id, can_repeat, is_premium)
+            start = bisect_right(self.breakpoints, low) - 1
+            end = bisect_right(self.breakpoints, high)
+            for i in range(start, end):
+                covering[i].append(entry)
+        self.segments: List[Tuple[IndexedQuest, ...]] = [
+            tuple(quests) for quests in covering
+        ]
+
+    def quests_for_level(self, level: int) -> Tuple[IndexedQuest, ...]:
+        """
+        Return the active quests whose level window contains `level`, ordered by id.
+
+        :param level: The character level.
+        :type level: int
+        :return: A tuple of IndexedQuest entries.
+        :rtype: tuple
+        """
+        i = bisect_right(self.breakpoints, level) - 1
+        if i < 0:
+            return ()
+        return self.segments[i]
+
+
+def compile_level_index(version=None) -> LevelIntervalIndex:
+    """
+    Build the level index from the database in a single query.
+
+    :param version: The catalog token to tag the index with.
+    :return: The compiled index.
+    :rtype: LevelIntervalIndex
+    """
+    rows = Quest.objects.filter(is_active=True).values_list(
+        "id", "levelMin", "levelMax", "canRepeat", "is_premium"
+    )
+    return LevelIntervalIndex(rows, version)
+
+
+_index: Optional[LevelIntervalIndex] = None
+
+
+def get_level_index() -> LevelIntervalIndex:
+    """
+    Return this worker's compiled index, recompiling it if the catalog version changed.
+
+    :return: The compiled index.
+    :rtype: LevelIntervalIndex
+    """
+    global _index
+    token = get_catalog_token()
+    if _index is None or _index.version != token:
+        logger.debug(f"[LEVEL INDEX] Compiling level index for {token}")
+        _index = compile_level_index(version=token)
+    return _index
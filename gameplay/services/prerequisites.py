@@ -0,0 +1,159 @@
+"""
+Compiled Quest Prerequisite Graph
+
+`QuestRequirement` rows form a directed graph (quest -> prerequisite). The graph
+only changes when an admin edits quests, so it is compiled once per worker into a
+dictionary of quest id -> ((prerequisite id, times required), ...) and reused until
+the quest catalog version changes. Requirement checks are then pure dictionary
+lookups against a character's completion counts.
+
+Classes:
+    - PrerequisiteCycleError: Raised when the requirement graph contains a cycle.
+    - PrerequisiteGraph: The compiled, read-only requirement graph.
+
+Functions:
+    - compile_prerequisite_graph(strict): Builds the graph from the database (one query).
+    - get_prerequisite_graph(): Returns the cached graph, recompiling it if the catalog changed.
+    - find_cycle(edges): Returns a list of quest ids forming a cycle, or None.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+import logging
+
+from gameplay.models import QuestRequirement
+from .quest_catalog import get_catalog_token
+
+logger = logging.getLogger("django")
+
+Requirements = Tuple[Tuple[int, int], ...]
+
+
+class PrerequisiteCycleError(ValueError):
+    """Raised when quest requirements form a cycle."""
+
+    def __init__(self, cycle: List[int]):
+        self.cycle = cycle
+        path = " -> ".join(str(quest_id) for quest_id in cycle)
+        super().__init__(f"Quest requirements form a cycle: {path}")
+
+
+class PrerequisiteGraph:
+    """
+    A compiled, read-only view of all quest requirements.
+
+    Attributes:
+        edges (dict): Maps quest id to a tuple of (prerequisite id, times required).
+        version (tuple): The catalog token the graph was compiled against.
+    """
+
+    def __init__(self, edges: Mapping[int, Requirements], version=None):
+        self.edges = dict(edges)
+        self.version = version
+
+    def requirements_for(self, quest_id: int) -> Requirements:
+        return self.edges.get(quest_id, ())
+
+    def requirements_met(self, quest_id: int, completed: Mapping[int, int]) -> bool:
+        """
+        Check whether a character's completions satisfy all of a quest's requirements.
+
+        :param quest_id: The quest to check.
+        :type quest_id: int
+        :param completed: A dictionary mapping quest ids to completion counts.
+        :type completed: dict
+        :return: True if all requirements are met, False otherwise.
+        :rtype: bool
+        """
+        for prerequisite_id, times_required in self.edges.get(quest_id, ()):
+            if completed.get(prerequisite_id, 0) < times_required:
+                return False
+        return True
+
+
+def find_cycle(edges: Mapping[int, Iterable[Tuple[int, int]]]) -> Optional[List[int]]:
+    """
+    Find a cycle in the requirement graph using an iterative depth-first search.
+
+    :param edges: Maps quest id to an iterable of (prerequisite id, times required).
+    :type edges: dict
+    :return: The quest ids forming a cycle (first id repeated at the end), or None.
+    :rtype: list or None
+    """
+    WHITE, GREY, BLACK = 0, 1, 2
+    colour: Dict[int, int] = defaultdict(int)
+
+    for root in list(edges):
+        if colour[root] != WHITE:
+            continue
+        path = [root]
+        stack = [iter(edges.get(root, ()))]
+        colour[root] = GREY
+        while stack:
+            step = next(stack[-1], None)
+            if step is None:
+                colour[path.pop()] = BLACK
+                stack.pop()
+                continue
+            prerequisite_id = step[0]
+            if colour[prerequisite_id] == GREY:
+                return path[path.index(prerequisite_id) :] + [prerequisite_id]
+            if colour[prerequisite_id] == WHITE:
+                colour[prerequisite_id] = GREY
+                path.append(prerequisite_id)
+                stack.append(iter(edges.get(prerequisite_id, ())))
+    return None
+
+
+def compile_prerequisite_graph(strict: bool = True, version=None) -> PrerequisiteGraph:
+    """
+    Build the prerequisite graph from the database in a single query.
+
+    :param strict: Raise PrerequisiteCycleError if the graph has a cycle; otherwise log it.
+    :type strict: bool
+    :param version: The catalog token to tag the graph with.
+    :return: The compiled graph.
+    :rtype: PrerequisiteGraph
+    :raises PrerequisiteCycleError: If strict and the requirements form a cycle.
+    """
+    edges = defaultdict(list)
+    rows = QuestRequirement.objects.values_list(
+        "quest_id", "prerequisite_id", "times_required"
+    )
+    for quest_id, prerequisite_id, times_required in rows:
+        edges[quest_id].append((prerequisite_id, times_required))
+
+    cycle = find_cycle(edges)
+    if cycle:
+        if strict:
+            raise PrerequisiteCycleError(cycle)
+        logger.error(f"[PREREQUISITES] {PrerequisiteCycleError(cycle)}")
+
+    return PrerequisiteGraph(
+        {quest_id: tuple(reqs) for quest_id, reqs in edges.items()}, version
+    )
+
+
+_graph: Optional[PrerequisiteGraph] = None
+
+
+def get_prerequisite_graph() -> PrerequisiteGraph:
+    """
+    Return this worker's compiled graph, recompiling it if the catalog version changed.
+
+    :return: The compiled graph.
+    :rtype: PrerequisiteGraph
+    """
+    global _graph
+    try:
+        token = get_catalog_token()
+    except Exception as e:
+        # The shared version is unreadable; keep serving this worker's graph
+        logger.error(f"[PREREQUISITES] Could not read the catalog version: {e}")
+        if _graph is not None:
+            return _graph
+        token = None
+    if _graph is None or _graph.version != token:
+        logger.debug(f"[PREREQUISITES] Compiling prerequisite graph for {token}")
+        _graph = compile_prerequisite_graph(strict=False, version=token)
+    return _graph
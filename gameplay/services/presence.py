@@ -0,0 +1,191 @@
+"""
+Player Presence
+
+Whether a player is online used to be written to `Profile.is_online` on every
+connect and disconnect, and went stale whenever a worker died before its
+disconnect handler ran. Presence now lives in the default cache (Redis in
+production):
+
+    - each profile's heartbeat key (see `heartbeats`) is its presence key: it is
+      refreshed by every websocket ping, so a profile is online while its last
+      heartbeat is within `TIMER_HEARTBEAT_TIMEOUT`;
+    - an index of profiles that connected, a Redis set where the cache is Redis,
+      bounds the online checks for counts and iteration. Entries whose heartbeat
+      has expired are pruned as the index is read.
+
+`Profile.is_online` is kept only as a mirror for admin views, written in one
+batch by `sync_online_flags()` from the periodic Celery task when
+`PRESENCE_SYNC_IS_ONLINE` is set.
+
+Functions:
+    - mark_online(profile_id): Records that a profile has connected.
+    - mark_offline(profile_id): Records that a profile has disconnected.
+    - is_online(profile_id): Returns True if a profile is online.
+    - online_profile_ids(): Returns the ids of every online profile.
+    - online_count(): Returns the number of online profiles.
+    - sync_online_flags(): Mirrors presence into the `Profile.is_online` column.
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from typing import Iterable, List, Set, Tuple
+import logging
+
+from .heartbeats import clear_heartbeat, last_heartbeats, record_heartbeat
+
+logger = logging.getLogger("django")
+
+ONLINE_INDEX_KEY = "presence:online"
+BATCH_SIZE = 500
+
+
+def _redis():
+    # The raw client behind a django_redis cache, for native set operations
+    get_client = getattr(getattr(cache, "client", None), "get_client", None)
+    return get_client(write=True) if get_client else None
+
+
+def _index_add(profile_id: int):
+    client = _redis()
+    if client is not None:
+        client.sadd(cache.make_key(ONLINE_INDEX_KEY), profile_id)
+        return
+    online = cache.get(ONLINE_INDEX_KEY) or set()
+    if profile_id not in online:
+        online.add(profile_id)
+        cache.set(ONLINE_INDEX_KEY, online, timeout=None)
+
+
+def _index_remove(profile_ids: Iterable[int]):
+    profile_ids = set(profile_ids)
+    if not profile_ids:
+        return
+    client = _redis()
+    if client is not None:
+        client.srem(cache.make_key(ONLINE_INDEX_KEY), *profile_ids)
+        return
+    online = cache.get(ONLINE_INDEX_KEY) or set()
+    if online & profile_ids:
+        cache.set(ONLINE_INDEX_KEY, online - profile_ids, timeout=None)
+
+
+def _index_members() -> Set[int]:
+    client = _redis()
+    if client is not None:
+        key = cache.make_key(ONLINE_INDEX_KEY)
+        return {int(member) for member in client.sscan_iter(key)}
+    return set(cache.get(ONLINE_INDEX_KEY) or ())
+
+
+def _cutoff() -> float:
+    timeout = timedelta(seconds=settings.TIMER_HEARTBEAT_TIMEOUT)
+    return (timezone.now() - timeout).timestamp()
+
+
+def mark_online(profile_id: int):
+    """
+    Record that a profile has connected.
+
+    :param profile_id: The profile's id.
+    :type profile_id: int
+    """
+    try:
+        record_heartbeat(profile_id)
+        _index_add(profile_id)
+    except Exception as e:
+        logger.error(f"[PRESENCE] Could not mark profile {profile_id} online: {e}")
+
+
+def mark_offline(profile_id: int):
+    """
+    Record that a profile has disconnected.
+
+    :param profile_id: The profile's id.
+    :type profile_id: int
+    """
+    try:
+        clear_heartbeat(profile_id)
+        _index_remove([profile_id])
+    except Exception as e:
+        logger.error(f"[PRESENCE] Could not mark profile {profile_id} offline: {e}")
+
+
+def is_online(profile_id: int) -> bool:
+    """
+    Return True if the profile has sent a heartbeat recently.
+
+    :param profile_id: The profile's id.
+    :type profile_id: int
+    :rtype: bool
+    """
+    return last_heartbeats([profile_id]).get(profile_id, 0) >= _cutoff()
+
+
+def online_profile_ids() -> List[int]:
+    """
+    Return the ids of every online profile, pruning expired entries from the
+    index.
+
+    :return: The online profile ids, in ascending order.
+    :rtype: list
+    """
+    try:
+        members = sorted(_index_members())
+    except Exception as e:
+        logger.error(f"[PRESENCE] Could not read the online index: {e}")
+        return []
+
+    cutoff = _cutoff()
+    online, expired = [], []
+    for i in range(0, len(members), BATCH_SIZE):
+        batch = members[i : i + BATCH_SIZE]
+        beats = last_heartbeats(batch)
+        for profile_id in batch:
+            if beats.get(profile_id, 0) >= cutoff:
+                online.append(profile_id)
+            else:
+                expired.append(profile_id)
+
+    if expired:
+        try:
+            _index_remove(expired)
+        except Exception as e:
+            logger.error(f"[PRESENCE] Could not prune the online index: {e}")
+    return online
+
+
+def online_count() -> int:
+    """
+    Return the number of online profiles.
+
+    :rtype: int
+    """
+    return len(online_profile_ids())
+
+
+def sync_online_flags() -> Tuple[int, int]:
+    """
+    Mirror presence into the `Profile.is_online` column, in two batched updates.
+
+    :return: The number of profiles flagged online and offline.
+    :rtype: tuple
+    """
+    from users.models import Profile
+
+    online = online_profile_ids()
+    flagged_online = (
+        Profile.objects.filter(pk__in=online, is_online=False).update(is_online=True)
+        if online
+        else 0
+    )
+    flagged_offline = (
+        Profile.objects.filter(is_online=True)
+        .exclude(pk__in=online)
+        .update(is_online=False)
+    )
+    logger.info(
+        f"[PRESENCE] Flagged {flagged_online} profile(s) online and {flagged_offline} offline"
+    )
+    return flagged_online, flagged_offline
@@ -0,0 +1,121 @@
+"""
+Quest Availability Scheduling
+
+Quests with a `start_date` or `end_date` become active at their start date and
+inactive at their end date. Rather than polling every quest, availability is
+flipped with set-based updates and the next run is scheduled for the earliest
+upcoming boundary. Any flip bumps the quest catalog version so cached eligibility
+and snapshots are rebuilt exactly when availability changes.
+
+Functions:
+    - apply_quest_availability(moment): Activates/deactivates quests whose boundaries have passed.
+    - next_availability_boundary(moment): Returns the earliest upcoming start or end date, or None.
+    - schedule_quest_availability(moment): Schedules the availability task for the next boundary.
+"""
+
+from datetime import datetime
+from django.core.cache import cache
+from django.db.models import Min, Q
+from django.utils import timezone
+from typing import Optional
+import logging, math
+
+from gameplay.models import Quest
+from .quest_catalog import bump_catalog_version
+
+logger = logging.getLogger("django")
+
+NEXT_RUN_KEY = "quest_availability_next_run"
+
+
+def apply_quest_availability(moment: Optional[datetime] = None) -> int:
+    """
+    Activate quests whose start date has passed and deactivate quests whose end
+    date has passed, in two UPDATE queries. Quests are active from `start_date`
+    (inclusive) to `end_date` (exclusive).
+
+    :param moment: The reference time. Defaults to now.
+    :type moment: datetime
+    :return: The number of quests whose availability changed.
+    :rtype: int
+    """
+    moment = moment or timezone.now()
+
+    deactivated = Quest.objects.filter(is_active=True, end_date__lte=moment).update(
+        is_active=False
+    )
+    activated = (
+        Quest.objects.filter(is_active=False, start_date__lte=moment)
+        .exclude(end_date__lte=moment)
+        .update(is_active=True)
+    )
+
+    changed = activated + deactivated
+    if changed:
+        logger.info(
+            f"[QUEST AVAILABILITY] Activated {activated} and deactivated {deactivated} quest(s)"
+        )
+        # update() bypasses the post_save signals, so invalidate explicitly
+        bump_catalog_version()
+    return changed
+
+
+def next_availability_boundary(moment: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Return the earliest start or end date after `moment` (one query).
+
+    :param moment: The reference time. Defaults to now.
+    :type moment: datetime
+    :return: The next boundary, or None if no quest has an upcoming date.
+    :rtype: datetime or None
+    """
+    moment = moment or timezone.now()
+    upcoming = Quest.objects.aggregate(
+        next_start=Min("start_date", filter=Q(start_date__gt=moment)),
+        next_end=Min("end_date", filter=Q(end_date__gt=moment)),
+    )
+    boundaries = [value for value in upcoming.values() if value is not None]
+    return min(boundaries) if boundaries else None
+
+
+def schedule_quest_availability(
+    moment: Optional[datetime] = None,
+) -> Optional[datetime]:
+    """
+    Schedule the availability task for the next boundary, unless a run is already
+    scheduled at or before it.
+
+    :param moment: The reference time. Defaults to now.
+    :type moment: datetime
+    :return: The boundary a run was scheduled for, or None if nothing was scheduled.
+    :rtype: datetime or None
+    """
+    moment = moment or timezone.now()
+    boundary = next_availability_boundary(moment)
+    if boundary is None:
+        logger.debug("[QUEST AVAILABILITY] No upcoming quest boundaries")
+        return None
+
+    scheduled = cache.get(NEXT_RUN_KEY)
+    if scheduled is not None and moment.timestamp() < scheduled <= boundary.timestamp():
+        logger.debug(
+            f"[QUEST AVAILABILITY] Run already scheduled before {boundary}, skipping"
+        )
+        return None
+
+    from gameplay.tasks import update_quest_availability
+
+    try:
+        update_quest_availability.apply_async(eta=boundary)
+    except Exception as e:
+        logger.error(
+            f"[QUEST AVAILABILITY] Failed to schedule availability update for {boundary}: {e}"
+        )
+        return None
+
+    timeout = math.ceil((boundary - moment).total_seconds()) + 60
+    cache.set(NEXT_RUN_KEY, boundary.timestamp(), timeout=timeout)
+    logger.info(
+        f"[QUEST AVAILABILITY] Next availability update scheduled for {boundary}"
+    )
+    return boundary
@@ -0,0 +1,79 @@
+"""
+Quest Catalog Versioning
+
+The quest catalog (quests and their requirements) only changes when an admin edits
+it, so data derived from it is cached and tagged with a catalog version. Saving or
+deleting catalog rows bumps the version, which invalidates every derived cache.
+
+The version has two parts:
+    - a shared counter in the default cache, bumped once the change is committed so
+      other workers never rebuild from uncommitted rows;
+    - a per-process counter, bumped immediately so the worker making the change sees
+      it straight away (and so invalidation still works if the cache is unavailable).
+
+Functions:
+    - get_catalog_version(): Returns the shared catalog version, seeding it if unset.
+    - get_catalog_token(): Returns the (shared, local) version pair for in-process caches.
+    - bump_catalog_version(): Invalidates all data derived from the quest catalog.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+from typing import Optional, Tuple
+import logging, time
+
+logger = logging.getLogger("django")
+
+CATALOG_VERSION_KEY = "quest_catalog:version"
+
+_local_version = 0
+
+
+def get_catalog_version() -> Optional[int]:
+    """
+    Return the shared catalog version, seeding it if it has never been set (or was
+    evicted) so derived caches are never keyed on a missing version.
+
+    :return: The current version, or None if the cache does not keep it.
+    :rtype: int or None
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so the version never goes backwards; add() keeps the
+        # value if another worker seeded it first
+        cache.add(CATALOG_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def get_catalog_token() -> Tuple[Optional[int], int]:
+    """
+    Return the version pair used to validate per-process caches.
+
+    :return: A tuple of (shared version, local version).
+    :rtype: tuple
+    """
+    return get_catalog_version(), _local_version
+
+
+def _bump_shared_version():
+    try:
+        try:
+            cache.incr(CATALOG_VERSION_KEY)
+        except ValueError:
+            # Key missing: seed from the clock so the version never goes backwards
+            cache.set(CATALOG_VERSION_KEY, int(time.time() * 1000), timeout=None)
+    except Exception as e:
+        # Runs after the commit, so the change itself must not fail
+        logger.error(f"[QUEST CATALOG] Could not bump the shared catalog version: {e}")
+        return
+    logger.debug("[QUEST CATALOG] Shared catalog version bumped")
+
+
+def bump_catalog_version():
+    """
+    Invalidate all data derived from the quest catalog.
+    """
+    global _local_version
+    _local_version += 1
+    transaction.on_commit(_bump_shared_version)
@@ -0,0 +1,210 @@
+"""
+Quest Timer Deadlines
+
+When a quest timer starts, the moment it will finish is known, so completion is
+scheduled for that deadline instead of being detected by polling on every client
+ping. The deadline is registered in the cache and a Celery task is queued with
+that ETA. Restarting the timer registers a new deadline, so the old task exits
+without touching the database; pausing or resetting cancels the registration,
+and the task then finds the timer no longer due. When the task fires, the
+player's timer rows are locked (in the same order as every other transition) and
+the quest timer is re-checked and paused, so completion handling runs exactly
+once even if several tasks (or a page-load check) race for the same timer. A periodic sweep,
+which finds overdue timers in SQL, catches deadlines whose task could not be
+queued (e.g. the broker was unreachable).
+
+Functions:
+    - quest_deadline(timer): Returns when an active quest timer will finish, or None.
+    - schedule_quest_deadline(timer): Registers the deadline and queues the completion task.
+    - cancel_quest_deadline(timer): Cancels the registered deadline.
+    - cancel_quest_deadlines(timer_ids): Cancels the registered deadlines of many timers.
+    - fire_quest_deadline(timer_id, deadline): Runs completion handling if the deadline is still current.
+    - sweep_quest_deadlines(): Fires every active quest timer whose deadline has passed.
+"""
+
+from datetime import datetime, timedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from typing import TYPE_CHECKING, Iterable, Optional
+import logging, math
+
+if TYPE_CHECKING:
+    from gameplay.models import QuestTimer
+
+logger = logging.getLogger("django")
+
+# Grace period before an unfired registration expires from the cache
+DEADLINE_GRACE = 300
+
+
+def _key(timer_id: int) -> str:
+    return f"quest_deadline_{timer_id}"
+
+
+def quest_deadline(timer: "QuestTimer") -> Optional[datetime]:
+    """
+    Return when an active quest timer will finish.
+
+    :param timer: The quest timer.
+    :type timer: QuestTimer
+    :return: The deadline, or None if the timer is not running a quest.
+    :rtype: datetime or None
+    """
+    if not timer.is_active() or timer.duration <= 0:
+        return None
+    return timezone.now() + timedelta(seconds=timer.get_remaining_time())
+
+
+def schedule_quest_deadline(timer: "QuestTimer") -> Optional[datetime]:
+    """
+    Register the timer's deadline and queue the completion task for it, once the
+    current transaction commits.
+
+    :param timer: The quest timer, just started.
+    :type timer: QuestTimer
+    :return: The deadline, or None if nothing was scheduled.
+    :rtype: datetime or None
+    """
+    deadline = quest_deadline(timer)
+    if deadline is None:
+        return None
+
+    timestamp = deadline.timestamp()
+    timeout = math.ceil((deadline - timezone.now()).total_seconds()) + DEADLINE_GRACE
+    cache.set(_key(timer.id), timestamp, timeout=timeout)
+
+    def enqueue():
+        from gameplay.tasks import complete_quest_deadline
+
+        try:
+            # Fail fast rather than block the request; the sweep is the fallback
+            complete_quest_deadline.apply_async(
+                args=[timer.id, timestamp], eta=deadline, retry=False
+            )
+        except Exception as e:
+            logger.error(
+                f"[QUEST DEADLINE] Failed to schedule completion for timer {timer.id}: {e}"
+            )
+
+    transaction.on_commit(enqueue)
+    logger.debug(f"[QUEST DEADLINE] Timer {timer.id} deadline set for {deadline}")
+    return deadline
+
+
+def cancel_quest_deadline(timer: "QuestTimer"):
+    """
+    Cancel the timer's registered deadline. A task already queued for it will exit
+    without completing the quest.
+
+    :param timer: The quest timer, just paused or reset.
+    :type timer: QuestTimer
+    """
+    cache.delete(_key(timer.id))
+
+
+def cancel_quest_deadlines(timer_ids: Iterable[int]):
+    """
+    Cancel the registered deadlines of many timers, e.g. after a bulk pause.
+
+    :param timer_ids: The quest timer ids.
+    :type timer_ids: iterable
+    """
+    cache.delete_many([_key(timer_id) for timer_id in timer_ids])
+
+
+def fire_quest_deadline(timer_id: int, deadline: Optional[float] = None) -> bool:
+    """
+    Run quest completion handling for a timer whose deadline has been reached.
+
+    A task whose registration was superseded by a restart exits without a query.
+    Otherwise the player's timer rows are locked, in the order `transition_timers`
+    uses (activity timer, then quest timer), and the quest timer is re-checked, so
+    a task for a timer that was paused (its registration cancelled) or already
+    completed skips after two locked SELECTs. A due timer is paused while the
+    locks are held; completion handling and its messages run after they are
+    released.
+
+    :param timer_id: The quest timer's id.
+    :type timer_id: int
+    :param deadline: The deadline timestamp the task was queued for, or None to
+        skip the registration check.
+    :type deadline: float
+    :return: True if completion handling ran, False if the deadline was stale.
+    :rtype: bool
+    """
+    registered = cache.get(_key(timer_id)) if deadline is not None else None
+    if registered is not None and registered != deadline:
+        logger.debug(f"[QUEST DEADLINE] Timer {timer_id} deadline superseded")
+        return False
+
+    from character.models import PlayerCharacterLink
+    from gameplay.models import ActivityTimer, QuestTimer
+    from gameplay.services.timer_service import transition_timers
+    from gameplay.utils import process_completion
+
+    with transaction.atomic():
+        act_timer = (
+            ActivityTimer.objects.select_for_update(of=("self",))
+            .select_related("profile")
+            .filter(
+                profile__in=PlayerCharacterLink.objects.filter(
+                    character__quest_timer=timer_id, is_active=True
+                ).values("profile_id")
+            )
+            .first()
+        )
+        timer = (
+            QuestTimer.objects.select_for_update(of=("self",))
+            .select_related("character")
+            .filter(id=timer_id)
+            .first()
+        )
+        if (
+            act_timer is None
+            or timer is None
+            or not timer.is_active()
+            or not timer.time_finished()
+        ):
+            logger.debug(f"[QUEST DEADLINE] Timer {timer_id} not finished, skipping")
+            return False
+        # Paused under the locks, so a racing task finds the timer no longer due
+        transition_timers(act_timer, timer, "pause")
+
+    cache.delete(_key(timer_id))
+    logger.info(f"[QUEST DEADLINE] Timer {timer_id} reached its deadline")
+    # The timers are already paused: this re-checks readiness and notifies the
+    # player, outside the transaction
+    return process_completion(act_timer.profile, timer.character, "complete_quest")
+
+
+def sweep_quest_deadlines() -> int:
+    """
+    Fire every active quest timer whose deadline has passed. Overdue timers are
+    found in SQL, plus any that are only running in the live timer state store.
+
+    :return: The number of timers completed.
+    :rtype: int
+    """
+    from gameplay.models import QuestTimer
+    from gameplay.services.timer_state import live_states
+
+    now = timezone.now()
+    overdue = set(QuestTimer.objects.overdue(now).values_list("id", flat=True))
+    # Timers started with the cache state backend may only be active in the store
+    for timer_id, state in live_states(QuestTimer).items():
+        if (
+            state["status"] == "active"
+            and state["start_time"] is not None
+            and state["duration"] > 0
+            and state["elapsed_time"] + (now - state["start_time"]).total_seconds()
+            >= state["duration"]
+        ):
+            overdue.add(timer_id)
+
+    fired = 0
+    for timer_id in sorted(overdue):
+        fired += fire_quest_deadline(timer_id)
+    if fired:
+        logger.warning(f"[QUEST DEADLINE] Sweep completed {fired} overdue timer(s)")
+    return fired
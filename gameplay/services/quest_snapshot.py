@@ -0,0 +1,141 @@
+"""
+Quest Catalog Snapshot
+
+Quest rows (with their results, duration choices and stages) rarely change, yet
+they were re-serialized for every player on every request. The snapshot holds the
+serializer output for the whole catalog, built once per catalog version and
+shared through the default cache as msgpack bytes. Each worker also keeps the
+decoded snapshot in memory, so responses are assembled by quest id without
+touching the database or the serializer.
+
+Classes:
+    - QuestSnapshot: The serialized catalog for one serializer, indexed by quest id.
+
+Functions:
+    - build_quest_snapshot(serializer_class): Serializes the whole catalog (two queries).
+    - get_quest_snapshot(serializer_class): Returns this worker's snapshot, refreshing it if the catalog changed.
+    - serialize_quests(quest_ids, serializer_class): Returns serialized quests for the given ids.
+"""
+
+from django.core.cache import cache
+from typing import Dict, Iterable, List, Optional, Type
+import logging, msgpack
+
+from gameplay.models import Quest
+from .quest_catalog import get_catalog_token
+
+logger = logging.getLogger("django")
+
+SNAPSHOT_TIMEOUT = 60 * 60 * 24
+
+
+class QuestSnapshot:
+    """
+    Serialized quests for one serializer class, tagged with the catalog token.
+
+    Attributes:
+        quests (list): The serialized quests, ordered by id.
+        by_id (dict): Maps quest id to its serialized data.
+        version (tuple): The catalog token the snapshot was built against.
+    """
+
+    def __init__(self, quests: List[dict], version=None):
+        self.quests = quests
+        self.by_id = {quest["id"]: quest for quest in quests}
+        self.version = version
+
+    def get(self, quest_ids: Iterable[int]) -> List[dict]:
+        """
+        Return the serialized quests for the given ids, in the order given.
+        Unknown ids are skipped.
+        """
+        by_id = self.by_id
+        return [by_id[quest_id] for quest_id in quest_ids if quest_id in by_id]
+
+
+def _label(serializer_class: Type) -> str:
+    return f"{serializer_class.__module__}.{serializer_class.__name__}"
+
+
+def _cache_key(serializer_class: Type, shared_version: Optional[int]) -> str:
+    return f"quest_snapshot_{_label(serializer_class)}_{shared_version}"
+
+
+def build_quest_snapshot(serializer_class: Type) -> List[dict]:
+    """
+    Serialize every quest with the given serializer class.
+
+    :param serializer_class: A quest serializer (api or gameplay QuestSerializer).
+    :return: A list of serialized quests, ordered by id.
+    :rtype: list
+    """
+    quests = Quest.objects.select_related("results").order_by("id")
+    return serializer_class(quests, many=True).data
+
+
+def _load_or_build(serializer_class: Type, shared_version, use_cache: bool):
+    key = _cache_key(serializer_class, shared_version)
+    if use_cache:
+        packed = cache.get(key)
+        if packed is not None:
+            try:
+                return msgpack.unpackb(packed, raw=False)
+            except ValueError as e:
+                logger.warning(
+                    f"[QUEST SNAPSHOT] Discarding unreadable snapshot {key}: {e}"
+                )
+
+    quests = build_quest_snapshot(serializer_class)
+    # Round-trip through msgpack so cached and freshly built snapshots are identical
+    packed = msgpack.packb(quests, use_bin_type=True)
+    if use_cache:
+        cache.set(key, packed, timeout=SNAPSHOT_TIMEOUT)
+    logger.debug(f"[QUEST SNAPSHOT] Built {key} ({len(packed)} bytes)")
+    return msgpack.unpackb(packed, raw=False)
+
+
+_snapshots: Dict[str, QuestSnapshot] = {}
+
+
+def get_quest_snapshot(serializer_class: Type) -> QuestSnapshot:
+    """
+    Return this worker's snapshot for the serializer, refreshing it from the cache
+    (or rebuilding it) if the catalog version changed. If the cache holds no catalog
+    version the snapshot is rebuilt and not cached at all.
+
+    :param serializer_class: A quest serializer (api or gameplay QuestSerializer).
+    :return: The current snapshot.
+    :rtype: QuestSnapshot
+    """
+    label = _label(serializer_class)
+    token = get_catalog_token()
+    snapshot = _snapshots.get(label)
+    if snapshot is not None and snapshot.version == token:
+        return snapshot
+
+    if token[0] is None:
+        # Without a shared version a later catalog change could not be detected, so
+        # serve a fresh build and keep nothing
+        logger.warning("[QUEST SNAPSHOT] No catalog version, building uncached")
+        _snapshots.pop(label, None)
+        return QuestSnapshot(_load_or_build(serializer_class, None, use_cache=False))
+
+    # If only this worker's local version moved, the change is not committed yet and
+    # the shared copy is stale: rebuild from the database without publishing it.
+    local_change = snapshot is not None and snapshot.version[0] == token[0]
+    quests = _load_or_build(serializer_class, token[0], use_cache=not local_change)
+    snapshot = _snapshots[label] = QuestSnapshot(quests, token)
+    return snapshot
+
+
+def serialize_quests(quest_ids: Iterable[int], serializer_class: Type) -> List[dict]:
+    """
+    Return serialized quests for the given ids from the catalog snapshot.
+
+    :param quest_ids: The ids of the quests, in the order they should be returned.
+    :type quest_ids: iterable
+    :param serializer_class: A quest serializer (api or gameplay QuestSerializer).
+    :return: A list of serialized quests.
+    :rtype: list
+    """
+    return get_quest_snapshot(serializer_class).get(quest_ids)
@@ -0,0 +1,192 @@
+"""
+Timer Read Model
+
+Bootstrapping the game (`fetch_info`) needs both of a player's timers with their
+current activity and quest, which means loading the timers, the activity, the
+quest and its results on every page load. Instead, each timer's serialized form
+is kept as a document in the default cache, together with its compact clock (see
+`timer_sync`), so a page load reads both documents in one round trip and only the
+time-dependent fields are recomputed.
+
+Documents are stored per response shape (the API and the legacy views use
+different serializers) and tagged with a generation. Every timer transition bumps
+the timer's generation once its transaction commits, so a document built from
+state read before the transition is never served after it. Documents are also
+tagged with the quest catalog version, so quest edits are picked up. On a miss
+the views fall back to the database and store what they serialized.
+
+Functions:
+    - invalidate_timer_documents(kind, owner_ids): Marks the documents of some timers as stale.
+    - cached_timer_data(profile, character, shape): Returns both timers' serialized data from the cache, or None.
+    - store_timer_data(shape, tokens, act_timer, quest_timer, act_data, quest_data): Stores serialized timers.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from typing import Iterable, Optional, Tuple
+import logging, uuid
+
+from .quest_catalog import CATALOG_VERSION_KEY
+from .timer_sync import timer_clock
+
+logger = logging.getLogger("django")
+
+DOCUMENT_TIMEOUT = 60 * 60 * 24
+
+
+def _doc_key(kind: str, owner_id: int) -> str:
+    return f"timer_doc:{kind}:{owner_id}"
+
+
+def _gen_key(kind: str, owner_id: int) -> str:
+    return f"timer_doc_gen:{kind}:{owner_id}"
+
+
+def invalidate_timer_documents(kind: str, owner_ids: Iterable[int]):
+    """
+    Mark the cached documents of some timers as stale, once the current
+    transaction commits.
+
+    :param kind: "activity" (owned by a profile) or "quest" (owned by a character).
+    :type kind: str
+    :param owner_ids: The profile or character ids.
+    :type owner_ids: iterable
+    """
+    keys = [_gen_key(kind, owner_id) for owner_id in owner_ids if owner_id]
+    if not keys:
+        return
+
+    def bump():
+        generation = uuid.uuid4().hex
+        cache.set_many({key: generation for key in keys}, timeout=DOCUMENT_TIMEOUT)
+
+    transaction.on_commit(bump)
+
+
+def _current_elapsed(clock: dict, now_ms: int) -> int:
+    elapsed = clock["elapsed"]
+    if clock["started_at"] is not None:
+        elapsed += (now_ms - clock["started_at"]) // 1000
+    return elapsed
+
+
+def _needs_repair(clock: dict, data: dict, now_ms: int) -> bool:
+    # The views' fix-ups (finishing an overdue quest, resetting an activity timer
+    # that lost its activity) need the database
+    if "duration" in clock:
+        return clock["status"] not in ("completed", "empty") and (
+            clock["duration"] - _current_elapsed(clock, now_ms) <= 0
+        )
+    return clock["status"] != "empty" and data.get("activity") is None
+
+
+def _live(clock: dict, data: dict, now_ms: int) -> dict:
+    data = dict(data)
+    elapsed = _current_elapsed(clock, now_ms)
+    data["elapsed_time"] = elapsed
+    if "remaining_time" in data:
+        data["remaining_time"] = max(clock["duration"] - elapsed, 0)
+    return data
+
+
+def cached_timer_data(
+    profile, character, shape: str
+) -> Tuple[Optional[Tuple[dict, dict]], dict]:
+    """
+    Return the serialized activity and quest timers from their cached documents.
+
+    :param profile: The player's profile.
+    :type profile: Profile
+    :param character: The player's active character.
+    :type character: Character
+    :param shape: The response shape, e.g. "api".
+    :type shape: str
+    :return: The (activity, quest) data, or None if either document is missing,
+        stale or needs repairing; and the generation and catalog version tokens
+        to store with.
+    :rtype: tuple
+    """
+    owners = (("activity", profile.id), ("quest", character.id))
+    keys = [
+        key
+        for kind, owner_id in owners
+        for key in (_doc_key(kind, owner_id), _gen_key(kind, owner_id))
+    ]
+    found = cache.get_many(keys + [CATALOG_VERSION_KEY])
+    # Quest edits bump the catalog version, which stales the quest summaries too
+    catalog = found.get(CATALOG_VERSION_KEY)
+    tokens = {
+        kind: (found.get(_gen_key(kind, owner_id)), catalog)
+        for kind, owner_id in owners
+    }
+
+    now_ms = int(timezone.now().timestamp() * 1000)
+    result = []
+    for kind, owner_id in owners:
+        document = found.get(_doc_key(kind, owner_id))
+        if (
+            document is None
+            or document["generation"] != tokens[kind]
+            or shape not in document["data"]
+            or _needs_repair(document["clock"], document["data"][shape], now_ms)
+        ):
+            logger.debug(f"[TIMER READ MODEL] Miss for {kind} timer of {owner_id}")
+            return None, tokens
+        result.append(_live(document["clock"], document["data"][shape], now_ms))
+    return (result[0], result[1]), tokens
+
+
+def _store(kind: str, owner_id: int, generation, timer, shape: str, data: dict):
+    key = _doc_key(kind, owner_id)
+    clock = timer_clock(timer)
+    document = cache.get(key)
+    if (
+        document is None
+        or document["generation"] != generation
+        or document["clock"] != clock
+    ):
+        document = {"generation": generation, "clock": clock, "data": {}}
+    document["data"][shape] = dict(data)
+    cache.set(key, document, timeout=DOCUMENT_TIMEOUT)
+
+
+def store_timer_data(
+    shape: str, tokens: dict, act_timer, quest_timer, act_data: dict, quest_data: dict
+):
+    """
+    Store the serialized timers as documents, tagged with the generations read
+    before the timers were loaded.
+
+    :param shape: The response shape, e.g. "api".
+    :type shape: str
+    :param tokens: The generation tokens returned by `cached_timer_data`.
+    :type tokens: dict
+    :param act_timer: The activity timer that was serialized.
+    :type act_timer: ActivityTimer
+    :param quest_timer: The quest timer that was serialized.
+    :type quest_timer: QuestTimer
+    :param act_data: The serialized activity timer.
+    :type act_data: dict
+    :param quest_data: The serialized quest timer.
+    :type quest_data: dict
+    """
+    try:
+        _store(
+            "activity",
+            act_timer.profile_id,
+            tokens["activity"],
+            act_timer,
+            shape,
+            act_data,
+        )
+        _store(
+            "quest",
+            quest_timer.character_id,
+            tokens["quest"],
+            quest_timer,
+            shape,
+            quest_data,
+        )
+    except Exception as e:
+        logger.error(f"[TIMER READ MODEL] Could not store timer documents: {e}")
@@ -0,0 +1,185 @@
+"""
+Timer Segment Log
+
+Every span a timer runs is appended to `TimerSegment` when it closes (pause,
+completion or a bulk pause), so the history of when players were active is kept
+alongside the `elapsed_time` running total. Segments are only needed in full for
+recent days; older ones are compacted into one `TimerDailyTotal` row per timer per
+day, which keeps the per-hour breakdown used by activity charts. All dates and
+hours are UTC.
+
+Functions:
+    - split_by_hour(started_at, ended_at): Splits a span into seconds per (date, hour).
+    - compact_timer_segments(before, batch_size): Rolls old segments into daily totals.
+    - hourly_activity(profile, day): Returns the seconds a profile was active in each hour of a day.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from django.db import transaction
+from django.utils import timezone
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger("django")
+
+# Segments newer than this many days are kept as they are
+RETENTION_DAYS = 7
+
+
+def _utc(moment: datetime) -> datetime:
+    return moment.astimezone(dt_timezone.utc)
+
+
+def split_by_hour(
+    started_at: datetime, ended_at: datetime
+) -> Dict[Tuple[date, int], int]:
+    """
+    Split a span into the seconds it covers in each UTC hour.
+
+    :param started_at: When the span started.
+    :type started_at: datetime
+    :param ended_at: When the span ended.
+    :type ended_at: datetime
+    :return: Seconds per (date, hour).
+    :rtype: dict
+    """
+    buckets = defaultdict(int)
+    cursor, end = _utc(started_at), _utc(ended_at)
+    while cursor < end:
+        next_hour = cursor.replace(minute=0, second=0, microsecond=0) + timedelta(
+            hours=1
+        )
+        boundary = min(next_hour, end)
+        buckets[(cursor.date(), cursor.hour)] += int(
+            (boundary - cursor).total_seconds()
+        )
+        cursor = boundary
+    return dict(buckets)
+
+
+def _default_cutoff() -> datetime:
+    today = timezone.now().astimezone(dt_timezone.utc).date()
+    return datetime.combine(
+        today - timedelta(days=RETENTION_DAYS), time.min, tzinfo=dt_timezone.utc
+    )
+
+
+def compact_timer_segments(
+    before: Optional[datetime] = None, batch_size: int = 5000
+) -> int:
+    """
+    Roll segments that started before the cutoff into `TimerDailyTotal` rows and
+    delete them. Each batch is compacted in its own transaction.
+
+    :param before: Segments starting before this are compacted. Defaults to
+        midnight UTC, RETENTION_DAYS days ago.
+    :type before: datetime
+    :param batch_size: The number of segments compacted per transaction.
+    :type batch_size: int
+    :return: The number of segments compacted.
+    :rtype: int
+    """
+    from gameplay.models import TimerDailyTotal, TimerSegment
+
+    before = before or _default_cutoff()
+    compacted = 0
+    while True:
+        with transaction.atomic():
+            segments = list(
+                TimerSegment.objects.select_for_update(skip_locked=True)
+                .filter(started_at__lt=before)
+                .order_by("id")[:batch_size]
+            )
+            if not segments:
+                break
+
+            days = {}
+            for segment in segments:
+                for (day, hour), seconds in split_by_hour(
+                    segment.started_at, segment.ended_at
+                ).items():
+                    key = (segment.timer_type, segment.timer_id, day)
+                    if key not in days:
+                        days[key] = {
+                            "profile_id": segment.profile_id,
+                            "character_id": segment.character_id,
+                            "hourly": [0] * 24,
+                            "segments": set(),
+                        }
+                    days[key]["hourly"][hour] += seconds
+                    days[key]["segments"].add(segment.id)
+
+            existing = {}
+            for total in TimerDailyTotal.objects.select_for_update().filter(
+                timer_id__in={key[1] for key in days},
+                date__in={key[2] for key in days},
+            ):
+                existing[(total.timer_type, total.timer_id, total.date)] = total
+
+            to_create, to_update = [], []
+            for key, day in days.items():
+                total = existing.get(key)
+                if total is None:
+                    total = TimerDailyTotal(
+                        timer_type=key[0],
+                        timer_id=key[1],
+                        date=key[2],
+                        profile_id=day["profile_id"],
+                        character_id=day["character_id"],
+                        hourly=[0] * 24,
+                    )
+                    to_create.append(total)
+                else:
+                    to_update.append(total)
+                total.hourly = [a + b for a, b in zip(total.hourly, day["hourly"])]
+                total.total_seconds = sum(total.hourly)
+                total.segment_count += len(day["segments"])
+
+            TimerDailyTotal.objects.bulk_create(to_create)
+            TimerDailyTotal.objects.bulk_update(
+                to_update, ["hourly", "total_seconds", "segment_count"]
+            )
+            TimerSegment.objects.filter(id__in=[s.id for s in segments]).delete()
+        compacted += len(segments)
+
+    logger.info(f"[TIMER SEGMENTS] Compacted {compacted} segment(s) before {before}")
+    return compacted
+
+
+def hourly_activity(profile, day: date) -> List[int]:
+    """
+    Return the seconds a profile's activity timer ran in each UTC hour of a day,
+    from compacted totals and the segments not yet compacted.
+
+    :param profile: The profile.
+    :type profile: Profile
+    :param day: The day.
+    :type day: date
+    :return: 24 values, one per hour.
+    :rtype: list
+    """
+    from gameplay.models import TimerDailyTotal, TimerSegment
+
+    hourly = [0] * 24
+    for total in TimerDailyTotal.objects.filter(
+        profile=profile, timer_type="activity", date=day
+    ).only("hourly"):
+        hourly = [a + b for a, b in zip(hourly, total.hourly)]
+
+    day_start = datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+    day_end = day_start + timedelta(days=1)
+    segments = TimerSegment.objects.filter(
+        profile=profile,
+        timer_type="activity",
+        started_at__lt=day_end,
+        ended_at__gt=day_start,
+    ).only("started_at", "ended_at")
+    for segment in segments:
+        for (segment_day, hour), seconds in split_by_hour(
+            max(segment.started_at, day_start), min(segment.ended_at, day_end)
+        ).items():
+            if segment_day == day:
+                hourly[hour] += seconds
+    return hourly
@@ -1,2 +1,104 @@
+"""
+Timer Transitions
+
+A player's activity timer and quest timer always start and pause together. The
+HTTP API and the websocket consumer can both request a transition at the same
+moment, so each transition locks both timer rows (activity timer first, so
+concurrent transitions cannot deadlock), re-reads their state, applies the state
+machine to both in one transaction and writes each row once. The fresh timers
+are returned so callers never act on stale in-memory instances.
+
+Classes:
+    - TimerTransition: The outcome of a transition, with the fresh timers.
+
+Functions:
+    - transition_timers(act_timer, quest_timer, action): Starts or pauses both timers atomically.
+"""
+
 from django.db import transaction
-from django.utils.timezone import now
+from typing import TYPE_CHECKING, NamedTuple
+import logging
+
+if TYPE_CHECKING:
+    from gameplay.models import ActivityTimer, QuestTimer
+
+logger = logging.getLogger("django")
+
+STARTABLE = ("active", "paused", "waiting")
+PAUSABLE = ("active", "waiting")
+
+
+class TimerTransition(NamedTuple):
+    success: bool
+    message: str
+    activity_timer: "ActivityTimer"
+    quest_timer: "QuestTimer"
+
+
+def _start(act_timer, quest_timer) -> str:
+    if act_timer.status not in STARTABLE or quest_timer.status not in STARTABLE:
+        raise ValueError(
+            f"Timers not in a valid state (activity: {act_timer.status}, quest: {quest_timer.status})"
+        )
+    act_timer.start()
+    quest_timer.start()
+    return "Timers successfully started"
+
+
+def _pause(act_timer, quest_timer) -> str:
+    for timer in (act_timer, quest_timer):
+        if timer.status in PAUSABLE:
+            timer.pause()
+    return "Timers successfully paused"
+
+
+TRANSITIONS = {"start": _start, "pause": _pause}
+
+
+def _copy_state(source, target):
+    for field in source._meta.concrete_fields:
+        setattr(target, field.attname, getattr(source, field.attname))
+
+
+def transition_timers(
+    act_timer: "ActivityTimer", quest_timer: "QuestTimer", action: str
+) -> TimerTransition:
+    """
+    Start or pause a player's activity and quest timers in one transaction, with
+    both rows locked. The given instances are updated with the fresh state.
+
+    :param act_timer: The activity timer.
+    :type act_timer: ActivityTimer
+    :param quest_timer: The quest timer.
+    :type quest_timer: QuestTimer
+    :param action: "start" or "pause".
+    :type action: str
+    :return: The outcome, with the locked and updated timers.
+    :rtype: TimerTransition
+    :raises ValueError: If the action is unknown.
+    """
+    if action not in TRANSITIONS:
+        raise ValueError(f"Unknown timer transition: {action}")
+
+    from gameplay.models import ActivityTimer, QuestTimer
+
+    with transaction.atomic():
+        locked_act = (
+            ActivityTimer.objects.select_for_update(of=("self",))
+            .select_related("activity")
+            .get(pk=act_timer.pk)
+        )
+        locked_quest = QuestTimer.objects.select_for_update().get(pk=quest_timer.pk)
+        try:
+            message = TRANSITIONS[action](locked_act, locked_quest)
+            success = True
+        except ValueError as e:
+            message = str(e)
+            success = False
+
+    logger.info(
+        f"[TIMER TRANSITION] {action} for timers {act_timer.pk}/{quest_timer.pk}: {message}"
+    )
+    _copy_state(locked_act, act_timer)
+    _copy_state(locked_quest, quest_timer)
+    return TimerTransition(success, message, locked_act, locked_quest)
@@ -0,0 +1,375 @@
+"""
+Live Timer State Store
+
+With `TIMER_STATE_BACKEND = "cache"`, the state of a running timer (status,
+start_time, elapsed_time and, for quest timers, duration) is kept in the
+`TIMER_STATE_CACHE` cache (Redis in production) while a session is live, instead
+of being written to Postgres on every start/pause. The stored state is the source
+of truth: it is overlaid onto every timer loaded from the database, with one store
+round trip per batch of rows (see `LiveStateIterable`).
+
+State is written back to Postgres (write-behind) when:
+    - the timer is saved with any state field, e.g. on complete or reset;
+    - the player's websocket disconnects;
+    - `flush_timer_states()` runs, from maintenance or the periodic Celery task.
+
+Because the state outlives the worker that wrote it, a crashed worker loses
+nothing: the next load overlays the stored state and the next flush persists it.
+If the store cannot be written, timers fall back to saving to the database.
+
+Live timers are listed in an index that the flushes read. On Redis it is a set
+updated atomically with SADD/SREM, so concurrent sessions cannot drop entries;
+other cache backends keep it as a single cached set. On Redis, a state and its
+index entry are also written in one transaction, and a flush only deletes the
+state it wrote back (WATCH/MULTI), so a start or pause on another worker during
+a flush is never lost.
+
+Functions:
+    - timer_state_enabled(): Returns True if timer state is kept in the cache.
+    - state_fields(timer): Returns the names of the timer's state fields.
+    - load_state(timer): Returns the timer's stored state, or None.
+    - load_states(model, pks): Returns the stored states of some timers.
+    - write_state(timer): Stores the timer's current state; returns False on failure.
+    - discard_state(timer): Removes the timer's stored state.
+    - flush_state(timer, discard): Writes the stored state of a timer to the database.
+    - flush_states(model, pks): Writes the stored states of some timers to the database and discards them.
+    - flush_timer_states(discard_active): Writes all stored timer states to the database.
+    - live_states(model): Returns the stored states of a model's live timers.
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from typing import Optional
+import logging, pickle
+
+logger = logging.getLogger("django")
+
+BASE_STATE_FIELDS = ("status", "start_time", "elapsed_time")
+LIVE_INDEX_KEY = "timer_state:live"
+
+
+def timer_state_enabled() -> bool:
+    return getattr(settings, "TIMER_STATE_BACKEND", "database") == "cache"
+
+
+def _store():
+    return caches[getattr(settings, "TIMER_STATE_CACHE", "default")]
+
+
+def _key(label: str, pk: int) -> str:
+    return f"timer_state:{label}:{pk}"
+
+
+def _label(timer) -> str:
+    return timer._meta.label_lower
+
+
+def state_fields(timer) -> tuple:
+    """
+    Return the names of the fields held in the live store for this timer.
+
+    :param timer: The timer instance or class.
+    :return: A tuple of field names.
+    :rtype: tuple
+    """
+    if hasattr(timer, "duration"):
+        return BASE_STATE_FIELDS + ("duration",)
+    return BASE_STATE_FIELDS
+
+
+def _redis(store):
+    # The raw client behind a django_redis cache, for atomic operations
+    get_client = getattr(getattr(store, "client", None), "get_client", None)
+    return get_client(write=True) if get_client else None
+
+
+def _codec(store):
+    # Raw commands serialize values as the cache does, so the two agree
+    client = getattr(store, "client", None)
+    if hasattr(client, "encode"):
+        return client.encode, client.decode
+    return pickle.dumps, pickle.loads
+
+
+def _update_index(entry: str, add: bool):
+    store = _store()
+    client = _redis(store)
+    if client is not None:
+        key = store.make_key(LIVE_INDEX_KEY)
+        if add:
+            client.sadd(key, entry)
+        else:
+            client.srem(key, entry)
+        return
+    # Other backends (local development) keep the index as one cached set
+    live = store.get(LIVE_INDEX_KEY) or set()
+    if (entry in live) == add:
+        return
+    if add:
+        live.add(entry)
+    else:
+        live.discard(entry)
+    store.set(LIVE_INDEX_KEY, live, timeout=None)
+
+
+def _index_entries() -> list:
+    store = _store()
+    client = _redis(store)
+    if client is not None:
+        key = store.make_key(LIVE_INDEX_KEY)
+        return [
+            entry.decode() if isinstance(entry, bytes) else entry
+            for entry in client.sscan_iter(key)
+        ]
+    return list(store.get(LIVE_INDEX_KEY) or ())
+
+
+def _get_states(label: str, pks) -> dict:
+    # The stored states of some timers, by id, in one round trip
+    pks = list(pks)
+    if not pks:
+        return {}
+    store = _store()
+    client = _redis(store)
+    if client is None:
+        found = store.get_many([_key(label, pk) for pk in pks])
+        return {pk: found[_key(label, pk)] for pk in pks if _key(label, pk) in found}
+    _, decode = _codec(store)
+    values = client.mget([store.make_key(_key(label, pk)) for pk in pks])
+    return {pk: decode(raw) for pk, raw in zip(pks, values) if raw is not None}
+
+
+def load_state(timer) -> Optional[dict]:
+    """
+    Return the timer's stored state.
+
+    :param timer: The timer instance.
+    :return: A dictionary of state field values, or None if the timer is not live.
+    :rtype: dict or None
+    """
+    try:
+        return _get_states(_label(timer), [timer.pk]).get(timer.pk)
+    except Exception as e:
+        logger.error(f"[TIMER STATE] Could not load state for timer {timer.pk}: {e}")
+        return None
+
+
+def load_states(model, pks) -> dict:
+    """
+    Return the stored states of some timers, in one round trip.
+
+    :param model: The timer model.
+    :param pks: The timer ids.
+    :type pks: iterable
+    :return: State dictionaries by timer id, for the timers that are live.
+    :rtype: dict
+    """
+    try:
+        return _get_states(model._meta.label_lower, pks)
+    except Exception as e:
+        logger.error(
+            f"[TIMER STATE] Could not load {model._meta.label_lower} states: {e}"
+        )
+        return {}
+
+
+def write_state(timer) -> bool:
+    """
+    Store the timer's current state, making it the source of truth.
+
+    :param timer: The timer instance.
+    :return: True if stored, False if the store is unavailable.
+    :rtype: bool
+    """
+    label = _label(timer)
+    entry = f"{label}:{timer.pk}"
+    state = {field: getattr(timer, field) for field in state_fields(timer)}
+    try:
+        store = _store()
+        client = _redis(store)
+        if client is not None:
+            # Stored and indexed in one transaction, which a flush in progress
+            # detects (see `_flush`)
+            encode, _ = _codec(store)
+            with client.pipeline(transaction=True) as pipe:
+                pipe.sadd(store.make_key(LIVE_INDEX_KEY), entry)
+                pipe.set(store.make_key(_key(label, timer.pk)), encode(state))
+                pipe.execute()
+        elif store.add(_key(label, timer.pk), state, timeout=None):
+            _update_index(entry, add=True)
+        else:
+            store.set(_key(label, timer.pk), state, timeout=None)
+    except Exception as e:
+        logger.error(f"[TIMER STATE] Could not store state for timer {timer.pk}: {e}")
+        return False
+    logger.debug(f"[TIMER STATE] Stored {label} {timer.pk}: {state}")
+    return True
+
+
+def discard_state(timer):
+    """
+    Remove the timer's stored state, leaving the database as the source of truth.
+
+    :param timer: The timer instance.
+    """
+    label = _label(timer)
+    entry = f"{label}:{timer.pk}"
+    try:
+        store = _store()
+        client = _redis(store)
+        if client is not None:
+            with client.pipeline(transaction=True) as pipe:
+                pipe.delete(store.make_key(_key(label, timer.pk)))
+                pipe.srem(store.make_key(LIVE_INDEX_KEY), entry)
+                pipe.execute()
+            return
+        store.delete(_key(label, timer.pk))
+        _update_index(entry, add=False)
+    except Exception as e:
+        logger.error(f"[TIMER STATE] Could not discard state for timer {timer.pk}: {e}")
+
+
+def _write_back(model, pk: int, state: dict):
+    model.objects.filter(pk=pk).update(last_updated=timezone.now(), **state)
+    logger.debug(f"[TIMER STATE] Flushed {model._meta.label_lower} {pk}: {state}")
+
+
+def _flush(model, pk: int, discard: bool) -> bool:
+    label = model._meta.label_lower
+    entry = f"{label}:{pk}"
+    store = _store()
+    client = _redis(store)
+    if client is None:
+        state = store.get(_key(label, pk))
+        if state is None:
+            return False
+        _write_back(model, pk, state)
+        # Not atomic, but other backends are only used in local development
+        if discard and store.get(_key(label, pk)) == state:
+            store.delete(_key(label, pk))
+            _update_index(entry, add=False)
+        return True
+
+    from redis.exceptions import WatchError
+
+    key = store.make_key(_key(label, pk))
+    _, decode = _codec(store)
+    with client.pipeline() as pipe:
+        # Compare-and-delete: if the state is rewritten (a start or pause on
+        # another worker) before the delete, the delete is aborted and the newer
+        # state stays live until the next flush
+        pipe.watch(key)
+        raw = pipe.get(key)
+        if raw is None:
+            return False
+        _write_back(model, pk, decode(raw))
+        if discard:
+            try:
+                pipe.multi()
+                pipe.delete(key)
+                pipe.srem(store.make_key(LIVE_INDEX_KEY), entry)
+                pipe.execute()
+            except WatchError:
+                logger.info(
+                    f"[TIMER STATE] {entry} changed while flushing; kept the newer state"
+                )
+    return True
+
+
+def flush_state(timer, discard: bool = True) -> bool:
+    """
+    Write the timer's stored state to the database.
+
+    :param timer: The timer instance.
+    :param discard: Remove the stored state afterwards.
+    :type discard: bool
+    :return: True if there was state to flush.
+    :rtype: bool
+    """
+    if not timer_state_enabled() or timer is None:
+        return False
+    try:
+        return _flush(type(timer), timer.pk, discard)
+    except Exception as e:
+        logger.error(f"[TIMER STATE] Could not flush timer {timer.pk}: {e}")
+        return False
+
+
+def flush_states(model, pks) -> int:
+    """
+    Write the stored states of some timers to the database and discard them, e.g.
+    before the timers are paused with a bulk update.
+
+    :param model: The timer model.
+    :param pks: The timer ids.
+    :type pks: iterable
+    :return: The number of timers flushed.
+    :rtype: int
+    """
+    if not timer_state_enabled():
+        return 0
+    flushed = 0
+    for pk in pks:
+        try:
+            flushed += _flush(model, pk, discard=True)
+        except Exception as e:
+            logger.error(f"[TIMER STATE] Could not flush timer {pk}: {e}")
+    return flushed
+
+
+def live_states(model) -> dict:
+    """
+    Return the stored states of a timer model's live timers.
+
+    :param model: The timer model.
+    :return: State dictionaries by timer id.
+    :rtype: dict
+    """
+    if not timer_state_enabled():
+        return {}
+    label = model._meta.label_lower
+    try:
+        return _get_states(
+            label,
+            [
+                int(entry.rsplit(":", 1)[1])
+                for entry in _index_entries()
+                if entry.rsplit(":", 1)[0] == label
+            ],
+        )
+    except Exception as e:
+        logger.error(f"[TIMER STATE] Could not read live {label} states: {e}")
+        return {}
+
+
+def flush_timer_states(discard_active: bool = False) -> int:
+    """
+    Write every stored timer state to the database. Timers that are no longer
+    running are removed from the store; running timers stay live unless
+    `discard_active` is set.
+
+    :param discard_active: Also remove the state of running timers.
+    :type discard_active: bool
+    :return: The number of timers flushed.
+    :rtype: int
+    """
+    if not timer_state_enabled():
+        return 0
+
+    flushed = 0
+    for entry in _index_entries():
+        label, pk = entry.rsplit(":", 1)
+        model = apps.get_model(label)
+        state = _get_states(label, [int(pk)]).get(int(pk))
+        if state is None:
+            _update_index(entry, add=False)
+            continue
+        discard = discard_active or state.get("status") != "active"
+        try:
+            flushed += _flush(model, int(pk), discard)
+        except Exception as e:
+            logger.error(f"[TIMER STATE] Could not flush {entry}: {e}")
+    logger.info(f"[TIMER STATE] Flushed {flushed} timer(s)")
+    return flushed
@@ -0,0 +1,145 @@
+"""
+Timer Sync Protocol
+
+The server is authoritative for timer state, but clients render the countdown.
+Rather than correcting a drifting client with a full timer payload, the server
+sends a compact `timer_sync` message on connect and after each transition. It
+holds the server clock and, for each timer, its status, the elapsed time banked
+before the current run, when the current run started and (for quest timers) the
+absolute deadline, all as epoch milliseconds on the server clock.
+
+A client records `offset = server_time - Date.now()` on receipt and computes
+display time locally, e.g. `remaining = deadline - (Date.now() + offset)`. No
+further round trips are needed until the next transition.
+
+Transitions are published by the timer models themselves (see
+`publish_timer_sync`) once their transaction commits, so every path that
+changes a timer (the consumer, the REST views, Celery tasks and bulk pauses)
+keeps clients in sync. These messages carry only the timer that changed; the
+other key is left out rather than sent as null, which would mean "no timer".
+
+Functions:
+    - timer_clock(timer): Returns the compact sync state of one timer.
+    - timer_sync_message(act_timer, quest_timer): Returns the `timer_sync` message for both timers.
+    - publish_timer_sync(kind, clocks): Sends changed timers' clocks to their players after commit.
+"""
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from datetime import datetime, timedelta
+from django.db import transaction
+from django.utils import timezone
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger("django")
+
+
+def _ms(moment: Optional[datetime]) -> Optional[int]:
+    return int(moment.timestamp() * 1000) if moment else None
+
+
+def timer_clock(timer) -> Optional[dict]:
+    """
+    Return the compact sync state of a timer.
+
+    :param timer: The activity or quest timer.
+    :type timer: Timer
+    :return: The timer's id, status, banked elapsed seconds and run start, plus the
+        duration and deadline for quest timers; None if there is no timer.
+    :rtype: dict or None
+    """
+    if timer is None:
+        return None
+
+    running = timer.status == "active" and timer.start_time is not None
+    clock = {
+        "id": timer.id,
+        "status": timer.status,
+        "elapsed": timer.elapsed_time,
+        "started_at": _ms(timer.start_time) if running else None,
+    }
+    if hasattr(timer, "duration"):
+        clock["duration"] = timer.duration
+        clock["deadline"] = (
+            _ms(
+                timer.start_time
+                + timedelta(seconds=timer.duration - timer.elapsed_time)
+            )
+            if running and timer.duration > 0
+            else None
+        )
+    return clock
+
+
+def timer_sync_message(act_timer, quest_timer) -> dict:
+    """
+    Build the `timer_sync` message for a player's timers.
+
+    :param act_timer: The activity timer.
+    :type act_timer: ActivityTimer
+    :param quest_timer: The quest timer.
+    :type quest_timer: QuestTimer
+    :return: The message, ready to send or group-send.
+    :rtype: dict
+    """
+    return {
+        "type": "timer_sync",
+        "server_time": _ms(timezone.now()),
+        "activity": timer_clock(act_timer),
+        "quest": timer_clock(quest_timer),
+    }
+
+
+def _profile_ids(kind: str, owner_ids) -> Dict[int, int]:
+    # Activity timers belong to a profile; quest timers to a character
+    if kind == "activity":
+        return {owner_id: owner_id for owner_id in owner_ids}
+    from character.models import PlayerCharacterLink
+
+    return dict(
+        PlayerCharacterLink.objects.filter(
+            character_id__in=owner_ids, is_active=True
+        ).values_list("character_id", "profile_id")
+    )
+
+
+async def _group_send_all(channel_layer, messages: Dict[str, dict]):
+    for group, message in messages.items():
+        await channel_layer.group_send(group, message)
+
+
+def publish_timer_sync(kind: str, clocks: Dict[int, Optional[dict]]):
+    """
+    Send each player whose timer changed a `timer_sync` message with the timer's
+    new clock, once the current transaction commits.
+
+    :param kind: "activity" (owned by a profile) or "quest" (owned by a character).
+    :type kind: str
+    :param clocks: The new clock of each changed timer, by profile or character id.
+    :type clocks: dict
+    """
+    clocks = {owner_id: clock for owner_id, clock in clocks.items() if owner_id}
+    if not clocks:
+        return
+
+    def publish():
+        try:
+            channel_layer = get_channel_layer()
+            if channel_layer is None:
+                return
+            profile_ids = _profile_ids(kind, list(clocks))
+            server_time = _ms(timezone.now())
+            messages = {
+                f"profile_{profile_id}": {
+                    "type": "timer_sync",
+                    "server_time": server_time,
+                    kind: clocks[owner_id],
+                }
+                for owner_id, profile_id in profile_ids.items()
+            }
+            async_to_sync(_group_send_all)(channel_layer, messages)
+        except Exception as e:
+            logger.error(f"[TIMER SYNC] Could not publish {kind} timer syncs: {e}")
+
+    transaction.on_commit(publish)
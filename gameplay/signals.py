@@ -1,12 +1,14 @@
 from datetime import datetime, timedelta
 from django.contrib.auth.signals import user_logged_in
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import IntegrityError, OperationalError
-from django.db.models.signals import post_save
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.utils.timezone import now
 
-from .models import Activity, Quest, QuestResults, ServerMessage
+from .models import Activity, Quest, QuestRequirement, QuestResults, ServerMessage
+from .services.quest_availability import schedule_quest_availability
+from .services.quest_catalog import bump_catalog_version
 from .utils import send_group_message
 from character.models import Character
 from users.models import Profile
@@ -107,6 +109,27 @@ def create_quest_results(sender, instance, created, **kwargs):
             )
 
 
+@receiver(post_save, sender=Quest)
+@receiver(post_delete, sender=Quest)
+@receiver(post_save, sender=QuestRequirement)
+@receiver(post_delete, sender=QuestRequirement)
+@receiver(post_save, sender=QuestResults)
+@receiver(post_delete, sender=QuestResults)
+def invalidate_quest_catalog(sender, instance, **kwargs):
+    """Bumps the quest catalog version so cached catalog data is rebuilt."""
+    logger.debug(
+        f"[INVALIDATE QUEST CATALOG] {sender.__name__} {instance.pk} changed, bumping catalog version"
+    )
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=Quest)
+def schedule_quest_availability_update(sender, instance, **kwargs):
+    """Reschedules the quest availability task when a quest has a start or end date."""
+    if instance.start_date or instance.end_date:
+        transaction.on_commit(schedule_quest_availability)
+
+
 @receiver(post_save, sender=ServerMessage)
 def server_message_created(sender, instance, created, **kwargs):
     """Triggers consumer to run message send method when a new server message is created."""
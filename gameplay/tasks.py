@@ -1,20 +1,57 @@
 from celery import shared_task
-from django.utils import timezone
+from django.conf import settings
 
-from .models import Quest
+from .services.heartbeats import reap_idle_timers
+from .services.presence import sync_online_flags
+from .services.quest_availability import (
+    apply_quest_availability,
+    schedule_quest_availability,
+)
+from .services.quest_deadlines import fire_quest_deadline, sweep_quest_deadlines
+from .services.timer_segments import compact_timer_segments
+from .services.timer_state import flush_timer_states
 
 
 @shared_task
 def update_quest_availability():
-    now = timezone.now()
-    quests = Quest.objects.all()
-    for quest in quests:
-        if quest.start_date and quest.start_date <= now:
-            quest.is_active = True
-
-        if quest.end_date and quest.end_date < now:
-            quest.is_active = False
-
-        if quest.start_date or quest.end_date:
-            quest.save()
-    return "Successfully updated quest availability"
+    changed = apply_quest_availability()
+    schedule_quest_availability()
+    return f"Successfully updated availability of {changed} quest(s)"
+
+
+@shared_task
+def flush_live_timer_states():
+    flushed = flush_timer_states()
+    return f"Flushed {flushed} live timer state(s)"
+
+
+@shared_task
+def complete_quest_deadline(timer_id, deadline):
+    completed = fire_quest_deadline(timer_id, deadline)
+    return f"Quest timer {timer_id} deadline {'handled' if completed else 'skipped'}"
+
+
+@shared_task
+def sweep_overdue_quest_timers():
+    fired = sweep_quest_deadlines()
+    return f"Completed {fired} overdue quest timer(s)"
+
+
+@shared_task
+def compact_old_timer_segments():
+    compacted = compact_timer_segments()
+    return f"Compacted {compacted} timer segment(s)"
+
+
+@shared_task
+def pause_idle_timers():
+    act_paused, quest_paused = reap_idle_timers()
+    return f"Paused {act_paused} activity and {quest_paused} quest timer(s) without a heartbeat"
+
+
+@shared_task
+def sync_presence_flags():
+    if not settings.PRESENCE_SYNC_IS_ONLINE:
+        return "Presence sync to Profile.is_online is disabled"
+    flagged_online, flagged_offline = sync_online_flags()
+    return f"Flagged {flagged_online} profile(s) online and {flagged_offline} offline"
@@ -0,0 +1,71 @@
+# gameplay/tests/test_activity_completion.py
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from freezegun import freeze_time
+from unittest.mock import AsyncMock, patch
+import logging
+
+from gameplay.models import Activity, ServerMessage
+from users.models import Profile
+
+logging.getLogger("django").setLevel(logging.CRITICAL)
+
+
+class TestActivityCompletion(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="complete@example.com", password="testpassword123"
+        )
+        cls.profile = user.profile
+
+    def setUp(self):
+        self.timer = self.profile.activity_timer
+        with freeze_time("2025-01-01 12:00:00"):
+            self.timer.new_activity("Writing")
+            self.timer.start()
+
+    def complete(self, at="2025-01-01 12:02:30"):
+        with patch(
+            "gameplay.utils.send_group_message", new_callable=AsyncMock
+        ) as send, self.captureOnCommitCallbacks(execute=True):
+            with freeze_time(at):
+                self.timer.complete()
+        return send
+
+    def test_effects_are_persisted(self):
+        self.complete()
+
+        activity = Activity.objects.get(pk=self.timer.activity.pk)
+        self.assertEqual(activity.duration, 150)
+        self.assertEqual(activity.xp_gained, 150)
+        self.assertIsNotNone(activity.completed_at)
+
+        profile = Profile.objects.get(pk=self.profile.pk)
+        self.assertEqual(profile.total_time, 150)
+        self.assertEqual(profile.total_activities, 1)
+        self.assertEqual(profile.level, 1)
+        self.assertEqual(profile.xp, 150 - 100)
+        self.assertEqual(profile.xp_next_level, 200)
+        self.assertEqual((self.timer.profile.xp, self.timer.profile.level), (50, 1))
+
+    def test_notification_is_sent_on_commit(self):
+        send = self.complete()
+
+        message = ServerMessage.objects.get(group=self.profile.group_name)
+        self.assertEqual(message.message, "Activity submitted. You got 150 XP!")
+        send.assert_awaited_once_with(
+            self.profile.group_name, {"type": "send_pending_messages"}
+        )
+
+    def test_running_totals_are_added_in_the_database(self):
+        # A concurrent write to the totals must not be overwritten
+        Profile.objects.filter(pk=self.profile.pk).update(
+            total_time=1000, total_activities=4
+        )
+        self.complete()
+
+        profile = Profile.objects.get(pk=self.profile.pk)
+        self.assertEqual(profile.total_time, 1150)
+        self.assertEqual(profile.total_activities, 5)
@@ -0,0 +1,70 @@
+# gameplay/tests/test_benchmarks.py
+
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+from io import StringIO
+from unittest.mock import patch
+import json, logging, os, tempfile
+
+from character.models import Character
+from gameplay.benchmarks.suite import BENCHMARKS, compare_to_baseline
+from gameplay.benchmarks.world import build_world, delete_world
+from gameplay.models import Quest, QuestCompletion
+
+logging.getLogger("django").setLevel(logging.CRITICAL)
+
+
+@override_settings(
+    DEBUG=True,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+class TestBenchmarkSuite(TransactionTestCase):
+    def test_world_is_reproducible(self):
+        first = build_world(users=2, quests=10, completions_per_character=3, seed=7)
+        levels = [character.level for character in first.characters]
+        names = list(Quest.objects.order_by("id").values_list("levelMin", "levelMax"))
+        delete_world()
+        self.assertFalse(Character.objects.filter(name__startswith="bench").exists())
+
+        second = build_world(users=2, quests=10, completions_per_character=3, seed=7)
+        self.assertEqual([character.level for character in second.characters], levels)
+        self.assertEqual(
+            list(Quest.objects.order_by("id").values_list("levelMin", "levelMax")),
+            names,
+        )
+        self.assertEqual(QuestCompletion.objects.count(), 6)
+
+    # Timer starts queue their completion task; no broker runs under test
+    @patch("gameplay.tasks.complete_quest_deadline.apply_async")
+    def test_command_reports_every_benchmark(self, apply_async):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.json")
+            call_command(
+                "benchmark_gameplay",
+                users=2,
+                quests=20,
+                completions=5,
+                activities=3,
+                iterations=2,
+                json_path=path,
+                stdout=StringIO(),
+            )
+            with open(path) as f:
+                summaries = json.load(f)
+
+        self.assertEqual(len(summaries), len(BENCHMARKS))
+        for summary in summaries:
+            self.assertEqual(summary["runs"], 2)
+            if summary["name"] == "TimerConsumer ping":
+                # Pings no longer poll the quest timer
+                self.assertEqual(summary["max_queries"], 0)
+            else:
+                self.assertGreater(summary["max_queries"], 0, summary["name"])
+        self.assertFalse(Quest.objects.exists())
+
+    def test_compare_to_baseline(self):
+        baseline = [{"name": "a", "median_ms": 10, "mean_queries": 3}]
+        self.assertEqual(compare_to_baseline(baseline, baseline), [])
+        slower = [{"name": "a", "median_ms": 13, "mean_queries": 4}]
+        self.assertEqual(len(compare_to_baseline(slower, baseline)), 2)
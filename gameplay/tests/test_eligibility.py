@@ -0,0 +1,418 @@
+# gameplay/tests/test_eligibility.py
+
+from datetime import datetime, timezone as dt_timezone
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+from freezegun import freeze_time
+from unittest.mock import patch
+import logging, random
+
+from character.models import Character
+from gameplay.models import Quest, QuestCompletion, QuestRequirement, QuestTimer
+from gameplay.services.eligibility import eligible_quest_ids, eligible_quests
+from gameplay.services.eligibility_cache import cached_eligible_quest_ids
+from gameplay.services.frequency import next_boundary, window_start
+from gameplay.services.level_index import LevelIntervalIndex, get_level_index
+from gameplay.services.quest_catalog import bump_catalog_version
+from gameplay.services.prerequisites import (
+    PrerequisiteCycleError,
+    compile_prerequisite_graph,
+    find_cycle,
+    get_prerequisite_graph,
+)
+from gameplay.utils import check_individual_quest
+
+logging.getLogger("django").setLevel(logging.CRITICAL)
+
+
+class TestEligibilityEngine(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        user = User.objects.create_user(
+            email="engine@example.com", password="testpassword123"
+        )
+        cls.profile = user.profile
+        cls.char = Character.objects.create(name="Bob", level=3)
+
+        cls.open_quest = Quest.objects.create(name="Open", levelMax=10)
+        cls.done_once = Quest.objects.create(
+            name="Done once", levelMax=10, canRepeat=False
+        )
+        cls.never_done = Quest.objects.create(
+            name="Never done", levelMax=10, canRepeat=False
+        )
+        cls.too_high = Quest.objects.create(name="Too high", levelMin=5, levelMax=10)
+        cls.too_low = Quest.objects.create(name="Too low", levelMax=2)
+        cls.inactive = Quest.objects.create(
+            name="Inactive", levelMax=10, is_active=False
+        )
+        cls.premium = Quest.objects.create(name="Premium", levelMax=10, is_premium=True)
+        cls.needs_two = Quest.objects.create(name="Needs two", levelMax=10)
+        cls.needs_one = Quest.objects.create(name="Needs one", levelMax=10)
+
+        QuestRequirement.objects.create(
+            quest=cls.needs_two, prerequisite=cls.open_quest, times_required=2
+        )
+        QuestRequirement.objects.create(
+            quest=cls.needs_one, prerequisite=cls.done_once, times_required=1
+        )
+        QuestCompletion.objects.create(
+            character=cls.char,
+            quest=cls.done_once,
+            times_completed=1,
+            last_completed=now(),
+        )
+        QuestCompletion.objects.create(
+            character=cls.char,
+            quest=cls.open_quest,
+            times_completed=1,
+            last_completed=now(),
+        )
+
+    def setUp(self):
+        # Drop any graph compiled inside a previous (rolled back) test
+        bump_catalog_version()
+
+    def legacy_eligible(self):
+        quests_done = {
+            qc.quest: qc.times_completed
+            for qc in QuestCompletion.objects.filter(character=self.char)
+        }
+        return [
+            quest
+            for quest in Quest.objects.order_by("id")
+            if check_individual_quest(quest, self.char, self.profile, quests_done)
+        ]
+
+    def test_matches_legacy_checks(self):
+        self.assertEqual(
+            eligible_quests(self.char, self.profile), self.legacy_eligible()
+        )
+        self.assertEqual(
+            eligible_quests(self.char, self.profile),
+            [self.open_quest, self.never_done, self.premium, self.needs_one],
+        )
+
+    def test_matches_legacy_checks_for_premium_profile(self):
+        self.profile.is_premium = True
+        self.assertEqual(
+            eligible_quests(self.char, self.profile), self.legacy_eligible()
+        )
+        self.assertNotIn(self.premium, eligible_quests(self.char, self.profile))
+
+    def test_ids_match_instances(self):
+        self.assertEqual(
+            eligible_quest_ids(self.char, self.profile),
+            [quest.id for quest in eligible_quests(self.char, self.profile)],
+        )
+
+    def test_keyset_pages_match_full_list(self):
+        expected = eligible_quest_ids(self.char, self.profile)
+        pages, after_id = [], None
+        while True:
+            page = eligible_quest_ids(self.char, self.profile, after_id, limit=1)
+            if not page:
+                break
+            pages.extend(page)
+            after_id = page[-1]
+        self.assertEqual(pages, expected)
+        self.assertEqual(
+            eligible_quest_ids(self.char, self.profile, self.open_quest.id, limit=2),
+            expected[1:3],
+        )
+
+    def test_page_stops_early(self):
+        graph = get_prerequisite_graph()
+        checked = []
+        requirements_met = graph.requirements_met
+
+        def spy(quest_id, completed):
+            checked.append(quest_id)
+            return requirements_met(quest_id, completed)
+
+        graph.requirements_met = spy
+        self.assertEqual(
+            eligible_quest_ids(self.char, self.profile, limit=1), [self.open_quest.id]
+        )
+        self.assertEqual(checked, [self.open_quest.id])
+
+    def test_constant_query_count(self):
+        for i in range(20):
+            Quest.objects.create(name=f"Filler {i}", levelMax=10)
+        get_prerequisite_graph()
+        get_level_index()
+        with self.assertNumQueries(2):
+            quests = eligible_quests(self.char, self.profile)
+            [quest.results for quest in quests]
+
+    def test_graph_recompiled_when_requirements_change(self):
+        self.assertIn(self.never_done.id, eligible_quest_ids(self.char, self.profile))
+        QuestRequirement.objects.create(
+            quest=self.never_done, prerequisite=self.too_high, times_required=1
+        )
+        self.assertNotIn(
+            self.never_done.id, eligible_quest_ids(self.char, self.profile)
+        )
+
+
+class TestLevelIntervalIndex(TestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(3)
+        rows = []
+        for quest_id in range(1, 200):
+            low = rng.randint(0, 50)
+            rows.append(
+                (quest_id, low, low + rng.randint(-2, 30), rng.random() < 0.5, False)
+            )
+        index = LevelIntervalIndex(rows)
+
+        for level in range(-1, 90):
+            expected = [
+                quest_id for quest_id, low, high, _, _ in rows if low <= level <= high
+            ]
+            self.assertEqual(
+                [quest.id for quest in index.quests_for_level(level)], expected
+            )
+
+    def test_only_active_quests_indexed(self):
+        active = Quest.objects.create(name="Active", levelMin=1, levelMax=3)
+        Quest.objects.create(name="Inactive", levelMin=1, levelMax=3, is_active=False)
+        bump_catalog_version()
+        self.assertEqual(
+            [quest.id for quest in get_level_index().quests_for_level(2)], [active.id]
+        )
+        self.assertEqual(get_level_index().quests_for_level(4), ())
+
+
+class TestPrerequisiteGraph(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = Quest.objects.create(name="First")
+        cls.second = Quest.objects.create(name="Second")
+        cls.third = Quest.objects.create(name="Third")
+        QuestRequirement.objects.create(
+            quest=cls.second, prerequisite=cls.first, times_required=2
+        )
+        QuestRequirement.objects.create(
+            quest=cls.third, prerequisite=cls.second, times_required=1
+        )
+
+    def setUp(self):
+        bump_catalog_version()
+
+    def test_requirements_met(self):
+        graph = compile_prerequisite_graph()
+        self.assertEqual(graph.requirements_for(self.second.id), ((self.first.id, 2),))
+        self.assertEqual(graph.requirements_for(self.first.id), ())
+        self.assertFalse(graph.requirements_met(self.second.id, {self.first.id: 1}))
+        self.assertTrue(graph.requirements_met(self.second.id, {self.first.id: 2}))
+
+    def test_find_cycle(self):
+        self.assertIsNone(find_cycle({1: [(2, 1)], 2: [(3, 1)]}))
+        self.assertEqual(
+            find_cycle({1: [(2, 1)], 2: [(3, 1)], 3: [(1, 1)]}), [1, 2, 3, 1]
+        )
+        self.assertEqual(find_cycle({4: [(4, 1)]}), [4, 4])
+
+    def test_cycle_rejected(self):
+        requirement = QuestRequirement(
+            quest=self.first, prerequisite=self.third, times_required=1
+        )
+        with self.assertRaises(ValidationError):
+            requirement.clean()
+
+        requirement.save()
+        with self.assertRaises(PrerequisiteCycleError):
+            compile_prerequisite_graph(strict=True)
+        # Non-strict compilation logs the cycle instead of failing
+        self.assertEqual(
+            compile_prerequisite_graph(strict=False).requirements_for(self.first.id),
+            ((self.third.id, 1),),
+        )
+
+    def test_unreadable_catalog_version_keeps_the_graph(self):
+        graph = get_prerequisite_graph()
+        down = ConnectionError("Redis down")
+        with patch.object(cache, "get", side_effect=down), patch.object(
+            cache, "incr", side_effect=down
+        ):
+            self.assertIs(get_prerequisite_graph(), graph)
+            # Catalog changes still commit when the shared version cannot be bumped
+            with self.captureOnCommitCallbacks(execute=True):
+                bump_catalog_version()
+
+
+class TestFrequencyWindows(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        user = User.objects.create_user(
+            email="frequency@example.com", password="testpassword123"
+        )
+        cls.profile = user.profile
+        cls.char = Character.objects.create(name="Bob", level=1)
+        cls.daily = Quest.objects.create(
+            name="Daily", levelMax=10, frequency=Quest.Frequency.DAILY
+        )
+        cls.weekly = Quest.objects.create(
+            name="Weekly", levelMax=10, frequency=Quest.Frequency.WEEKLY
+        )
+        cls.monthly = Quest.objects.create(
+            name="Monthly", levelMax=10, frequency=Quest.Frequency.MONTHLY
+        )
+        # Monday 3 March 2025, late evening
+        for quest in (cls.daily, cls.weekly, cls.monthly):
+            QuestCompletion.objects.create(
+                character=cls.char,
+                quest=quest,
+                last_completed=datetime(2025, 3, 3, 23, 0, tzinfo=dt_timezone.utc),
+            )
+
+    def setUp(self):
+        bump_catalog_version()
+
+    def assertBlocked(self, moment, blocked):
+        with freeze_time(moment):
+            ids = eligible_quest_ids(self.char, self.profile)
+            for quest in (self.daily, self.weekly, self.monthly):
+                self.assertEqual(quest.id not in ids, quest in blocked, quest)
+                self.assertEqual(
+                    quest.frequency_eligible(self.char), quest not in blocked, quest
+                )
+
+    def test_same_day(self):
+        self.assertBlocked("2025-03-03 23:30", {self.daily, self.weekly, self.monthly})
+
+    def test_next_day(self):
+        self.assertBlocked("2025-03-04 00:30", {self.weekly, self.monthly})
+
+    def test_next_week(self):
+        self.assertBlocked("2025-03-09 23:59", {self.weekly, self.monthly})
+        self.assertBlocked("2025-03-10 00:00", {self.monthly})
+
+    def test_next_month(self):
+        self.assertBlocked("2025-04-01 00:00", set())
+
+    def test_repeatable_quests_wait_for_their_window(self):
+        # Frequency now gates eligibility: a repeatable daily quest done today is
+        # hidden until tomorrow, while a quest without a frequency stays open
+        anytime = Quest.objects.create(name="Anytime", levelMax=10)
+        QuestCompletion.objects.create(
+            character=self.char,
+            quest=anytime,
+            last_completed=datetime(2025, 3, 3, 23, 0, tzinfo=dt_timezone.utc),
+        )
+        self.assertTrue(self.daily.canRepeat)
+        quests_done = {anytime: 1, self.daily: 1}
+        with freeze_time("2025-03-03 23:30"):
+            self.assertNotIn(self.daily.id, eligible_quest_ids(self.char, self.profile))
+            self.assertIn(anytime.id, eligible_quest_ids(self.char, self.profile))
+            self.assertFalse(
+                check_individual_quest(self.daily, self.char, self.profile, quests_done)
+            )
+            self.assertTrue(
+                check_individual_quest(anytime, self.char, self.profile, quests_done)
+            )
+
+    def test_only_current_character_counts(self):
+        other = Character.objects.create(name="Other", level=1)
+        with freeze_time("2025-03-03 23:30"):
+            self.assertEqual(
+                eligible_quest_ids(other, self.profile),
+                [self.daily.id, self.weekly.id, self.monthly.id],
+            )
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class TestEligibleQuestCache(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        user = User.objects.create_user(
+            email="cache@example.com", password="testpassword123"
+        )
+        cls.profile = user.profile
+        cls.char = Character.objects.create(name="Bob", level=1)
+        cls.first = Quest.objects.create(name="First", levelMax=10)
+        cls.once = Quest.objects.create(name="Once", levelMax=10, canRepeat=False)
+        cls.later = Quest.objects.create(name="Later", levelMin=2, levelMax=10)
+
+    def setUp(self):
+        cache.clear()
+        bump_catalog_version()
+
+    def test_second_call_is_cached(self):
+        ids = cached_eligible_quest_ids(self.char, self.profile)
+        self.assertEqual(ids, [self.first.id, self.once.id])
+        with self.assertNumQueries(0):
+            self.assertEqual(cached_eligible_quest_ids(self.char, self.profile), ids)
+
+    def test_expires_at_next_daily_boundary(self):
+        with freeze_time("2025-03-05 23:59:30"):
+            cached_eligible_quest_ids(self.char, self.profile)
+        with freeze_time("2025-03-06 00:00:01"):
+            with self.assertNumQueries(1):
+                cached_eligible_quest_ids(self.char, self.profile)
+
+    def test_complete_quest_invalidates(self):
+        cached_eligible_quest_ids(self.char, self.profile)
+        QuestTimer.objects.create(character=self.char).change_quest(self.once, 10)
+        self.char.complete_quest(5)
+        self.assertEqual(
+            cached_eligible_quest_ids(self.char, self.profile), [self.first.id]
+        )
+
+    def test_level_up_invalidates(self):
+        cached_eligible_quest_ids(self.char, self.profile)
+        self.char.add_xp(self.char.get_xp_for_next_level())
+        self.assertEqual(self.char.level, 2)
+        self.assertIn(self.later.id, cached_eligible_quest_ids(self.char, self.profile))
+
+    def test_catalog_change_invalidates(self):
+        cached_eligible_quest_ids(self.char, self.profile)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first.levelMin = 5
+            self.first.save()
+        self.assertEqual(
+            cached_eligible_quest_ids(self.char, self.profile), [self.once.id]
+        )
+
+
+class TestFrequencyBoundaries(TestCase):
+    def test_window_start(self):
+        moment = datetime(2025, 12, 17, 15, 30, tzinfo=dt_timezone.utc)  # Wednesday
+        self.assertEqual(
+            window_start(Quest.Frequency.DAILY, moment),
+            datetime(2025, 12, 17, tzinfo=dt_timezone.utc),
+        )
+        self.assertEqual(
+            window_start(Quest.Frequency.WEEKLY, moment),
+            datetime(2025, 12, 15, tzinfo=dt_timezone.utc),
+        )
+        self.assertEqual(
+            window_start(Quest.Frequency.MONTHLY, moment),
+            datetime(2025, 12, 1, tzinfo=dt_timezone.utc),
+        )
+
+    def test_next_boundary(self):
+        moment = datetime(2025, 12, 17, 15, 30, tzinfo=dt_timezone.utc)  # Wednesday
+        self.assertEqual(
+            next_boundary(Quest.Frequency.DAILY, moment),
+            datetime(2025, 12, 18, tzinfo=dt_timezone.utc),
+        )
+        self.assertEqual(
+            next_boundary(Quest.Frequency.WEEKLY, moment),
+            datetime(2025, 12, 22, tzinfo=dt_timezone.utc),
+        )
+        self.assertEqual(
+            next_boundary(Quest.Frequency.MONTHLY, moment),
+            datetime(2026, 1, 1, tzinfo=dt_timezone.utc),
+        )
+        with self.assertRaises(ValueError):
+            next_boundary(Quest.Frequency.NONE, moment)
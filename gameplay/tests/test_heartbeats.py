@@ -0,0 +1,211 @@
+# gameplay/tests/test_heartbeats.py
+
+from asgiref.sync import async_to_sync
+from datetime import datetime, timezone as dt_timezone
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from freezegun import freeze_time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+import logging
+
+from character.models import Character, PlayerCharacterLink
+from gameplay.consumers import TimerConsumer
+from gameplay.models import ActivityTimer, Quest, QuestTimer
+from gameplay.services.heartbeats import (
+    arecord_heartbeat,
+    last_heartbeats,
+    reap_idle_timers,
+    record_heartbeat,
+)
+
+logging.getLogger("django").setLevel(logging.CRITICAL)
+
+NOON = datetime(2025, 1, 1, 12, tzinfo=dt_timezone.utc).timestamp()
+
+
+def no_thread_hops():
+    """Fail if anything is run through `sync_to_async`."""
+    return patch(
+        "asgiref.sync.SyncToAsync.__init__",
+        side_effect=AssertionError("sync_to_async was called"),
+    )
+
+
+@override_settings(TIMER_HEARTBEAT_TIMEOUT=120)
+@freeze_time("2025-01-01 12:00:00")
+class TestAsyncHeartbeat(SimpleTestCase):
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django_redis.cache.RedisCache",
+                "LOCATION": "redis://127.0.0.1:6379/0",
+                "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+            }
+        },
+        HEARTBEAT_REDIS={
+            "URL": "redis://127.0.0.1:6379/0",
+            "OPTIONS": {"socket_timeout": 5},
+        },
+    )
+    def test_redis_heartbeat_is_written_on_the_event_loop(self):
+        client = MagicMock(set=AsyncMock())
+        with patch(
+            "redis.asyncio.from_url", return_value=client
+        ) as from_url, no_thread_hops():
+            async_to_sync(arecord_heartbeat)(7)
+
+        from_url.assert_called_once_with("redis://127.0.0.1:6379/0", socket_timeout=5)
+
+        key, value = client.set.await_args.args
+        self.assertEqual(key, cache.make_key("heartbeat:7"))
+        self.assertEqual(cache.client.decode(value), NOON)
+        self.assertEqual(client.set.await_args.kwargs, {"ex": 240})
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_ping_does_not_hop_threads(self):
+        consumer = TimerConsumer()
+        consumer.profile = SimpleNamespace(id=7)
+        consumer._send_frame = AsyncMock()
+        with no_thread_hops():
+            async_to_sync(consumer.receive_json)({"type": "ping"})
+
+        self.assertEqual(consumer._send_frame.await_args.args[0]["type"], "pong")
+        self.assertEqual(last_heartbeats([7]), {7: NOON})
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    TIMER_HEARTBEAT_TIMEOUT=120,
+)
+@patch("gameplay.tasks.complete_quest_deadline.apply_async")
+class TestIdleTimerReaper(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.profiles, cls.characters = [], []
+        quest = Quest.objects.create(name="Vigil", levelMax=10)
+        for i in range(2):
+            user = get_user_model().objects.create_user(
+                email=f"heartbeat{i}@example.com", password="testpassword123"
+            )
+            character = Character.objects.create(name=f"Sentry {i}")
+            PlayerCharacterLink.objects.create(
+                profile=user.profile, character=character
+            )
+            QuestTimer.objects.create(character=character).change_quest(
+                quest, duration=3600
+            )
+            cls.profiles.append(user.profile)
+            cls.characters.append(character)
+
+    def setUp(self):
+        cache.clear()
+        with freeze_time("2025-01-01 12:00:00"):
+            for profile, character in zip(self.profiles, self.characters):
+                profile.activity_timer.new_activity("Watching")
+                profile.activity_timer.start()
+                character.quest_timer.start()
+                record_heartbeat(profile.id)
+
+    def statuses(self, profile, character):
+        return (
+            ActivityTimer.objects.get(profile=profile).status,
+            QuestTimer.objects.get(character=character).status,
+        )
+
+    def test_recent_heartbeats_keep_timers_running(self, apply_async):
+        with freeze_time("2025-01-01 12:01:30"):
+            self.assertEqual(reap_idle_timers(), (0, 0))
+
+    def test_idle_profiles_are_paused(self, apply_async):
+        with freeze_time("2025-01-01 12:02:00"):
+            record_heartbeat(self.profiles[0].id)
+        with freeze_time("2025-01-01 12:03:00"):
+            self.assertEqual(reap_idle_timers(), (1, 1))
+
+        self.assertEqual(
+            self.statuses(self.profiles[0], self.characters[0]), ("active", "active")
+        )
+        self.assertEqual(
+            self.statuses(self.profiles[1], self.characters[1]), ("paused", "paused")
+        )
+        act_timer = ActivityTimer.objects.get(profile=self.profiles[1])
+        self.assertEqual(act_timer.elapsed_time, 180)
+
+    def test_expired_heartbeat_counts_as_idle(self, apply_async):
+        cache.clear()
+        with freeze_time("2025-01-01 12:05:00"):
+            self.assertEqual(reap_idle_timers(), (2, 2))
+
+    def test_unreadable_heartbeats_pause_nothing(self, apply_async):
+        with freeze_time("2025-01-01 12:05:00"), patch.object(
+            cache, "get_many", side_effect=ConnectionError("Redis down")
+        ):
+            self.assertEqual(reap_idle_timers(), (0, 0))
+        for profile, character in zip(self.profiles, self.characters):
+            self.assertEqual(self.statuses(profile, character), ("active", "active"))
+
+    def test_reaped_profiles_are_sent_their_paused_clocks(self, apply_async):
+        record_heartbeat(self.profiles[0].id)
+        channel_layer = MagicMock(group_send=AsyncMock())
+        with patch(
+            "gameplay.services.timer_sync.get_channel_layer",
+            return_value=channel_layer,
+        ), self.captureOnCommitCallbacks(execute=True):
+            with freeze_time("2025-01-01 12:03:00"):
+                reap_idle_timers()
+
+        synced = {}
+        for group, message in (
+            c.args for c in channel_layer.group_send.await_args_list
+        ):
+            self.assertEqual(message["type"], "timer_sync")
+            for kind in ("activity", "quest"):
+                if kind in message:
+                    synced.setdefault(group, {})[kind] = message[kind]["status"]
+        self.assertEqual(
+            synced,
+            {
+                f"profile_{self.profiles[1].id}": {
+                    "activity": "paused",
+                    "quest": "paused",
+                }
+            },
+        )
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "timer_state": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "timer_state",
+        },
+    },
+    TIMER_STATE_BACKEND="cache",
+    TIMER_STATE_CACHE="timer_state",
+)
+class TestIdleTimerReaperWithLiveState(TestIdleTimerReaper):
+    def setUp(self):
+        caches["timer_state"].clear()
+        super().setUp()
+
+    @patch("gameplay.tasks.complete_quest_deadline.apply_async")
+    def test_only_idle_profiles_are_written_back(self, apply_async):
+        with freeze_time("2025-01-01 12:02:00"):
+            record_heartbeat(self.profiles[0].id)
+        with freeze_time("2025-01-01 12:03:00"):
+            self.assertEqual(reap_idle_timers(), (1, 1))
+
+        # The live profile's running timers stay in the store alone
+        rows = ActivityTimer.objects.filter(profile__in=self.profiles)
+        self.assertEqual(
+            dict(rows.values_list("profile_id", "status")),
+            {self.profiles[0].id: "waiting", self.profiles[1].id: "paused"},
+        )
+        self.assertEqual(
+            self.statuses(self.profiles[0], self.characters[0]), ("active", "active")
+        )
@@ -2,10 +2,13 @@
 
 from datetime import datetime
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now, timedelta
 from freezegun import freeze_time
 from unittest import skip
+from unittest.mock import patch
 import logging
 
 from gameplay.models import (
@@ -15,6 +18,7 @@ from gameplay.models import (
     Skill,
     Project,
     QuestCompletion,
+    QuestCompletionLog,
     QuestResults,
     Buff,
     AppliedBuff,
@@ -378,6 +382,49 @@ class TestQuestCompletionModel(TestCase):
         # print(char.quest_completions)
 
 
+class TestQuestCompletionLedger(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.char = Character.objects.create(name="Bob")
+        cls.quest = Quest.objects.create(name="Test Quest", levelMax=10)
+
+    def test_record_appends_and_counts(self):
+        with freeze_time("2025-01-01 12:00:00"):
+            QuestCompletion.record(self.char, self.quest, duration=300, xp_gained=50)
+        with freeze_time("2025-01-02 12:00:00"):
+            entry = QuestCompletion.record(self.char, self.quest, duration=60)
+
+        counter = QuestCompletion.objects.get(character=self.char, quest=self.quest)
+        self.assertEqual(counter.times_completed, 2)
+        self.assertEqual(counter.last_completed, entry.completed_at)
+        self.assertEqual(
+            list(
+                QuestCompletionLog.objects.order_by("completed_at").values_list(
+                    "duration", "xp_gained"
+                )
+            ),
+            [(300, 50), (60, 0)],
+        )
+
+    def test_repeat_completion_does_not_read_counter(self):
+        QuestCompletion.record(self.char, self.quest)
+        with CaptureQueriesContext(connection) as context:
+            QuestCompletion.record(self.char, self.quest)
+        statements = [query["sql"].split()[0] for query in context.captured_queries]
+        self.assertEqual(
+            [sql for sql in statements if "SAVEPOINT" not in sql and sql != "RELEASE"],
+            ["INSERT", "UPDATE"],
+        )
+
+    def test_complete_quest_writes_ledger(self):
+        timer = QuestTimer.objects.create(character=self.char)
+        timer.change_quest(self.quest, 300)
+        self.char.complete_quest(25)
+        entry = QuestCompletionLog.objects.get(character=self.char)
+        self.assertEqual(entry.quest, self.quest)
+        self.assertEqual(entry.xp_gained, 25)
+
+
 class BaseTimerTest(TestCase):
     def assertTimerReset(self, timer):
         self.assertIsNone(timer.start_time)
@@ -473,6 +520,121 @@ class TestQuestTimer(TestCase):
             self.assertTrue(self.timer.time_finished())
 
 
+@patch("gameplay.tasks.complete_quest_deadline.apply_async")
+class TestTimerDirtyFields(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.character = Character.objects.create(name="Tracker")
+        cls.quest = Quest.objects.create(name="Track", levelMax=10)
+        cls.profile = (
+            get_user_model()
+            .objects.create_user(email="dirty@example.com", password="test")
+            .profile
+        )
+
+    def setUp(self):
+        self.timer = QuestTimer.objects.create(character=self.character)
+
+    def test_dirty_fields(self, apply_async):
+        timer = QuestTimer.objects.get(pk=self.timer.pk)
+        self.assertEqual(timer.dirty_fields(), [])
+        timer.duration = 10
+        timer.status = "waiting"
+        self.assertEqual(sorted(timer.dirty_fields()), ["duration", "status"])
+        self.assertTrue(timer.save_dirty())
+        self.assertFalse(timer.save_dirty())
+
+    def test_one_write_per_transition(self, apply_async):
+        self.timer.change_quest(self.quest, duration=300)
+        self.timer.start()
+        writes = self.timer.write_count
+
+        for transition in (
+            lambda: self.timer.change_quest(self.quest, duration=60),
+            self.timer.start,
+            self.timer.pause,
+            self.timer.reset,
+        ):
+            with CaptureQueriesContext(connection) as context:
+                transition()
+            updates = [q["sql"] for q in context if q["sql"].startswith("UPDATE")]
+            self.assertEqual(self.timer.write_count, writes + 1)
+            self.assertEqual(len(updates), 1)
+            writes = self.timer.write_count
+
+        # Repeating a transition writes nothing
+        self.timer.reset()
+        self.assertEqual(self.timer.write_count, writes)
+
+    def test_only_changed_columns_written(self, apply_async):
+        self.timer.change_quest(self.quest, duration=300)
+        with CaptureQueriesContext(connection) as context:
+            self.timer.start()
+        update = next(q["sql"] for q in context if q["sql"].startswith("UPDATE"))
+        self.assertIn('"status"', update)
+        self.assertNotIn('"quest_id"', update)
+        self.assertNotIn('"duration"', update)
+
+    def test_new_activity_writes_once(self, apply_async):
+        timer = self.profile.activity_timer
+        writes = timer.write_count
+        timer.new_activity("Drawing")
+        self.assertEqual(timer.write_count, writes + 1)
+        timer.refresh_from_db()
+        self.assertEqual(timer.status, "waiting")
+        self.assertEqual(timer.activity.name, "Drawing")
+
+
+class TestTimerBulkPause(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.profiles = [
+            get_user_model()
+            .objects.create_user(email=f"pause{i}@example.com", password="test")
+            .profile
+            for i in range(3)
+        ]
+        cls.character = Character.objects.create(name="Pauser")
+        cls.quest = Quest.objects.create(name="Pause Quest", levelMax=10)
+
+    @freeze_time("2025-01-01 12:00:00")
+    def test_bulk_pause_folds_elapsed_time(self):
+        running = []
+        for profile in self.profiles[:2]:
+            timer = profile.activity_timer
+            timer.new_activity("Writing")
+            timer.elapsed_time = 30
+            timer.save(update_fields=["elapsed_time"])
+            timer.start()
+            running.append(timer)
+        idle = self.profiles[2].activity_timer
+        quest_timer = QuestTimer.objects.create(character=self.character)
+        quest_timer.change_quest(self.quest, duration=300)
+        quest_timer.start()
+
+        with freeze_time("2025-01-01 12:01:30"):
+            with CaptureQueriesContext(connection) as context:
+                paused = ActivityTimer.objects.bulk_pause(chunk_size=1)
+            # One select, then an update per chunk for timers and activities
+            writes = [query for query in context if query["sql"].startswith("UPDATE")]
+            self.assertEqual(paused, 2)
+            self.assertEqual(len(writes), 4)
+            self.assertEqual(QuestTimer.objects.bulk_pause(), 1)
+
+        for timer in running:
+            timer.refresh_from_db()
+            self.assertEqual(timer.status, "paused")
+            self.assertIsNone(timer.start_time)
+            self.assertEqual(timer.elapsed_time, 120)
+            timer.activity.refresh_from_db()
+            self.assertEqual(timer.activity.duration, 120)
+        idle.refresh_from_db()
+        self.assertEqual(idle.status, "empty")
+        quest_timer.refresh_from_db()
+        self.assertEqual((quest_timer.status, quest_timer.elapsed_time), ("paused", 90))
+        self.assertEqual(ActivityTimer.objects.bulk_pause(), 0)
+
+
 class TestBuffModel(TestCase):
     @skip("Skipping Buff model tests as they are not fully implemented yet")
     def test_buff_create(self):
@@ -0,0 +1,76 @@
+# gameplay/tests/test_presence.py
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from freezegun import freeze_time
+import logging
+
+from gameplay.services.presence import (
+    is_online,
+    online_count,
+    online_profile_ids,
+    sync_online_flags,
+)
+from users.models import Profile
+
+logging.getLogger("django").setLevel(logging.CRITICAL)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    TIMER_HEARTBEAT_TIMEOUT=120,
+)
+class TestPresence(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.profiles = [
+            get_user_model()
+            .objects.create_user(
+                email=f"presence{i}@example.com", password="testpassword123"
+            )
+            .profile
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_connect_and_disconnect(self):
+        first, second, _ = self.profiles
+        first.set_online()
+        second.set_online()
+        self.assertTrue(is_online(first.id))
+        self.assertEqual(online_profile_ids(), [first.id, second.id])
+
+        first.set_offline()
+        self.assertFalse(is_online(first.id))
+        self.assertEqual(online_count(), 1)
+        self.assertEqual(list(Profile.get_online_profiles()), [second])
+        # Presence is not written to the database
+        self.assertFalse(Profile.objects.filter(is_online=True).exists())
+
+    def test_missed_heartbeats_expire_presence(self):
+        first, second, _ = self.profiles
+        with freeze_time("2025-01-01 12:00:00"):
+            first.set_online()
+            second.set_online()
+        with freeze_time("2025-01-01 12:01:30"):
+            # Pings refresh the heartbeat; no disconnect ever arrives for the other
+            first.set_online()
+        with freeze_time("2025-01-01 12:02:30"):
+            self.assertEqual(online_profile_ids(), [first.id])
+            self.assertFalse(is_online(second.id))
+        self.assertEqual(cache.get("presence:online"), {first.id})
+
+    def test_sync_online_flags(self):
+        first, second, third = self.profiles
+        Profile.objects.filter(pk__in=[second.id, third.id]).update(is_online=True)
+        first.set_online()
+        second.set_online()
+
+        self.assertEqual(sync_online_flags(), (1, 1))
+        self.assertEqual(
+            set(Profile.objects.filter(is_online=True).values_list("id", flat=True)),
+            {first.id, second.id},
+        )
@@ -0,0 +1,85 @@
+# gameplay/tests/test_quest_availability.py
+
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from unittest.mock import patch
+import logging
+
+from gameplay.models import Quest
+from gameplay.services import quest_catalog
+from gameplay.services.quest_availability import (
+    apply_quest_availability,
+    next_availability_boundary,
+    schedule_quest_availability,
+)
+
+logging.getLogger("django").setLevel(logging.CRITICAL)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class TestQuestAvailability(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.now = timezone.now()
+        hour = timedelta(hours=1)
+        cls.started = Quest.objects.create(
+            name="Started", is_active=False, start_date=cls.now - hour
+        )
+        cls.ended = Quest.objects.create(
+            name="Ended", start_date=cls.now - 2 * hour, end_date=cls.now - hour
+        )
+        cls.upcoming = Quest.objects.create(
+            name="Upcoming", is_active=False, start_date=cls.now + hour
+        )
+        cls.running = Quest.objects.create(
+            name="Running", start_date=cls.now - hour, end_date=cls.now + 2 * hour
+        )
+        cls.undated = Quest.objects.create(name="Undated", is_active=False)
+
+    def setUp(self):
+        cache.clear()
+
+    def active(self):
+        return set(Quest.objects.filter(is_active=True))
+
+    def test_flips_passed_boundaries(self):
+        version = quest_catalog.get_catalog_token()
+        with self.assertNumQueries(2):
+            self.assertEqual(apply_quest_availability(self.now), 2)
+        self.assertEqual(self.active(), {self.started, self.running})
+        self.assertNotEqual(quest_catalog.get_catalog_token(), version)
+
+    def test_no_changes_keeps_catalog_version(self):
+        apply_quest_availability(self.now)
+        version = quest_catalog.get_catalog_token()
+        self.assertEqual(apply_quest_availability(self.now), 0)
+        self.assertEqual(quest_catalog.get_catalog_token(), version)
+
+    def test_next_boundary(self):
+        self.assertEqual(next_availability_boundary(self.now), self.upcoming.start_date)
+        self.assertEqual(
+            next_availability_boundary(self.upcoming.start_date),
+            self.running.end_date,
+        )
+        self.assertIsNone(next_availability_boundary(self.running.end_date))
+
+    @patch("gameplay.tasks.update_quest_availability.apply_async")
+    def test_schedules_next_boundary_once(self, apply_async):
+        self.assertEqual(
+            schedule_quest_availability(self.now), self.upcoming.start_date
+        )
+        apply_async.assert_called_once_with(eta=self.upcoming.start_date)
+
+        # Already scheduled at the same boundary
+        self.assertIsNone(schedule_quest_availability(self.now))
+        self.assertEqual(apply_async.call_count, 1)
+
+        # An earlier boundary is scheduled as well
+        sooner = self.now + timedelta(minutes=10)
+        Quest.objects.filter(pk=self.undated.pk).update(start_date=sooner)
+        self.assertEqual(schedule_quest_availability(self.now), sooner)
+        self.assertEqual(apply_async.call_count, 2)
@@ -0,0 +1,126 @@
+# gameplay/tests/test_quest_deadlines.py
+
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+from unittest.mock import AsyncMock, patch
+import logging
+
+from character.models import Character, PlayerCharacterLink
+from gameplay.models import Quest, QuestTimer
+from gameplay.services.quest_deadlines import (
+    fire_quest_deadline,
+    sweep_quest_deadlines,
+)
+
+logging.getLogger("django").setLevel(logging.CRITICAL)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+@patch("gameplay.tasks.complete_quest_deadline.apply_async")
+class TestQuestDeadlines(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="deadline@example.com", password="testpassword123"
+        )
+        cls.character = Character.objects.create(name="Sprinter")
+        PlayerCharacterLink.objects.create(
+            profile=user.profile, character=cls.character
+        )
+        cls.quest = Quest.objects.create(name="Sprint", levelMax=10)
+
+    def setUp(self):
+        cache.clear()
+        self.timer = QuestTimer.objects.create(character=self.character)
+        self.timer.change_quest(self.quest, duration=60)
+
+    def start(self, apply_async):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.timer.start()
+        kwargs = apply_async.call_args.kwargs
+        return kwargs["args"], kwargs["eta"]
+
+    @freeze_time("2025-01-01 12:00:00")
+    def test_start_schedules_deadline(self, apply_async):
+        (timer_id, deadline), eta = self.start(apply_async)
+        self.assertEqual(timer_id, self.timer.id)
+        self.assertEqual(eta, self.timer.start_time + timedelta(seconds=60))
+        self.assertEqual(deadline, eta.timestamp())
+
+        # Starting a running timer does not queue another task
+        self.timer.start()
+        self.assertEqual(apply_async.call_count, 1)
+
+    @freeze_time("2025-01-01 12:00:00")
+    def test_fires_exactly_once(self, apply_async):
+        (timer_id, deadline), eta = self.start(apply_async)
+        with freeze_time("2025-01-01 12:00:30"):
+            self.assertFalse(fire_quest_deadline(timer_id, deadline))
+
+        with freeze_time("2025-01-01 12:01:00"):
+            self.assertTrue(fire_quest_deadline(timer_id, deadline))
+            self.assertFalse(fire_quest_deadline(timer_id, deadline))
+        self.timer.refresh_from_db()
+        self.assertEqual(self.timer.status, "paused")
+
+    @freeze_time("2025-01-01 12:00:00")
+    def test_pause_cancels_deadline(self, apply_async):
+        (timer_id, stale), eta = self.start(apply_async)
+        with freeze_time("2025-01-01 12:00:10"):
+            self.timer.pause()
+        with freeze_time("2025-01-01 12:00:20"):
+            (timer_id, deadline), eta = self.start(apply_async)
+        self.assertEqual(eta - self.timer.start_time, timedelta(seconds=50))
+
+        with freeze_time("2025-01-01 12:01:00"):
+            # The first task was superseded by the restart
+            with self.assertNumQueries(0):
+                self.assertFalse(fire_quest_deadline(timer_id, stale))
+        with freeze_time("2025-01-01 12:01:10"):
+            self.assertTrue(fire_quest_deadline(timer_id, deadline))
+
+    @freeze_time("2025-01-01 12:00:00")
+    def test_sweep_catches_lost_tasks(self, apply_async):
+        apply_async.side_effect = ConnectionError("Broker unreachable")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.timer.start()
+        self.assertEqual(sweep_quest_deadlines(), 0)
+        with freeze_time("2025-01-01 12:01:00"):
+            self.assertEqual(sweep_quest_deadlines(), 1)
+            self.assertEqual(sweep_quest_deadlines(), 0)
+
+    @freeze_time("2025-01-01 12:00:00")
+    def test_sweep_filters_overdue_timers_in_sql(self, apply_async):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.timer.start()
+        with freeze_time("2025-01-01 12:00:59"):
+            # Running but not yet due: one query, no timers loaded
+            with self.assertNumQueries(1):
+                self.assertEqual(sweep_quest_deadlines(), 0)
+
+    @freeze_time("2025-01-01 12:00:00")
+    def test_locks_timers_in_transition_order(self, apply_async):
+        (timer_id, deadline), eta = self.start(apply_async)
+        with freeze_time("2025-01-01 12:01:00"), patch(
+            "gameplay.utils.send_group_message", new_callable=AsyncMock
+        ) as send, CaptureQueriesContext(connection) as context:
+            self.assertTrue(fire_quest_deadline(timer_id, deadline))
+
+        # The activity timer is locked before the quest timer, as in
+        # transition_timers, so a concurrent start or pause cannot deadlock
+        tables = [
+            table
+            for query in context.captured_queries
+            for table in ("gameplay_activitytimer", "gameplay_questtimer")
+            if query["sql"].startswith("SELECT") and f'FROM "{table}"' in query["sql"]
+        ]
+        self.assertEqual(tables[:2], ["gameplay_activitytimer", "gameplay_questtimer"])
+        self.assertTrue(send.await_count)
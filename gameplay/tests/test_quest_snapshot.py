@@ -0,0 +1,92 @@
+# gameplay/tests/test_quest_snapshot.py
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from unittest.mock import patch
+import logging
+
+from api.serializers import QuestSerializer as ApiQuestSerializer
+from gameplay.models import Quest
+from gameplay.serializers import QuestSerializer
+from gameplay.services import quest_snapshot
+from gameplay.services.quest_catalog import CATALOG_VERSION_KEY, bump_catalog_version
+from gameplay.services.quest_snapshot import get_quest_snapshot, serialize_quests
+
+logging.getLogger("django").setLevel(logging.CRITICAL)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class TestQuestSnapshot(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = Quest.objects.create(
+            name="First", levelMax=10, stages=[{"text": "Walk", "duration": 30}]
+        )
+        cls.second = Quest.objects.create(name="Second", levelMax=10)
+        cls.first.results.coin_reward = 5
+        cls.first.results.dynamic_rewards = {"sex": "Female"}
+        cls.first.results.save()
+
+    def setUp(self):
+        cache.clear()
+        bump_catalog_version()
+
+    def serialized(self, serializer_class):
+        quests = Quest.objects.select_related("results").order_by("id")
+        return [dict(data) for data in serializer_class(quests, many=True).data]
+
+    def test_matches_serializer_output(self):
+        for serializer_class in (QuestSerializer, ApiQuestSerializer):
+            self.assertEqual(
+                get_quest_snapshot(serializer_class).quests,
+                self.serialized(serializer_class),
+            )
+
+    def test_assembles_by_id(self):
+        data = serialize_quests([self.second.id, 0, self.first.id], QuestSerializer)
+        self.assertEqual(
+            [quest["id"] for quest in data], [self.second.id, self.first.id]
+        )
+        self.assertEqual(data[1]["result"]["coin_reward"], 5)
+
+    def test_reused_until_catalog_changes(self):
+        get_quest_snapshot(QuestSerializer)
+        with self.assertNumQueries(0):
+            get_quest_snapshot(QuestSerializer)
+
+        self.second.name = "Renamed"
+        self.second.save()
+        self.assertEqual(
+            serialize_quests([self.second.id], QuestSerializer)[0]["name"], "Renamed"
+        )
+
+    def test_shared_between_workers(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_catalog_version()
+        get_quest_snapshot(QuestSerializer)
+        # A fresh worker loads the packed snapshot from the cache
+        quest_snapshot._snapshots.clear()
+        with self.assertNumQueries(0):
+            quests = get_quest_snapshot(QuestSerializer).quests
+        self.assertEqual(quests, self.serialized(QuestSerializer))
+
+    def test_missing_version_is_seeded(self):
+        cache.delete(CATALOG_VERSION_KEY)
+        get_quest_snapshot(QuestSerializer)
+        version = cache.get(CATALOG_VERSION_KEY)
+        self.assertIsNotNone(version)
+        self.assertIsNone(cache.get(quest_snapshot._cache_key(QuestSerializer, None)))
+        self.assertEqual(get_quest_snapshot(QuestSerializer).version[0], version)
+
+    def test_never_cached_without_a_version(self):
+        with patch("gameplay.services.quest_catalog.cache.add"):
+            cache.delete(CATALOG_VERSION_KEY)
+            get_quest_snapshot(QuestSerializer)
+            self.assertIsNone(
+                cache.get(quest_snapshot._cache_key(QuestSerializer, None))
+            )
+            self.assertNotIn(
+                quest_snapshot._label(QuestSerializer), quest_snapshot._snapshots
+            )
@@ -0,0 +1,124 @@
+# gameplay/tests/test_timer_segments.py
+
+from datetime import date, datetime, timezone as dt_timezone
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from freezegun import freeze_time
+from unittest.mock import patch
+import logging
+
+from character.models import Character
+from gameplay.models import (
+    ActivityTimer,
+    Quest,
+    QuestTimer,
+    TimerDailyTotal,
+    TimerSegment,
+)
+from gameplay.services.timer_segments import (
+    compact_timer_segments,
+    hourly_activity,
+    split_by_hour,
+)
+
+logging.getLogger("django").setLevel(logging.CRITICAL)
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+@patch("gameplay.tasks.complete_quest_deadline.apply_async")
+class TestTimerSegments(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="segments@example.com", password="testpassword123"
+        )
+        cls.profile = user.profile
+        cls.character = Character.objects.create(name="Logger")
+        cls.quest = Quest.objects.create(name="Log", levelMax=10)
+
+    def setUp(self):
+        self.act_timer = self.profile.activity_timer
+        self.act_timer.new_activity("Writing")
+        self.quest_timer = QuestTimer.objects.create(character=self.character)
+        self.quest_timer.change_quest(self.quest, duration=3600)
+
+    def test_pause_logs_segment(self, apply_async):
+        with freeze_time("2025-01-01 12:00:00"):
+            self.act_timer.start()
+        with freeze_time("2025-01-01 12:00:45"):
+            self.act_timer.pause()
+
+        segment = TimerSegment.objects.get()
+        self.assertEqual(segment.timer_type, "activity")
+        self.assertEqual(segment.timer_id, self.act_timer.id)
+        self.assertEqual(segment.profile, self.profile)
+        self.assertEqual(segment.activity, self.act_timer.activity)
+        self.assertEqual(segment.duration, 45)
+        self.assertEqual(self.act_timer.elapsed_time, 45)
+
+        # Pausing a paused timer closes no span
+        self.act_timer.pause()
+        self.assertEqual(TimerSegment.objects.count(), 1)
+
+    def test_bulk_pause_logs_segments(self, apply_async):
+        with freeze_time("2025-01-01 12:00:00"):
+            self.act_timer.start()
+            self.quest_timer.start()
+        moment = utc(2025, 1, 1, 12, 1, 30)
+        ActivityTimer.objects.all().bulk_pause(moment)
+        QuestTimer.objects.all().bulk_pause(moment)
+
+        segments = {s.timer_type: s for s in TimerSegment.objects.all()}
+        self.assertEqual(segments["activity"].duration, 90)
+        self.assertEqual(segments["quest"].duration, 90)
+        self.assertEqual(segments["quest"].character, self.character)
+        self.assertEqual(segments["quest"].quest, self.quest)
+        self.assertEqual(segments["quest"].ended_at, moment)
+
+    def test_split_by_hour(self, apply_async):
+        self.assertEqual(
+            split_by_hour(utc(2025, 1, 1, 23, 30), utc(2025, 1, 2, 1, 15)),
+            {
+                (date(2025, 1, 1), 23): 1800,
+                (date(2025, 1, 2), 0): 3600,
+                (date(2025, 1, 2), 1): 900,
+            },
+        )
+
+    def test_compaction_merges_into_daily_totals(self, apply_async):
+        owners = {"profile": self.profile, "activity": self.act_timer.activity}
+        spans = [
+            (utc(2025, 1, 1, 9, 50), utc(2025, 1, 1, 10, 10)),
+            (utc(2025, 1, 1, 14, 0), utc(2025, 1, 1, 14, 30)),
+            (utc(2025, 1, 9, 8, 0), utc(2025, 1, 9, 8, 5)),
+        ]
+        TimerSegment.objects.bulk_create(
+            TimerSegment.for_span("activity", self.act_timer.id, *span, **owners)
+            for span in spans
+        )
+
+        with freeze_time("2025-01-10 03:00:00"):
+            self.assertEqual(compact_timer_segments(), 2)
+        total = TimerDailyTotal.objects.get()
+        self.assertEqual((total.date, total.total_seconds), (date(2025, 1, 1), 3000))
+        self.assertEqual(total.segment_count, 2)
+        self.assertEqual((total.hourly[9], total.hourly[10]), (600, 600))
+        self.assertEqual(TimerSegment.objects.count(), 1)
+
+        # A late segment for the same day merges into the existing row
+        TimerSegment.for_span(
+            "activity",
+            self.act_timer.id,
+            utc(2025, 1, 1, 14, 30),
+            utc(2025, 1, 1, 14, 40),
+            **owners,
+        ).save()
+        self.assertEqual(compact_timer_segments(before=utc(2025, 1, 2)), 1)
+        total.refresh_from_db()
+        self.assertEqual((total.total_seconds, total.hourly[14]), (3600, 2400))
+
+        self.assertEqual(hourly_activity(self.profile, date(2025, 1, 1))[14], 2400)
+        self.assertEqual(hourly_activity(self.profile, date(2025, 1, 9))[8], 300)
@@ -0,0 +1,79 @@
+# gameplay/tests/test_timer_service.py
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+from unittest.mock import patch
+import logging
+
+from character.models import Character
+from gameplay.models import ActivityTimer, Quest, QuestTimer
+from gameplay.services.timer_service import transition_timers
+
+logging.getLogger("django").setLevel(logging.CRITICAL)
+
+
+@patch("gameplay.tasks.complete_quest_deadline.apply_async")
+class TestTimerTransitions(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="transition@example.com", password="testpassword123"
+        )
+        cls.profile = user.profile
+        cls.character = Character.objects.create(name="Switcher")
+        cls.quest = Quest.objects.create(name="Switch", levelMax=10)
+
+    def setUp(self):
+        self.act_timer = self.profile.activity_timer
+        self.act_timer.new_activity("Reading")
+        self.quest_timer = QuestTimer.objects.create(character=self.character)
+        self.quest_timer.change_quest(self.quest, duration=600)
+
+    def timer_updates(self, context):
+        tables = (ActivityTimer._meta.db_table, QuestTimer._meta.db_table)
+        return [
+            query["sql"]
+            for query in context
+            if query["sql"].startswith("UPDATE")
+            and any(f'"{table}"' in query["sql"].split(" SET ")[0] for table in tables)
+        ]
+
+    @freeze_time("2025-01-01 12:00:00")
+    def test_start_and_pause_write_each_row_once(self, apply_async):
+        with CaptureQueriesContext(connection) as context:
+            result = transition_timers(self.act_timer, self.quest_timer, "start")
+        self.assertTrue(result.success)
+        self.assertEqual(len(self.timer_updates(context)), 2)
+        self.assertEqual(self.act_timer.status, "active")
+        self.assertEqual(self.quest_timer.status, "active")
+
+        with freeze_time("2025-01-01 12:00:45"):
+            with CaptureQueriesContext(connection) as context:
+                result = transition_timers(self.act_timer, self.quest_timer, "pause")
+        self.assertEqual(len(self.timer_updates(context)), 2)
+        for timer in (result.activity_timer, result.quest_timer):
+            timer.refresh_from_db()
+            self.assertEqual((timer.status, timer.elapsed_time), ("paused", 45))
+        self.assertEqual(result.activity_timer.activity.duration, 45)
+
+    def test_stale_instances_are_refreshed(self, apply_async):
+        stale_act = ActivityTimer.objects.get(pk=self.act_timer.pk)
+        stale_quest = QuestTimer.objects.get(pk=self.quest_timer.pk)
+        transition_timers(self.act_timer, self.quest_timer, "start")
+
+        # A second request holding the old state pauses what is really running
+        transition_timers(stale_act, stale_quest, "pause")
+        self.assertEqual(stale_act.status, "paused")
+        self.assertEqual(stale_quest.status, "paused")
+
+    def test_invalid_state_is_rejected(self, apply_async):
+        self.quest_timer.reset()
+        result = transition_timers(self.act_timer, self.quest_timer, "start")
+        self.assertFalse(result.success)
+        self.act_timer.refresh_from_db()
+        self.assertEqual(self.act_timer.status, "waiting")
+        with self.assertRaises(ValueError):
+            transition_timers(self.act_timer, self.quest_timer, "reset")
@@ -0,0 +1,230 @@
+# gameplay/tests/test_timer_state.py
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db.models import QuerySet
+from freezegun import freeze_time
+from redis.exceptions import WatchError
+from unittest.mock import patch
+import logging, pickle
+
+from character.models import Character
+from gameplay.models import Quest, QuestTimer
+from gameplay.services.quest_deadlines import sweep_quest_deadlines
+from gameplay.services.timer_state import (
+    LIVE_INDEX_KEY,
+    _get_states,
+    flush_state,
+    flush_timer_states,
+    load_state,
+)
+
+logging.getLogger("django").setLevel(logging.CRITICAL)
+
+
+class FakeRedis:
+    """The Redis commands used by the timer state store, in memory."""
+
+    def __init__(self):
+        self.values, self.sets, self.versions = {}, {}, {}
+
+    def _touch(self, key):
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def set(self, key, value):
+        self.values[key] = value
+        self._touch(key)
+
+    def delete(self, key):
+        self.values.pop(key, None)
+        self._touch(key)
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(m.encode() for m in members)
+
+    def srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(m.encode() for m in members)
+
+    def sscan_iter(self, key):
+        return iter(list(self.sets.get(key, ())))
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """A pipeline with WATCH/MULTI/EXEC semantics."""
+
+    def __init__(self, redis):
+        self.redis, self.watched, self.queued = redis, {}, None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def watch(self, key):
+        self.watched[key] = self.redis.versions.get(key, 0)
+
+    def get(self, key):
+        return self.redis.get(key)
+
+    def multi(self):
+        self.queued = []
+
+    def __getattr__(self, command):
+        def queue(*args):
+            if self.queued is None:
+                self.queued = []
+            self.queued.append((command, args))
+
+        return queue
+
+    def execute(self):
+        if any(self.redis.versions.get(k, 0) != v for k, v in self.watched.items()):
+            raise WatchError("Watched variable changed")
+        for command, args in self.queued or ():
+            getattr(self.redis, command)(*args)
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "timer_state": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "timer_state",
+        },
+    },
+    TIMER_STATE_BACKEND="cache",
+    TIMER_STATE_CACHE="timer_state",
+)
+class TestTimerStateStore(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.character = Character.objects.create(name="Runner")
+        cls.quest = Quest.objects.create(name="Run", levelMax=10)
+
+    def setUp(self):
+        caches["timer_state"].clear()
+        self.timer = QuestTimer.objects.create(character=self.character)
+        self.timer.change_quest(self.quest, duration=300)
+
+    def stored_row(self):
+        return QuestTimer.objects.filter(pk=self.timer.pk).values("status").get()
+
+    def test_transitions_skip_the_database(self):
+        with CaptureQueriesContext(connection) as context:
+            self.timer.start()
+            self.timer.pause()
+            self.timer.start()
+        self.assertEqual(len(context), 0)
+        self.assertEqual(self.stored_row()["status"], "waiting")
+
+        # Loading the timer overlays the live state
+        self.assertEqual(QuestTimer.objects.get(pk=self.timer.pk).status, "active")
+        self.timer.status = "paused"
+        with self.assertNumQueries(0):
+            self.timer.refresh_state()
+        self.assertEqual(self.timer.status, "active")
+
+    def test_querysets_load_live_states_in_one_round_trip(self):
+        timers = [self.timer] + [
+            QuestTimer.objects.create(character=Character.objects.create(name=name))
+            for name in ("Walker", "Jogger")
+        ]
+        for timer in timers:
+            timer.change_quest(self.quest, duration=300)
+            timer.start()
+
+        with patch(
+            "gameplay.services.timer_state._get_states", wraps=_get_states
+        ) as get_states:
+            loaded = list(QuestTimer.objects.filter(pk__in=[t.pk for t in timers]))
+        self.assertEqual(get_states.call_count, 1)
+        self.assertEqual([timer.status for timer in loaded], ["active"] * 3)
+        self.assertEqual(self.stored_row()["status"], "waiting")
+
+    def test_saving_state_writes_back(self):
+        self.timer.start()
+        self.timer.pause()
+        self.timer.save(update_fields=["status"])
+        timer = QuestTimer.objects.get(pk=self.timer.pk)
+        self.assertIsNone(load_state(timer))
+        self.assertEqual(self.stored_row()["status"], "paused")
+
+    def test_flush_keeps_running_timers_live(self):
+        self.timer.start()
+        self.assertEqual(flush_timer_states(), 1)
+        self.assertEqual(self.stored_row()["status"], "active")
+        self.assertIsNotNone(load_state(self.timer))
+
+        self.timer.pause()
+        self.assertEqual(flush_timer_states(), 1)
+        self.assertEqual(self.stored_row()["status"], "paused")
+        self.assertIsNone(load_state(self.timer))
+        self.assertEqual(flush_timer_states(), 0)
+
+    @override_settings(TIMER_STATE_CACHE="missing")
+    def test_falls_back_to_database(self):
+        self.timer.start()
+        self.assertEqual(self.stored_row()["status"], "active")
+
+    def test_redis_index_uses_set_commands(self):
+        client = FakeRedis()
+        key = caches["timer_state"].make_key(LIVE_INDEX_KEY)
+        entry = f"gameplay.questtimer:{self.timer.pk}".encode()
+        with patch("gameplay.services.timer_state._redis", return_value=client):
+            self.timer.start()
+            self.assertEqual(client.sets[key], {entry})
+            self.assertEqual(flush_timer_states(), 1)
+
+            self.timer.pause()
+            self.assertEqual(flush_timer_states(), 1)
+            self.assertEqual(client.sets[key], set())
+        # The cached-set fallback is not touched
+        self.assertIsNone(caches["timer_state"].get(LIVE_INDEX_KEY))
+
+    def test_flush_keeps_state_written_during_it(self):
+        client = FakeRedis()
+        store = caches["timer_state"]
+        state_key = store.make_key(f"timer_state:gameplay.questtimer:{self.timer.pk}")
+        update = QuerySet.update
+
+        def racing_update(queryset, **kwargs):
+            # Another worker starts the timer again while the flush writes back
+            rows = update(queryset, **kwargs)
+            QuestTimer.objects.get(pk=self.timer.pk).start()
+            return rows
+
+        with patch("gameplay.services.timer_state._redis", return_value=client):
+            self.timer.start()
+            self.timer.pause()
+            with patch.object(QuerySet, "update", racing_update):
+                self.assertTrue(flush_state(self.timer))
+
+            self.assertEqual(self.stored_row()["status"], "paused")
+            self.assertEqual(pickle.loads(client.values[state_key])["status"], "active")
+            self.assertTrue(client.sets[store.make_key(LIVE_INDEX_KEY)])
+            # The newer state reaches the database with the next flush
+            self.assertTrue(flush_state(self.timer))
+        self.assertEqual(self.stored_row()["status"], "active")
+        self.assertNotIn(state_key, client.values)
+
+    def test_sweep_finds_timers_only_live_in_store(self):
+        with freeze_time("2025-01-01 12:00:00"):
+            self.timer.start()
+        self.assertEqual(self.stored_row()["status"], "waiting")
+        with freeze_time("2025-01-01 12:05:00"), patch(
+            "gameplay.services.quest_deadlines.fire_quest_deadline", return_value=True
+        ) as fire:
+            self.assertEqual(sweep_quest_deadlines(), 1)
+        fire.assert_called_once_with(self.timer.id)
@@ -0,0 +1,223 @@
+# gameplay/tests/test_timer_sync.py
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from datetime import datetime, timezone as dt_timezone
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from freezegun import freeze_time
+from unittest.mock import AsyncMock, MagicMock, patch
+import logging
+
+from character.models import Character, PlayerCharacterLink
+from gameplay.consumers import TimerConsumer
+from gameplay.models import ActivityTimer, Quest, QuestTimer
+from gameplay.services.presence import is_online
+from gameplay.services.timer_sync import timer_clock, timer_sync_message
+from gameplay.utils import process_completion
+
+logging.getLogger("django").setLevel(logging.CRITICAL)
+
+
+def ms(*args):
+    return int(datetime(*args, tzinfo=dt_timezone.utc).timestamp() * 1000)
+
+
+@patch("gameplay.tasks.complete_quest_deadline.apply_async")
+class TestTimerSync(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="sync@example.com", password="testpassword123"
+        )
+        cls.profile = user.profile
+        cls.character = Character.objects.create(name="Clockwork")
+        PlayerCharacterLink.objects.create(profile=cls.profile, character=cls.character)
+        cls.quest = Quest.objects.create(name="Tick", levelMax=10)
+
+    def setUp(self):
+        self.act_timer = self.profile.activity_timer
+        self.act_timer.new_activity("Counting")
+        self.quest_timer = QuestTimer.objects.create(character=self.character)
+        self.quest_timer.change_quest(self.quest, duration=300)
+
+    def test_message_uses_absolute_deadlines(self, apply_async):
+        with freeze_time("2025-01-01 12:00:00"):
+            self.quest_timer.start()
+        with freeze_time("2025-01-01 12:01:00"):
+            self.quest_timer.pause()
+        with freeze_time("2025-01-01 12:02:00"):
+            self.quest_timer.start()
+            message = timer_sync_message(self.act_timer, self.quest_timer)
+
+        self.assertEqual(message["type"], "timer_sync")
+        self.assertEqual(message["server_time"], ms(2025, 1, 1, 12, 2))
+        self.assertEqual(
+            message["quest"],
+            {
+                "id": self.quest_timer.id,
+                "status": "active",
+                "elapsed": 60,
+                "started_at": ms(2025, 1, 1, 12, 2),
+                "duration": 300,
+                "deadline": ms(2025, 1, 1, 12, 6),
+            },
+        )
+        self.assertEqual(message["activity"]["status"], "waiting")
+        self.assertIsNone(message["activity"]["started_at"])
+        self.assertNotIn("deadline", message["activity"])
+
+    @freeze_time("2025-01-01 12:00:00")
+    def test_early_completion_resyncs_client(self, apply_async):
+        self.act_timer.start()
+        self.quest_timer.start()
+        with patch("gameplay.utils.send_group_message", new_callable=AsyncMock) as send:
+            self.assertFalse(
+                process_completion(self.profile, self.character, "complete_quest")
+            )
+
+        group, message = send.call_args.args
+        self.assertEqual(group, f"profile_{self.profile.id}")
+        self.assertEqual(message["type"], "timer_sync")
+        self.assertEqual(message["quest"]["deadline"], ms(2025, 1, 1, 12, 5))
+
+    def published(self, change):
+        """Return the group messages published by the timer models during `change`."""
+        channel_layer = MagicMock(group_send=AsyncMock())
+        with patch(
+            "gameplay.services.timer_sync.get_channel_layer",
+            return_value=channel_layer,
+        ), self.captureOnCommitCallbacks(execute=True):
+            change()
+        return [call.args for call in channel_layer.group_send.await_args_list]
+
+    @freeze_time("2025-01-01 12:00:00")
+    def test_transitions_outside_the_consumer_are_published(self, apply_async):
+        # e.g. a REST view or a Celery task starting the quest
+        published = self.published(self.quest_timer.start)
+
+        self.assertEqual(len(published), 1)
+        group, message = published[0]
+        self.assertEqual(group, f"profile_{self.profile.id}")
+        self.assertEqual(
+            message,
+            {
+                "type": "timer_sync",
+                "server_time": ms(2025, 1, 1, 12),
+                "quest": timer_clock(self.quest_timer),
+            },
+        )
+        self.assertEqual(message["quest"]["deadline"], ms(2025, 1, 1, 12, 5))
+
+    def test_bulk_pause_publishes_paused_clocks(self, apply_async):
+        with freeze_time("2025-01-01 12:00:00"):
+            self.act_timer.start()
+        with freeze_time("2025-01-01 12:01:00"):
+            published = self.published(
+                lambda: ActivityTimer.objects.filter(pk=self.act_timer.pk).bulk_pause()
+            )
+
+        [(group, message)] = published
+        self.assertEqual(group, f"profile_{self.profile.id}")
+        self.assertNotIn("quest", message)
+        self.assertEqual(
+            message["activity"],
+            {
+                "id": self.act_timer.id,
+                "status": "paused",
+                "elapsed": 60,
+                "started_at": None,
+            },
+        )
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+class TestConsumerTimerSnapshot(TransactionTestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email="snapshot@example.com", password="testpassword123"
+        )
+        self.profile = user.profile
+        character = Character.objects.create(name="Mirror")
+        PlayerCharacterLink.objects.create(profile=self.profile, character=character)
+        self.quest_timer = QuestTimer.objects.create(character=character)
+
+    @patch("gameplay.consumers.process_completion")
+    def test_sync_events_update_the_snapshot(self, process_completion):
+        async def run():
+            communicator = WebsocketCommunicator(
+                TimerConsumer.as_asgi(), f"/ws/profile_{self.profile.id}/"
+            )
+            communicator.scope["user"] = self.profile.user
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            while (await communicator.receive_json_from())["type"] != "console.log":
+                pass
+
+            # A transition made elsewhere, e.g. by the deadline task, carrying
+            # only the timer that changed
+            self.quest_timer.status = "completed"
+            event = {
+                "type": "timer_sync",
+                "server_time": 0,
+                "quest": timer_clock(self.quest_timer),
+            }
+            await get_channel_layer().group_send(f"profile_{self.profile.id}", event)
+            self.assertEqual(await communicator.receive_json_from(), event)
+
+            await communicator.send_json_to(
+                {"type": "client_request", "action": "complete_quest"}
+            )
+            await communicator.send_json_to({"type": "ping"})
+            self.assertEqual((await communicator.receive_json_from())["type"], "pong")
+            await communicator.disconnect()
+
+        async_to_sync(run)()
+        process_completion.assert_not_called()
+
+    @patch("gameplay.consumers.control_timers", new_callable=AsyncMock)
+    def test_disconnect_pauses_timers_started_elsewhere(self, control_timers):
+        async def run():
+            communicator = WebsocketCommunicator(
+                TimerConsumer.as_asgi(), f"/ws/profile_{self.profile.id}/"
+            )
+            communicator.scope["user"] = self.profile.user
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            while (await communicator.receive_json_from())["type"] != "console.log":
+                pass
+
+            # Started behind the consumer's back, with no sync message
+            await database_sync_to_async(
+                QuestTimer.objects.filter(pk=self.quest_timer.pk).update
+            )(status="active", start_time=timezone.now())
+            await communicator.disconnect()
+
+        async_to_sync(run)()
+        control_timers.assert_awaited_once()
+        self.assertEqual(control_timers.await_args.args[2].status, "active")
+
+    def test_hydrate_loads_the_session_in_two_queries(self):
+        self.profile.activity_timer.new_activity("Reading")
+        self.quest_timer.change_quest(Quest.objects.create(name="Read"), duration=60)
+
+        consumer = TimerConsumer()
+        with CaptureQueriesContext(connection) as context:
+            profile, character, act_timer, quest_timer = async_to_sync(
+                consumer.hydrate
+            )(self.profile.user)
+            self.assertEqual(act_timer.activity.name, "Reading")
+            self.assertEqual(quest_timer.quest.name, "Read")
+            self.assertEqual(character.name, "Mirror")
+        selects = [q for q in context.captured_queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 2)
+        self.assertTrue(profile.is_online)
+        self.assertTrue(is_online(self.profile.id))
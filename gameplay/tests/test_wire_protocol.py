@@ -0,0 +1,155 @@
+# gameplay/tests/test_wire_protocol.py
+
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from unittest.mock import AsyncMock
+import asyncio, logging, msgpack
+
+from character.models import Character, PlayerCharacterLink
+from gameplay.consumers import TimerConsumer
+from gameplay.models import QuestTimer
+from gameplay.services.wire_protocol import decode_message, encode_message
+
+logging.getLogger("django").setLevel(logging.CRITICAL)
+
+
+class TestWireProtocol(SimpleTestCase):
+    def test_high_frequency_messages_are_compact(self):
+        pong = {"type": "pong", "action": "pong", "message": "pong"}
+        self.assertEqual(msgpack.unpackb(encode_message(pong)), [2])
+        self.assertEqual(decode_message(encode_message(pong)), pong)
+
+        sync = {
+            "type": "timer_sync",
+            "server_time": 1735732800000,
+            "activity": None,
+            "quest": {"id": 1, "status": "active", "elapsed": 0},
+        }
+        self.assertEqual(msgpack.unpackb(encode_message(sync))[0], 3)
+        self.assertEqual(decode_message(encode_message(sync)), sync)
+
+    def test_other_messages_are_maps(self):
+        # A notification with another action does not fit the compact shape
+        message = {
+            "type": "notification",
+            "action": "refresh",
+            "data": {},
+            "message": "Hi",
+            "created_at": "2025-01-01T12:00:00+00:00",
+        }
+        self.assertEqual(msgpack.unpackb(encode_message(message)), message)
+        self.assertEqual(decode_message(encode_message(message)), message)
+
+    def test_batched_messages_are_compacted(self):
+        pong = {"type": "pong", "action": "pong", "message": "pong"}
+        action = {"type": "action", "action": "quest_complete"}
+        batch = {"type": "batch", "messages": [action, pong]}
+        self.assertEqual(
+            msgpack.unpackb(encode_message(batch))["messages"], [action, [2]]
+        )
+        self.assertEqual(decode_message(encode_message(batch)), batch)
+
+    def test_invalid_frames_are_rejected(self):
+        for frame in (b"\xc1", msgpack.packb([99]), msgpack.packb([3, 1])):
+            with self.assertRaises(ValueError):
+                decode_message(frame)
+
+
+class TestOutboundBatching(SimpleTestCase):
+    action = {"type": "action", "action": "quest_complete"}
+    notification = {"type": "notification", "action": "notification", "message": ""}
+    pong = {"type": "pong", "action": "pong", "message": "pong"}
+
+    def send(self, *messages):
+        """Return the frames sent straight away, and after the batch window."""
+
+        async def run():
+            consumer = TimerConsumer()
+            consumer._send_frame = AsyncMock()
+            for message in messages:
+                await consumer.send_json(message)
+            sent_now = len(consumer._send_frame.await_args_list)
+            await asyncio.sleep(0.1)
+            frames = [call.args[0] for call in consumer._send_frame.await_args_list]
+            return frames[:sent_now], frames[sent_now:]
+
+        return async_to_sync(run)()
+
+    @override_settings(WS_BATCH_WINDOW_MS=20)
+    def test_burst_is_sent_as_one_frame(self):
+        self.assertEqual(
+            self.send(self.action, self.notification),
+            ([], [{"type": "batch", "messages": [self.action, self.notification]}]),
+        )
+
+    @override_settings(WS_BATCH_WINDOW_MS=20)
+    def test_latency_critical_messages_flush_in_order(self):
+        self.assertEqual(
+            self.send(self.action, self.pong),
+            ([{"type": "batch", "messages": [self.action, self.pong]}], []),
+        )
+
+    @override_settings(WS_BATCH_WINDOW_MS=0)
+    def test_batching_can_be_disabled(self):
+        self.assertEqual(
+            self.send(self.action, self.notification),
+            ([self.action, self.notification], []),
+        )
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+class TestConsumerSubprotocol(TransactionTestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email="binary@example.com", password="testpassword123"
+        )
+        self.profile = user.profile
+        character = Character.objects.create(name="Packer")
+        PlayerCharacterLink.objects.create(profile=self.profile, character=character)
+        QuestTimer.objects.create(character=character)
+
+    def communicate(self, subprotocols, exchange):
+        async def run():
+            communicator = WebsocketCommunicator(
+                TimerConsumer.as_asgi(),
+                f"/ws/profile_{self.profile.id}/",
+                subprotocols=subprotocols,
+            )
+            communicator.scope["user"] = self.profile.user
+            connected, subprotocol = await communicator.connect()
+            self.assertTrue(connected)
+            try:
+                return subprotocol, await exchange(communicator)
+            finally:
+                await communicator.disconnect()
+
+        return async_to_sync(run)()
+
+    def test_msgpack_is_negotiated(self):
+        async def exchange(communicator):
+            while decode_message(await communicator.receive_from())["type"] != (
+                "console.log"
+            ):
+                pass
+            await communicator.send_to(bytes_data=encode_message({"type": "ping"}))
+            return await communicator.receive_from()
+
+        subprotocol, frame = self.communicate(["msgpack"], exchange)
+        self.assertEqual(subprotocol, "msgpack")
+        self.assertEqual(msgpack.unpackb(frame), [2])
+
+    def test_json_is_the_fallback(self):
+        async def exchange(communicator):
+            while (await communicator.receive_json_from())["type"] != "console.log":
+                pass
+            await communicator.send_json_to({"type": "ping"})
+            return await communicator.receive_json_from()
+
+        subprotocol, message = self.communicate(None, exchange)
+        self.assertIsNone(subprotocol)
+        self.assertEqual(message["type"], "pong")
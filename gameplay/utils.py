@@ -8,11 +8,13 @@ communication between the server and users.
 
 Functions:
     - check_quest_eligibility(character, profile): Checks which quests a character is eligible for based on their profile and quest history.
-    - start_server_timers(act_timer, quest_timer): Asynchronously starts the server-side activity and quest timers.
-    - pause_server_timers(act_timer, quest_timer): Asynchronously pauses the server-side activity and quest timers.
+    - serialize_eligible_quests(character, profile, serializer_class): Returns the serialized eligible quests from the catalog snapshot.
+    - start_server_timers(act_timer, quest_timer): Atomically starts the server-side activity and quest timers.
+    - pause_server_timers(act_timer, quest_timer): Atomically pauses the server-side activity and quest timers.
     - control_timers(profile, act_timer, quest_timer, mode): Asynchronously starts or pauses both server and client timers, with WebSocket feedback.
     - process_initiation(profile, character, action): Create activity or choose quest, handling timers and WebSocket updates.
     - process_completion(profile, character, action): Submits activity or completes quest, handling timers and WebSocket updates.
+    - send_timer_sync(profile_id, act_timer, quest_timer): Sends the compact timer sync message to a player.
     - send_group_message(group_name, message): Sends a message to a WebSocket group.
 
 Usage:
@@ -36,9 +38,16 @@ from channels.layers import get_channel_layer
 # from django.utils.timezone import now
 
 from .models import QuestCompletion, Quest, ActivityTimer, QuestTimer
+from .services.eligibility_cache import (
+    cached_eligible_quest_ids,
+    cached_eligible_quest_page,
+    cached_eligible_quests,
+)
+from .services.quest_snapshot import serialize_quests
+from .services.timer_service import transition_timers
+from .services.timer_sync import timer_sync_message
 
 # from .models import ServerMessage
-from .serializers import QuestTimerSerializer
 
 # from .serializers import QuestSerializer, ActivitySerializer, ActivityTimerSerializer
 
@@ -58,6 +67,7 @@ logger = logging.getLogger("django")  # Get the logger for this module
 def check_quest_eligibility(character: Character, profile: Profile) -> list:
     """
     Checks the eligibility of quests for a specific character and profile.
+    The eligible quest ids are cached per character; see `gameplay.services.eligibility_cache`.
 
     :param character: The character instance to evaluate quests for.
     :type character: Character
@@ -68,17 +78,56 @@ def check_quest_eligibility(character: Character, profile: Profile) -> list:
     logger.info(
         f"[CHECK QUEST ELIGIBILITY] Checking eligibility for character {character.id} and profile {profile.id}"
     )
-    char_quests = QuestCompletion.objects.filter(character=character)
-    quests_done = {}
-    for completion in char_quests:
-        quests_done[completion.quest] = completion.times_completed
-        # logger.debug(f"[CHECK QUEST ELIGIBILITY] Quest {completion.quest} completed {completion.times_completed} times")
+    return cached_eligible_quests(character, profile)
 
-    return [
-        quest
-        for quest in Quest.objects.all()
-        if check_individual_quest(quest, character, profile, quests_done)
-    ]
+
+def serialize_eligible_quests(
+    character: Character, profile: Profile, serializer_class
+) -> list:
+    """
+    Returns the serialized quests a character is eligible for, assembled from the
+    quest catalog snapshot instead of re-serializing the quest rows.
+
+    :param character: The character instance to evaluate quests for.
+    :type character: Character
+    :param profile: The profile instance associated with the character.
+    :type profile: Profile
+    :param serializer_class: The quest serializer whose output should be returned.
+    :return: A list of serialized quests.
+    """
+    logger.info(
+        f"[SERIALIZE ELIGIBLE QUESTS] Checking eligibility for character {character.id} and profile {profile.id}"
+    )
+    quest_ids = cached_eligible_quest_ids(character, profile)
+    return serialize_quests(quest_ids, serializer_class)
+
+
+def serialize_eligible_quest_page(
+    character: Character,
+    profile: Profile,
+    serializer_class,
+    after_id: int = None,
+    limit: int = 50,
+) -> tuple:
+    """
+    Returns one page of the serialized quests a character is eligible for. Only as
+    many quests as the page needs are evaluated when the eligibility cache is cold.
+
+    :param character: The character instance to evaluate quests for.
+    :type character: Character
+    :param profile: The profile instance associated with the character.
+    :type profile: Profile
+    :param serializer_class: The quest serializer whose output should be returned.
+    :param after_id: Only return quests with a greater id.
+    :type after_id: int
+    :param limit: The page size.
+    :type limit: int
+    :return: A tuple of (serialized quests, whether more quests follow).
+    """
+    quest_ids, has_more = cached_eligible_quest_page(
+        character, profile, after_id, limit
+    )
+    return serialize_quests(quest_ids, serializer_class), has_more
 
 
 def check_individual_quest(
@@ -89,13 +138,15 @@ def check_individual_quest(
     return (
         quest.checkEligible(character, profile)
         and quest.not_repeating(character)
+        and quest.frequency_eligible(character)
         and quest.requirements_met(quests_done)
     )
 
 
 def start_server_timers(act_timer: ActivityTimer, quest_timer: QuestTimer):
     """
-    Attempts to start server-side activity and quest timers.
+    Attempts to start server-side activity and quest timers, atomically and with
+    both rows locked. The given instances are updated with the fresh state.
 
     :param act_timer: The activity timer instance to be started.
     :type act_timer: ActivityTimer
@@ -105,38 +156,21 @@ def start_server_timers(act_timer: ActivityTimer, quest_timer: QuestTimer):
         and the second value is a string containing additional information or error details.
     """
     logger.info("[START SERVER TIMERS] Attempting to start server timers")
-    logger.debug(
-        f"[START SERVER TIMERS] Timers status: activity={act_timer.status}, quest={quest_timer.status}"
-    )
-    qt = quest_timer
-    logger.debug(
-        f"[START SERVER TIMERS] Quest timer status/duration/elapsed/remaining: {qt.status}/{qt.duration}/{qt.get_elapsed_time()}/{qt.get_remaining_time()}"
-    )
-
-    if act_timer.status in ["active", "paused", "waiting"] and quest_timer.status in [
-        "active",
-        "paused",
-        "waiting",
-    ]:
-        try:
-            act_timer.start()
-            quest_timer.start()
-            result_text = "[START SERVER TIMERS] Timers successfully started"
-            logger.info(result_text)
-            return True, result_text
-        except Exception as e:
-            error_text = f"[START SERVER TIMERS] Error starting timers: {e}"
-            logger.error(error_text, exc_info=True)
-            return False, error_text
-    else:
-        result_text = f"[START SERVER TIMERS] Timers not in a valid state (activity: {act_timer.status}, quest: {quest_timer.status})"
-        logger.info(result_text)
-        return False, result_text
+    try:
+        result = transition_timers(act_timer, quest_timer, "start")
+    except Exception as e:
+        error_text = f"[START SERVER TIMERS] Error starting timers: {e}"
+        logger.error(error_text, exc_info=True)
+        return False, error_text
+    result_text = f"[START SERVER TIMERS] {result.message}"
+    logger.info(result_text)
+    return result.success, result_text
 
 
 def pause_server_timers(act_timer: ActivityTimer, quest_timer: QuestTimer):
     """
-    Pauses server-side activity and quest timers.
+    Pauses server-side activity and quest timers, atomically and with both rows
+    locked. The given instances are updated with the fresh state.
 
     :param act_timer: The activity timer instance to be paused.
     :type act_timer: ActivityTimer
@@ -146,39 +180,16 @@ def pause_server_timers(act_timer: ActivityTimer, quest_timer: QuestTimer):
         and the second value is a string containing additional information or error details.
     """
     logger.info("[PAUSE SERVER TIMERS] Pausing server timers")
-    logger.debug(
-        f"[PAUSE SERVER TIMERS] Timers status before: {act_timer.status}/{quest_timer.status}"
-    )
-    qt = quest_timer
-    logger.debug(
-        f"[PAUSE SERVER TIMERS] Quest timer status/duration/elapsed/remaining: {qt.status}/{qt.duration}/{qt.get_elapsed_time()}/{qt.get_remaining_time()}"
-    )
     try:
-        if act_timer.status not in ["completed", "empty"]:
-            act_timer.pause()
-            logger.debug("[PAUSE SERVER TIMERS] Activity timer successfully paused")
-        else:
-            result_text = f"[PAUSE SERVER TIMERS] Activity timer NOT paused, status: {act_timer.status}"
-            logger.debug(result_text)
-
-        if quest_timer.status not in ["completed", "empty"]:
-            quest_timer.pause()
-            logger.debug("[PAUSE SERVER TIMERS] Quest timer successfully paused")
-        else:
-            logger.debug(
-                f"[PAUSE SERVER TIMERS] Quest timer NOT paused, status: {act_timer.status}"
-            )
-
-        # logger.debug("[PAUSE SERVER TIMERS] Timers paused (or status is complete/empty)")
-        logger.debug(
-            f"[PAUSE SERVER TIMERS] Timers status after pausing: {act_timer.status}/{quest_timer.status}"
-        )
-
-        return True, "Success"
+        result = transition_timers(act_timer, quest_timer, "pause")
     except Exception as e:
         result_text = f"[PAUSE SERVER TIMERS] Error pausing timers: {e}"
         logger.error(result_text, exc_info=True)
         return False, result_text
+    logger.debug(
+        f"[PAUSE SERVER TIMERS] Timers status after pausing: {act_timer.status}/{quest_timer.status}"
+    )
+    return result.success, "Success"
 
 
 async def control_timers(
@@ -365,19 +376,32 @@ def process_completion(profile: Profile, character: Character, action: str) -> b
 
     else:  # Quest timer not near enough to completion
         logger.warning(f"[PROCESS COMPLETION] Quest not ready for completion")
-        serialized_timer = QuestTimerSerializer(quest_timer).data
-        async_to_sync(send_group_message)(
-            f"profile_{profile_id}",
-            {
-                "success": True,
-                "type": "action",
-                "action": "correct_quest_timer",
-                "data": serialized_timer,
-            },
-        )
+        # Resync the client's clock rather than sending the whole timer
+        async_to_sync(send_timer_sync)(profile_id, act_timer, quest_timer)
         return False
 
 
+async def send_timer_sync(
+    profile_id: int, act_timer: ActivityTimer, quest_timer: QuestTimer
+) -> bool:
+    """
+    Sends the compact timer sync message, with absolute server-clock deadlines, to
+    a player's WebSocket group.
+
+    :param profile_id: The id of the player's profile.
+    :type profile_id: int
+    :param act_timer: The activity timer.
+    :type act_timer: ActivityTimer
+    :param quest_timer: The quest timer.
+    :type quest_timer: QuestTimer
+    :return: True if the message was sent, otherwise False.
+    :rtype: bool
+    """
+    return await send_group_message(
+        f"profile_{profile_id}", timer_sync_message(act_timer, quest_timer)
+    )
+
+
 async def send_group_message(group_name: str, message: dict) -> bool:
     logger.info(
         f"[SEND GROUP MESSAGE] Sending message to group {group_name}. Message: {message}"
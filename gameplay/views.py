@@ -20,6 +20,7 @@ from rest_framework.serializers import ValidationError
 import json, logging
 
 from .models import Quest, Activity, ServerMessage
+from .services.timer_read_model import cached_timer_data, store_timer_data
 
 # from .models import QuestCompletion, ActivityTimer, QuestTimer
 from .serializers import (
@@ -28,7 +29,7 @@ from .serializers import (
     ActivityTimerSerializer,
     QuestTimerSerializer,
 )
-from .utils import check_quest_eligibility, send_group_message
+from .utils import serialize_eligible_quests, send_group_message
 
 from character.models import PlayerCharacterLink
 from character.serializers import CharacterSerializer
@@ -156,8 +157,7 @@ def fetch_quests(request):
         logger.info(
             f"[FETCH QUESTS] Checking eligible quests for character {character.id}, {profile.id}"
         )
-        eligible_quests = check_quest_eligibility(character, profile)
-        quests = QuestSerializer(eligible_quests, many=True, context={"request"}).data
+        quests = serialize_eligible_quests(character, profile, QuestSerializer)
 
         data = {"success": True, "quests": quests, "message": "Eligible quests fetched"}
         response = JsonResponse(data)
@@ -246,63 +246,78 @@ def fetch_info(request):
         logger.info(
             f"[FETCH INFO] Fetching data for profile {profile.id}, character {character.id}"
         )
-        logger.debug(
-            f"[FETCH INFO] Timers status: {profile.activity_timer.status}/{character.quest_timer.status}"
-        )
-
-        qt = character.quest_timer
-        if qt.time_finished() and qt.status != "completed":
-            try:
-                logger.info(
-                    f"[FETCH INFO] Quest timer expired for character {character.id}, marking quest as complete"
-                )
-                qt.elapsed_time = qt.duration
-                qt.save()
-                logger.debug(
-                    f"[FETCH INFO] qt status {qt.status}, {qt.quest}, elapsed/remaining {qt.get_elapsed_time()}/{qt.get_remaining_time()}, duration {qt.duration}"
-                )
-                async_to_sync(send_group_message)(
-                    f"profile_{profile.id}",
-                    {"type": "action", "action": "quest_complete"},
-                )
-            except Exception as e:
-                # Handle unexpected issues during quest timer update or messaging.
-                logger.error(
-                    f"[FETCH INFO] Error handling quest timer completion for character {character.id}: {str(e)}",
-                    exc_info=True,
-                )
-                return JsonResponse(
-                    {
-                        "error": "An error occurred while handling quest timer completion."
-                    },
-                    status=500,
-                )
-
-        if (
-            profile.activity_timer.status != "empty"
-            and profile.activity_timer.activity is None
-        ):
-            try:
-                logger.warning(
-                    f"[FETCH INFO] Timer status is {profile.activity_timer.status} but activity empty ({profile.activity_timer.activity}). Resetting activity timer"
-                )
-                profile.activity_timer.reset()
-            except Exception as e:
-                # Handle errors related to resetting the activity timer.
-                logger.error(
-                    f"[FETCH INFO] Error resetting activity timer for profile {profile.id}: {str(e)}",
-                    exc_info=True,
-                )
-                return JsonResponse(
-                    {"error": "An error occurred while resetting the activity timer."},
-                    status=500,
-                )
+        # Both timers come from the cached read model unless it is stale
+        timer_data, tokens = cached_timer_data(profile, character, "gameplay")
+        if timer_data is None:
+            logger.debug(
+                f"[FETCH INFO] Timers status: {profile.activity_timer.status}/{character.quest_timer.status}"
+            )
+            qt = character.quest_timer
+            if qt.time_finished() and qt.status not in ("completed", "empty"):
+                try:
+                    logger.info(
+                        f"[FETCH INFO] Quest timer expired for character {character.id}, marking quest as complete"
+                    )
+                    qt.elapsed_time = qt.duration
+                    qt.save()
+                    logger.debug(
+                        f"[FETCH INFO] qt status {qt.status}, {qt.quest}, elapsed/remaining {qt.get_elapsed_time()}/{qt.get_remaining_time()}, duration {qt.duration}"
+                    )
+                    async_to_sync(send_group_message)(
+                        f"profile_{profile.id}",
+                        {"type": "action", "action": "quest_complete"},
+                    )
+                except Exception as e:
+                    # Handle unexpected issues during quest timer update or messaging.
+                    logger.error(
+                        f"[FETCH INFO] Error handling quest timer completion for character {character.id}: {str(e)}",
+                        exc_info=True,
+                    )
+                    return JsonResponse(
+                        {
+                            "error": "An error occurred while handling quest timer completion."
+                        },
+                        status=500,
+                    )
+
+            if (
+                profile.activity_timer.status != "empty"
+                and profile.activity_timer.activity is None
+            ):
+                try:
+                    logger.warning(
+                        f"[FETCH INFO] Timer status is {profile.activity_timer.status} but activity empty ({profile.activity_timer.activity}). Resetting activity timer"
+                    )
+                    profile.activity_timer.reset()
+                except Exception as e:
+                    # Handle errors related to resetting the activity timer.
+                    logger.error(
+                        f"[FETCH INFO] Error resetting activity timer for profile {profile.id}: {str(e)}",
+                        exc_info=True,
+                    )
+                    return JsonResponse(
+                        {
+                            "error": "An error occurred while resetting the activity timer."
+                        },
+                        status=500,
+                    )
 
         try:
             profile_serializer = ProfileSerializer(profile).data
             character_serializer = CharacterSerializer(character).data
-            act_timer = ActivityTimerSerializer(profile.activity_timer).data
-            quest_timer = QuestTimerSerializer(qt).data
+            if timer_data is not None:
+                act_timer, quest_timer = timer_data
+            else:
+                act_timer = ActivityTimerSerializer(profile.activity_timer).data
+                quest_timer = QuestTimerSerializer(character.quest_timer).data
+                store_timer_data(
+                    "gameplay",
+                    tokens,
+                    profile.activity_timer,
+                    character.quest_timer,
+                    act_timer,
+                    quest_timer,
+                )
 
             response = {
                 "success": True,
@@ -803,15 +818,8 @@ def complete_quest(request):
                 status=500,
             )
 
-        # cache_key = f"eligible_quests_{profile.id}"
-        # quests_cache = cache.get(cache_key)
-        # if quests_cache:
-        #     cache.delete(cache_key)
-        #     logger.debug(f"[COMPLETE QUEST] Cache cleared for eligible quests of profile {profile.id}")
-
         try:
-            eligible_quests = check_quest_eligibility(character, profile)
-            quests = QuestSerializer(eligible_quests, many=True).data
+            quests = serialize_eligible_quests(character, profile, QuestSerializer)
         except ObjectDoesNotExist as e:
             logger.error(
                 f"[COMPLETE QUEST] Object not found while checking eligible quests for profile {profile.id}: {str(e)}",
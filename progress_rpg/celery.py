@@ -22,11 +22,41 @@ def debug_task(self):
     print(f"Request: {self.request!r}")
 
 
+# Periodic tasks only run while the `beat` process in the Procfile is up: the
+# workers execute them but never schedule them
 app.conf.beat_schedule = {
-    # 'update-quests-every-hour': {
-    #     'task': 'gameplay.tasks.update_quest_availability',
-    #     'schedule': crontab(hour=0, minute=0), # Run every day
-    # },
+    # Quest availability schedules itself at each start/end date; this daily run
+    # only re-arms the schedule if a scheduled run was lost (e.g. broker restart)
+    "update-quest-availability": {
+        "task": "gameplay.tasks.update_quest_availability",
+        "schedule": crontab(hour=0, minute=0),
+    },
+    # Checkpoint live timer state kept in the cache (no-op with the database backend)
+    "flush-live-timer-states": {
+        "task": "gameplay.tasks.flush_live_timer_states",
+        "schedule": crontab(minute="*/5"),
+    },
+    # Quest timers complete from a task queued at their deadline; this only catches
+    # deadlines whose task was lost or could not be queued
+    "sweep-overdue-quest-timers": {
+        "task": "gameplay.tasks.sweep_overdue_quest_timers",
+        "schedule": crontab(minute="*"),
+    },
+    # Pause timers whose client stopped sending heartbeats without disconnecting
+    "reap-idle-timers": {
+        "task": "gameplay.tasks.pause_idle_timers",
+        "schedule": crontab(minute="*"),
+    },
+    # Mirror cache-backed presence into Profile.is_online for admin views
+    "sync-presence-flags": {
+        "task": "gameplay.tasks.sync_presence_flags",
+        "schedule": crontab(minute="*/5"),
+    },
+    # Roll timer segments older than a week into per-day totals
+    "compact-timer-segments": {
+        "task": "gameplay.tasks.compact_old_timer_segments",
+        "schedule": crontab(hour=3, minute=0),
+    },
     # 'daily-character-death-check': {
     #     'task': 'gameworld.tasks.check_character_deaths',
     #     'schedule': crontab(hour=0, minute=0),
@@ -42,5 +72,5 @@ app.conf.beat_schedule = {
     "check_user_deletion": {
         "task": "users.tasks.perform_account_wipe",
         "schedule": crontab(minute=0, hour=0),
-    }
+    },
 }
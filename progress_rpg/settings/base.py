@@ -273,3 +273,30 @@ CELERY_TASK_ALWAYS_EAGER = False
 CELERY_TASK_EAGER_PROPAGATES = False
 CELERY_ENABLE_UTC = True
 CELERY_TIMEZONE = "UTC"
+# The beat process (see the Procfile) keeps its schedule in the database, so it
+# needs no writable schedule file; app.conf.beat_schedule is synced into it
+CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+
+# Where running timer state lives: "database" saves every transition to Postgres;
+# "cache" keeps it in the TIMER_STATE_CACHE cache and writes it back on complete,
+# disconnect and the periodic flush (see gameplay.services.timer_state)
+TIMER_STATE_BACKEND = os.getenv("TIMER_STATE_BACKEND", "database")
+TIMER_STATE_CACHE = "timer_state"
+
+# Seconds without a websocket heartbeat before a player's running timers are
+# paused by the idle timer reaper (see gameplay.services.heartbeats)
+TIMER_HEARTBEAT_TIMEOUT = int(os.getenv("TIMER_HEARTBEAT_TIMEOUT", 120))
+
+# The Redis server behind the default cache, for the asyncio client that records
+# websocket heartbeats: {"URL": ..., "OPTIONS": {...}}, where OPTIONS are the same
+# connection keyword arguments as the cache's CONNECTION_POOL_KWARGS. None records
+# heartbeats through the default cache instead (see gameplay.services.heartbeats)
+HEARTBEAT_REDIS = None
+
+# Presence is tracked in the cache; this mirrors it into Profile.is_online for
+# admin views from a periodic task (see gameplay.services.presence)
+PRESENCE_SYNC_IS_ONLINE = os.getenv("PRESENCE_SYNC_IS_ONLINE", "True") == "True"
+
+# Milliseconds a websocket consumer waits to coalesce outbound messages into one
+# batched frame; 0 sends every message as its own frame (see gameplay.consumers)
+WS_BATCH_WINDOW_MS = int(os.getenv("WS_BATCH_WINDOW_MS", 20))
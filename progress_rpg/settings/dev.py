@@ -7,6 +7,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 from .base import *
+import sys
 
 ROOT_URLCONF = "progress_rpg.urls"
 
@@ -129,6 +130,8 @@ DATABASES = {"default": dj_database_url.parse(DATABASE_URL, conn_max_age=60)}
 
 
 REDIS_URL = os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/0")
+# Connection options shared by the caches and the heartbeat client
+REDIS_CONNECTION_KWARGS = {}
 # print("REDIS_URL:", REDIS_URL)
 # PRETEND = f"{REDIS_URL}?ssl_cert_reqs=none"
 # print("PRETEND:", PRETEND)
@@ -147,10 +150,38 @@ CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
         "LOCATION": REDIS_URL,
-        "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
-    }
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "CONNECTION_POOL_KWARGS": REDIS_CONNECTION_KWARGS,
+        },
+    },
+    # Live timer state must not be silently dropped, so errors are raised here
+    "timer_state": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "timer",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "CONNECTION_POOL_KWARGS": REDIS_CONNECTION_KWARGS,
+        },
+    },
 }
 
+HEARTBEAT_REDIS = {"URL": REDIS_URL, "OPTIONS": REDIS_CONNECTION_KWARGS}
+
+# The test suite runs without Redis (as in CI), and Redis errors are raised
+if "test" in sys.argv:
+    HEARTBEAT_REDIS = None
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "timer_state": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "timer_state",
+        },
+    }
+    # Rate limits are per process in tests
+    SILENCED_SYSTEM_CHECKS = ["django_ratelimit.E003", "django_ratelimit.W001"]
+
 
 # For local development only
 SESSION_ENGINE = "django.contrib.sessions.backends.db"
@@ -102,6 +102,11 @@ ssl_context = ssl.create_default_context()
 ssl_context.check_hostname = False
 ssl_context.verify_mode = ssl.CERT_NONE
 
+# Connection options shared by the caches and the heartbeat client
+REDIS_CONNECTION_KWARGS = {
+    # "ssl_context": ssl_context,
+}
+
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
@@ -121,13 +126,23 @@ CACHES = {
         "LOCATION": REDIS_URL_MOD,
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
-            # "CONNECTION_POOL_KWARGS": {
-            #     "ssl_context": ssl_context,
-            # }
+            "CONNECTION_POOL_KWARGS": REDIS_CONNECTION_KWARGS,
+        },
+    },
+    # Live timer state must not be silently dropped, so errors are raised here
+    "timer_state": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": REDIS_URL_MOD,
+        "KEY_PREFIX": "timer",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "CONNECTION_POOL_KWARGS": REDIS_CONNECTION_KWARGS,
         },
-    }
+    },
 }
 
+HEARTBEAT_REDIS = {"URL": REDIS_URL_MOD, "OPTIONS": REDIS_CONNECTION_KWARGS}
+
 CELERY_BROKER_URL = REDIS_URL_MOD
 CELERY_RESULT_BACKEND = REDIS_URL_MOD
 
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from gameplay.models import ActivityTimer, QuestTimer
+from gameplay.services.timer_state import flush_timer_states
 import logging
 
 logger = logging.getLogger("django")
@@ -9,15 +10,22 @@ logger = logging.getLogger("django")
 class Command(BaseCommand):
     help = "Pauses all active server timers during maintenance"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of timers paused per transaction",
+        )
+
     def handle(self, *args, **kwargs):
-        active_act_timers = ActivityTimer.objects.filter(status="Active")
-        for timer in active_act_timers:
-            timer.pause()
+        chunk_size = kwargs["chunk_size"]
+        # Persist any timer state held in the cache before reading timers
+        flush_timer_states(discard_active=True)
 
-        active_quest_timers = QuestTimer.objects.filter(status="Active")
-        for timer in active_quest_timers:
-            timer.pause()
+        act_paused = ActivityTimer.objects.bulk_pause(chunk_size=chunk_size)
+        quest_paused = QuestTimer.objects.bulk_pause(chunk_size=chunk_size)
 
         logger.info(
-            f"[COMMAND: PAUSE ALL TIMERS] {active_act_timers.count()} active Activity timers paused; {active_quest_timers.count()} active Quest timers paused."
+            f"[COMMAND: PAUSE ALL TIMERS] {act_paused} active Activity timers paused; {quest_paused} active Quest timers paused."
         )
@@ -148,6 +148,19 @@ class Person(models.Model):
         """
         Add experience points (XP) to the person and handle level-up logic.
 
+        :param amount: The amount of XP to add.
+        :type amount: int
+        """
+        old_level = self.level
+        self.accrue_xp(amount)
+        self.save()
+        if self.level != old_level:
+            self._level_change_hook(old_level)
+
+    def accrue_xp(self, amount: int):
+        """
+        Add experience points (XP) and apply any level-ups, without saving.
+
         :param amount: The amount of XP to add.
         :type amount: int
         """
@@ -155,7 +168,16 @@ class Person(models.Model):
         while self.xp >= self.get_xp_for_next_level():
             self.level_up()
         self.xp_next_level = self.get_xp_for_next_level()
-        self.save()
+
+    def _level_change_hook(self, old_level: int):
+        """
+        Called after `add_xp` changes the level. Subclasses can override this
+        to react to level changes.
+
+        :param old_level: The level before the XP was added.
+        :type old_level: int
+        """
+        pass
 
     def level_up(self):
         """
@@ -250,19 +272,25 @@ class Profile(Person):
         return f"profile_{self.id}"
 
     def set_online(self):
-        """Marks profile as online."""
+        """Marks profile as online, in the presence store."""
+        from gameplay.services.presence import mark_online
+
+        mark_online(self.id)
         self.is_online = True
-        self.save(update_fields=["is_online"])
 
     def set_offline(self):
-        """Marks profile as offline."""
+        """Marks profile as offline, in the presence store."""
+        from gameplay.services.presence import mark_offline
+
+        mark_offline(self.id)
         self.is_online = False
-        self.save(update_fields=["is_online"])
 
     @classmethod
     def get_online_profiles(cls):
         """Returns a QuerySet of all currently online profiles."""
-        return cls.objects.filter(is_online=True)
+        from gameplay.services.presence import online_profile_ids
+
+        return cls.objects.filter(pk__in=online_profile_ids())
 
     @property
     def current_character(self):